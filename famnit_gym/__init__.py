@@ -3,4 +3,9 @@ from gymnasium.envs.registration import register
 register(
     id="famnit_gym/Sokoban-v1",
     entry_point="famnit_gym.envs:SokobanEnv",
+)
+
+register(
+    id="famnit_gym/SokobanPush-v1",
+    entry_point="famnit_gym.envs:SokobanPushEnv",
 )
\ No newline at end of file
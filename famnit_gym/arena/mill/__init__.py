@@ -0,0 +1,6 @@
+from famnit_gym.arena.mill.session import Agent, RandomAgent, GameSession, SessionManager
+from famnit_gym.arena.mill.protocol import Connection, encode_message, decode_message, position_message
+from famnit_gym.arena.mill.server import MillServer, start_server, serve_stdio
+from famnit_gym.arena.mill.client import play_client, connect, random_move
+from famnit_gym.arena.mill.match import TimeControl, ProcessAgent, play_match, run_match
+from famnit_gym.arena.mill.pipe import run_pipe_agent
@@ -0,0 +1,125 @@
+import argparse
+import asyncio
+import random
+import time
+
+from famnit_gym.arena.mill.client import connect, random_move
+from famnit_gym.arena.mill.match import TimeControl, play_match
+from famnit_gym.arena.mill.pipe import run_pipe_agent
+from famnit_gym.arena.mill.server import start_server, serve_stdio
+from famnit_gym.arena.mill.session import SessionManager
+
+
+def _manager(args):
+    return SessionManager(rules=args.rules, move_timeout=args.timeout, game_file=args.game_file, seed=args.seed)
+
+
+async def serve(args):
+    manager = _manager(args)
+    server = await start_server(manager, args.host, args.port, max_games=args.max_games)
+    for socket in server.sockets:
+        print(f'Serving Mill games on {socket.getsockname()}.')
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await manager.close()
+
+
+async def stdio(args):
+    manager = _manager(args)
+    try:
+        await serve_stdio(manager, max_games=args.max_games)
+    finally:
+        await manager.close()
+
+
+async def client(args):
+    results = await connect(args.host, args.port, games=args.games, opponent=args.opponent)
+    wins = sum(1 for (player, result) in results.values() if result == player)
+    draws = sum(1 for (player, result) in results.values() if result == 3)
+    print(f'Played {len(results)} games: {wins} won, {draws} drawn, {len(results) - wins - draws} lost or unfinished.')
+
+
+async def match(args):
+    time_control = TimeControl(args.time, args.increment)
+    (statistics, results) = await play_match(
+        args.agent_1, args.agent_2, games=args.games, time_control=time_control,
+        rules=args.rules, game_file=args.game_file, seed=args.seed
+    )
+
+    for agent in statistics:
+        print(
+            f"{agent['name']}: {agent['wins']} won, {agent['draws']} drawn, {agent['losses']} lost, "
+            f"{agent['moves']} moves, {agent['overruns']} overruns, "
+            f"{agent['move_time']:.3f} s on the clock (at most {agent['max_move_time']:.3f} s per move)"
+            + (f", {agent['cpu_time']:.2f} s CPU" if agent['cpu_time'] is not None else '')
+        )
+
+
+async def agent(args):
+    # A random agent for the pipe protocol, e.g., as a stand-in opponent in a match.
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    def policy(position):
+        if args.delay > 0:
+            time.sleep(args.delay)
+        return random_move(position)
+
+    run_pipe_agent(policy)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m famnit_gym.arena.mill', description='Mill game server.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    # Serve the games on a TCP socket or on the standard input and output.
+    for (name, run, description) in [
+        ('serve', serve, 'Serve the games to the clients on a TCP socket.'),
+        ('stdio', stdio, 'Serve the games to a single client on the standard input and output.')
+    ]:
+        parser_serve = commands.add_parser(name, help=description)
+        if name == 'serve':
+            parser_serve.add_argument('--host', default='127.0.0.1', help='The address to listen on.')
+            parser_serve.add_argument('--port', type=int, default=5000, help='The port to listen on.')
+        parser_serve.add_argument('--rules', default=None, help='The rules: nine, twelve or six.')
+        parser_serve.add_argument('--timeout', type=float, default=5.0, help='The time for a move in seconds.')
+        parser_serve.add_argument('--max-games', type=int, default=1000, help='The most games per client.')
+        parser_serve.add_argument('--game-file', help='Store the finished games in this file.')
+        parser_serve.add_argument('--seed', type=int, default=None, help='The random seed.')
+        parser_serve.set_defaults(run=run)
+
+    # A stand-in client that plays random moves.
+    parser_client = commands.add_parser('client', help='Play random moves against the server.')
+    parser_client.add_argument('--host', default='127.0.0.1', help='The server address.')
+    parser_client.add_argument('--port', type=int, default=5000, help='The server port.')
+    parser_client.add_argument('--games', type=int, default=1, help='The number of games to play at once.')
+    parser_client.add_argument('--opponent', default=None, help='Play against a built-in bot, e.g., random.')
+    parser_client.set_defaults(run=client)
+
+    # Play a match between two agents that run as subprocesses.
+    parser_match = commands.add_parser('match', help='Play a match between two agent commands with time control.')
+    parser_match.add_argument('agent_1', help='The command of the first agent.')
+    parser_match.add_argument('agent_2', help='The command of the second agent.')
+    parser_match.add_argument('--games', type=int, default=2, help='The number of games, alternating the colours.')
+    parser_match.add_argument('--time', type=float, default=60.0, help='The initial time on the clock in seconds.')
+    parser_match.add_argument('--increment', type=float, default=1.0, help='The time added after every move.')
+    parser_match.add_argument('--rules', default=None, help='The rules: nine, twelve or six.')
+    parser_match.add_argument('--game-file', help='Store the games in this file.')
+    parser_match.add_argument('--seed', type=int, default=None, help='The random seed.')
+    parser_match.set_defaults(run=match)
+
+    # A stand-in agent for matches.
+    parser_agent = commands.add_parser('agent', help='Play random moves over the standard input and output.')
+    parser_agent.add_argument('--delay', type=float, default=0, help='Think for this many seconds per move.')
+    parser_agent.add_argument('--seed', type=int, default=None, help='The random seed.')
+    parser_agent.set_defaults(run=agent)
+
+    args = parser.parse_args()
+    asyncio.run(args.run(args))
+
+
+if __name__ == '__main__':
+    main()
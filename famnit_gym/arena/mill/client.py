@@ -0,0 +1,57 @@
+import asyncio
+import inspect
+import random
+
+from famnit_gym.arena.mill.protocol import encode_message, decode_message, max_message_size
+
+
+# A policy that chooses a random legal move from the position message.
+def random_move(position):
+    return random.choice(position['legal_moves'])
+
+
+# Play the games over the stream with the given policy, which maps a position message to a move (it can be async).
+# Returns the results of the client's games as {game: (player, result)}.
+async def play_client(reader, writer, policy=random_move, games=1, opponent=None):
+    join = {'type': 'join', 'games': games}
+    if opponent is not None:
+        join['opponent'] = opponent
+    writer.write(encode_message(join))
+    await writer.drain()
+
+    started = None
+    results = {}
+
+    # The server starts at most the requested number of games, all at once.
+    while started is None or len(results) < started:
+        line = await reader.readline()
+        if not line:
+            break
+
+        message = decode_message(line)
+        if message['type'] == 'start':
+            started = (started or 0) + 1
+
+        elif message['type'] == 'position':
+            move = policy(message)
+            if inspect.isawaitable(move):
+                move = await move
+            reply = {'type': 'move', 'game': message['game'], 'ply': message['ply'], 'move': [int(x) for x in move]}
+            writer.write(encode_message(reply))
+            await writer.drain()
+
+        elif message['type'] == 'result':
+            results[message['game']] = (message['player'], message['result'])
+
+        elif message['type'] == 'error':
+            raise RuntimeError(message['message'])
+
+    writer.close()
+    await writer.wait_closed()
+    return results
+
+
+# Connect to a server and play the games with the given policy.
+async def connect(host, port, policy=random_move, games=1, opponent=None):
+    (reader, writer) = await asyncio.open_connection(host, port, limit=max_message_size)
+    return await play_client(reader, writer, policy, games, opponent)
@@ -0,0 +1,208 @@
+import asyncio
+import os
+import shlex
+import time
+
+import numpy as np
+
+from famnit_gym.arena.mill.pipe import encode_position, decode_move
+from famnit_gym.arena.mill.session import Agent, GameSession
+from famnit_gym.envs.mill.mill_record import GameWriter, UNFINISHED, PLAYER_1_WON, DRAW
+
+
+class TimeControl:
+    # Every player starts a game with initial seconds on the clock and gets increment seconds after every move.
+    def __init__(self, initial=60.0, increment=1.0):
+        self.initial = initial
+        self.increment = increment
+
+    def __repr__(self):
+        return f'TimeControl(initial={self.initial}, increment={self.increment})'
+
+
+# The CPU time (user and system) of a process in seconds, or None where it cannot be read.
+_clock_ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else None
+
+
+def process_cpu_time(pid):
+    try:
+        with open(f'/proc/{pid}/stat') as file:
+            stat = file.read()
+    except OSError:
+        return None
+
+    # The fields after the command name, which is in parentheses and may contain spaces.
+    fields = stat[stat.rindex(')') + 2:].split()
+    return (int(fields[11]) + int(fields[12])) / _clock_ticks
+
+
+class ProcessAgent(Agent):
+    # An agent that runs in its own subprocess and talks the pipe protocol (see pipe). Its clock only runs
+    # while it is to move. A reply that does not arrive before the clock runs out is an overrun: the game
+    # continues with a random legal move, the clock is emptied, and the late reply is ignored.
+    # The agent has startup_time seconds to start and write ready.
+    def __init__(self, command, time_control=None, name=None, startup_time=30.0):
+        self.command = shlex.split(command) if isinstance(command, str) else list(command)
+        self.name = name if name is not None else ' '.join(self.command)
+        self.time_control = time_control if time_control is not None else TimeControl()
+        self.clock = self.time_control.initial
+        self.startup_time = startup_time
+
+        self._process = None
+        self.closed = False
+
+        # The statistics of the match.
+        self.moves = 0
+        self.overruns = 0
+        self.move_time = 0.0
+        self.max_move_time = 0.0
+        self.cpu_time = None
+        self._start_cpu_time = None
+
+    async def start(self):
+        self._process = await asyncio.create_subprocess_exec(
+            *self.command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE
+        )
+
+        # Wait until the agent is ready. An agent that does not start plays random moves.
+        try:
+            line = await asyncio.wait_for(self._process.stdout.readline(), self.startup_time)
+        except asyncio.TimeoutError:
+            line = b''
+        if line.strip() != b'ready':
+            self.closed = True
+
+        self._start_cpu_time = process_cpu_time(self._process.pid)
+
+    async def _send(self, line):
+        if self.closed:
+            return
+        try:
+            self._process.stdin.write(line.encode())
+            await self._process.stdin.drain()
+        except ConnectionError:
+            self.closed = True
+
+    # Start a new game: the clock is reset.
+    async def new_game(self, session, player):
+        self.clock = self.time_control.initial
+        await self._send(f'new {session.game_id} {player}\n')
+
+    async def _read_move(self, game, ply):
+        # Skip the late replies to the earlier positions.
+        while True:
+            line = await self._process.stdout.readline()
+            if not line:
+                self.closed = True
+                return None
+
+            reply = decode_move(line.decode())
+            if reply is not None and reply[0] == game and reply[1] == ply:
+                return reply[2]
+
+    async def request_move(self, session, player):
+        if self.closed:
+            return None
+
+        increment = self.time_control.increment
+        await self._send(encode_position(session, player, self.clock, increment))
+
+        start = time.perf_counter()
+        try:
+            move = await asyncio.wait_for(self._read_move(session.game_id, session.ply), self.clock)
+        except asyncio.TimeoutError:
+            move = None
+            self.overruns += 1
+        elapsed = time.perf_counter() - start
+
+        # The Fischer increment is added after every move, also after an overrun.
+        self.clock = max(self.clock - elapsed, 0) + increment
+
+        self.moves += 1
+        self.move_time += elapsed
+        self.max_move_time = max(self.max_move_time, elapsed)
+
+        return move
+
+    async def game_over(self, session, player):
+        await self._send(f'result {session.game_id} {player} {session.result}\n')
+
+    # Ask the agent to quit, and kill it if it does not.
+    async def close(self, timeout=1.0):
+        if self._process is None:
+            return
+
+        # The CPU time of the process since it was ready, also between the moves. The clock ticks of the
+        # operating system are too coarse to measure the single moves.
+        cpu_time = process_cpu_time(self._process.pid)
+        if cpu_time is not None and self._start_cpu_time is not None:
+            self.cpu_time = cpu_time - self._start_cpu_time
+
+        await self._send('quit\n')
+        self.closed = True
+        try:
+            self._process.stdin.close()
+            await asyncio.wait_for(self._process.wait(), timeout)
+        except (asyncio.TimeoutError, ConnectionError):
+            self._process.kill()
+            await self._process.wait()
+
+    def statistics(self):
+        return {
+            'name': self.name,
+            'moves': self.moves,
+            'overruns': self.overruns,
+            'move_time': self.move_time,
+            'max_move_time': self.max_move_time,
+            'cpu_time': self.cpu_time
+        }
+
+
+# Play a match of the given number of games between two agent commands, alternating the colours.
+# Returns the statistics of both agents with their wins, draws and losses, and the results of the games
+# as (result, index of the agent that played player 1).
+async def play_match(command_1, command_2, games=2, time_control=None, rules=None, game_file=None, seed=None):
+    agents = [ProcessAgent(command_1, time_control), ProcessAgent(command_2, time_control)]
+    for agent in agents:
+        await agent.start()
+
+    writer = GameWriter(game_file, rules=rules) if game_file is not None else None
+    seeds = np.random.SeedSequence(seed).spawn(games)
+    scores = [{'wins': 0, 'draws': 0, 'losses': 0} for _ in agents]
+    results = []
+
+    try:
+        for game in range(games):
+            first = game % 2
+            (agent_1, agent_2) = (agents[first], agents[1 - first])
+
+            # The clocks limit the moves, so the session itself has no timeout.
+            session = GameSession(game + 1, agent_1, agent_2, rules, move_timeout=None, seed=seeds[game])
+            await agent_1.new_game(session, 1)
+            await agent_2.new_game(session, 2)
+            result = await session.play()
+            results.append((result, first))
+
+            if writer is not None and result != UNFINISHED:
+                writer.write(session.moves, result)
+
+            for (index, player) in ((first, 1), (1 - first, 2)):
+                if result == DRAW:
+                    scores[index]['draws'] += 1
+                elif (result == PLAYER_1_WON) == (player == 1):
+                    scores[index]['wins'] += 1
+                else:
+                    scores[index]['losses'] += 1
+
+    finally:
+        for agent in agents:
+            await agent.close()
+        if writer is not None:
+            writer.close()
+
+    statistics = [dict(agent.statistics(), **score) for (agent, score) in zip(agents, scores)]
+    return statistics, results
+
+
+def run_match(command_1, command_2, games=2, time_control=None, rules=None, game_file=None, seed=None):
+    return asyncio.run(play_match(command_1, command_2, games, time_control, rules, game_file, seed))
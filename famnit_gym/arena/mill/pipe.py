@@ -0,0 +1,90 @@
+import sys
+
+from famnit_gym.envs.mill.mill_model import phase_names
+
+# The line protocol of the agents that run as subprocesses (see match). The agent first writes ready when it
+# has started, which is not counted on its clock. The runner then writes
+#   new <game> <player>
+#   position <game> <ply> <player> <board> <phase 1> <phase 2> <holding 1> <holding 2> <clock ms> <increment ms> <moves>
+#   result <game> <player> <result>
+#   quit
+# where the board is a string of digits (0 - 2), one per position, the phases are codes (0 - placing, 1 - moving,
+# 2 - flying, 3 - lost) and the legal moves are space-separated triples src,dst,take. The agent answers a position with
+#   move <game> <ply> <src> <dst> <take>
+# within the time left on its clock.
+
+
+def encode_position(session, player, clock, increment):
+    model = session.model
+    fields = [
+        'position', session.game_id, session.ply, player,
+        ''.join(str(piece) for piece in model.get_state()),
+        model.get_phase_code(1), model.get_phase_code(2),
+        model.get_pieces_holding(1), model.get_pieces_holding(2),
+        int(clock * 1000), int(increment * 1000)
+    ]
+    fields.extend(f'{src},{dst},{take}' for (src, dst, take) in session.legal_moves)
+    return ' '.join(str(field) for field in fields) + '\n'
+
+
+# Decode a position line into the same dictionary as the position message of the socket protocol,
+# so the same policies work for both.
+def decode_position(line):
+    fields = line.split()
+    return {
+        'type': 'position',
+        'game': int(fields[1]),
+        'ply': int(fields[2]),
+        'player': int(fields[3]),
+        'board': [int(piece) for piece in fields[4]],
+        'phases': [phase_names[int(fields[5])], phase_names[int(fields[6])]],
+        'holding': [int(fields[7]), int(fields[8])],
+        'time': int(fields[9]) / 1000,
+        'increment': int(fields[10]) / 1000,
+        'legal_moves': [[int(x) for x in move.split(',')] for move in fields[11:]]
+    }
+
+
+def encode_move(game, ply, move):
+    return f'move {game} {ply} {move[0]} {move[1]} {move[2]}\n'
+
+
+# Decode a move line into (game, ply, move), or None if it is not a move.
+def decode_move(line):
+    fields = line.split()
+    if len(fields) != 6 or fields[0] != 'move':
+        return None
+    try:
+        return int(fields[1]), int(fields[2]), [int(x) for x in fields[3:]]
+    except ValueError:
+        return None
+
+
+# Run an agent on the standard input and output: the policy maps a position to a move, the optional
+# callbacks are called with the other lines' fields. Returns when the runner sends quit or closes the pipe.
+def run_pipe_agent(policy, on_new_game=None, on_result=None, stdin=None, stdout=None):
+    stdin = stdin if stdin is not None else sys.stdin
+    stdout = stdout if stdout is not None else sys.stdout
+
+    stdout.write('ready\n')
+    stdout.flush()
+
+    for line in stdin:
+        command = line.split(' ', 1)[0].strip()
+
+        if command == 'position':
+            position = decode_position(line)
+            move = policy(position)
+            stdout.write(encode_move(position['game'], position['ply'], move))
+            stdout.flush()
+
+        elif command == 'new' and on_new_game is not None:
+            (_, game, player) = line.split()
+            on_new_game(int(game), int(player))
+
+        elif command == 'result' and on_result is not None:
+            (_, game, player, result) = line.split()
+            on_result(int(game), int(player), int(result))
+
+        elif command == 'quit':
+            return
@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+from famnit_gym.envs.mill.mill_model import phase_names
+from famnit_gym.arena.mill.session import Agent
+
+# The messages are JSON objects, one per line. A client first sends
+#   {"type": "join", "games": 2, "opponent": "random"}
+# to play the given number of games against a built-in bot, or without the opponent to be paired with
+# the next client that joins. For every game, the server sends
+#   {"type": "start", "game": 1, "player": 1}
+# and then the positions when the client is to move
+#   {"type": "position", "game": 1, "ply": 0, "player": 1, "board": [...], "phases": [...], "holding": [...],
+#    "legal_moves": [[0, 1, 0], ...], "time": 5.0}
+# to which the client replies with
+#   {"type": "move", "game": 1, "ply": 0, "move": [0, 1, 0]}
+# and finally the result (see mill_record), {"type": "result", "game": 1, "player": 1, "result": 1}.
+# A reply to an older position (after its time ran out) is ignored.
+
+# The longest message that is accepted.
+max_message_size = 1 << 20
+
+
+def encode_message(message):
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode()
+
+
+def decode_message(line):
+    message = json.loads(line)
+    if not isinstance(message, dict) or 'type' not in message:
+        raise ValueError(f'Not a message: {line!r}')
+    return message
+
+
+# The position of the game for the player to move.
+def position_message(session, player):
+    model = session.model
+    return {
+        'type': 'position',
+        'game': session.game_id,
+        'ply': session.ply,
+        'player': player,
+        'board': model.get_state(),
+        'phases': [phase_names[model.get_phase_code(p)] for p in (1, 2)],
+        'holding': [model.get_pieces_holding(p) for p in (1, 2)],
+        'legal_moves': session.legal_moves,
+        'time': session.move_timeout
+    }
+
+
+class Connection(Agent):
+    # A client connected over a stream. The connection is an agent for all the games the client plays:
+    # the positions are sent as they are requested and the replies are matched by the game and the ply.
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._pending = {}
+        self.closed = False
+
+    # Write the message without waiting for the buffer to be flushed.
+    def post(self, message):
+        if self.closed:
+            return
+        try:
+            self._writer.write(encode_message(message))
+        except ConnectionError:
+            self._close()
+
+    async def send(self, message):
+        self.post(message)
+        if self.closed:
+            return
+        try:
+            await self._writer.drain()
+        except ConnectionError:
+            self._close()
+
+    # Receive the next message, or None when the client has disconnected.
+    async def receive(self):
+        while not self.closed:
+            try:
+                line = await self._reader.readline()
+            except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                line = b''
+
+            if not line:
+                self._close()
+                return None
+
+            try:
+                return decode_message(line)
+            except ValueError:
+                await self.send({'type': 'error', 'message': 'Invalid message.'})
+        return None
+
+    # Read the moves until the client disconnects.
+    async def run(self):
+        while True:
+            message = await self.receive()
+            if message is None:
+                return
+
+            if message['type'] == 'move':
+                future = self._pending.get((message.get('game'), message.get('ply')))
+                if future is not None and not future.done():
+                    future.set_result(message.get('move'))
+
+    def _close(self):
+        self.closed = True
+
+        # The games waiting for this client continue with random moves.
+        for future in self._pending.values():
+            if not future.done():
+                future.set_result(None)
+
+    async def request_move(self, session, player):
+        if self.closed:
+            return None
+
+        key = (session.game_id, session.ply)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            await self.send(position_message(session, player))
+            return await future
+        finally:
+            del self._pending[key]
+
+    async def game_over(self, session, player):
+        await self.send({'type': 'result', 'game': session.game_id, 'player': player, 'result': session.result})
+
+    def close(self):
+        self._close()
+        self._writer.close()
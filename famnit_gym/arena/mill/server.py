@@ -0,0 +1,86 @@
+import asyncio
+import sys
+
+from famnit_gym.arena.mill.protocol import Connection, max_message_size
+from famnit_gym.arena.mill.session import RandomAgent
+
+# The built-in bots that a client can ask for as the opponent.
+bots = {
+    'random': RandomAgent
+}
+
+
+class MillServer:
+    # Pair the clients that join and play their games in the session manager. A client plays the games
+    # it asks for (at most max_games at once) against a built-in bot, or against the next client that joins,
+    # alternating the colours.
+    def __init__(self, manager, max_games=1000):
+        self.manager = manager
+        self.max_games = max_games
+        self._waiting = None
+
+    def _start_games(self, agent_1, agent_2, games):
+        for game in range(games):
+            if game % 2 == 0:
+                session = self.manager.start(agent_1, agent_2)
+            else:
+                session = self.manager.start(agent_2, agent_1)
+
+            # Tell the clients which games they play, before the game can send a position.
+            for player in (1, 2):
+                if isinstance(session.agents[player], Connection):
+                    session.agents[player].post({'type': 'start', 'game': session.game_id, 'player': player})
+
+    # Serve a client until it disconnects.
+    async def handle(self, reader, writer):
+        connection = Connection(reader, writer)
+        join = await connection.receive()
+
+        if join is None or join['type'] != 'join':
+            await connection.send({'type': 'error', 'message': 'Expected a join message.'})
+            connection.close()
+            return
+
+        games = max(1, min(int(join.get('games', 1)), self.max_games))
+        opponent = join.get('opponent')
+        if opponent is not None and opponent not in bots:
+            await connection.send({'type': 'error', 'message': f'Unknown opponent {opponent!r}.'})
+            connection.close()
+            return
+
+        # The moves are read while the games are started, so no reply is missed.
+        reading = asyncio.create_task(connection.run())
+
+        if opponent is not None:
+            self._start_games(connection, bots[opponent](), games)
+        elif self._waiting is None or self._waiting[0].closed:
+            self._waiting = (connection, games)
+        else:
+            (other, other_games) = self._waiting
+            self._waiting = None
+            self._start_games(other, connection, min(games, other_games))
+
+        await reading
+        if self._waiting is not None and self._waiting[0] is connection:
+            self._waiting = None
+        connection.close()
+
+
+# Start serving the clients on a TCP socket. Returns the asyncio server; port 0 chooses a free port.
+async def start_server(manager, host='127.0.0.1', port=0, max_games=1000):
+    server = MillServer(manager, max_games)
+    return await asyncio.start_server(server.handle, host, port, limit=max_message_size)
+
+
+# Serve a single client on the standard input and output, e.g., a bot started by a script.
+async def serve_stdio(manager, max_games=1000):
+    loop = asyncio.get_running_loop()
+
+    reader = asyncio.StreamReader(limit=max_message_size)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    (transport, protocol) = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+
+    await MillServer(manager, max_games).handle(reader, writer)
+    await manager.wait()
@@ -0,0 +1,160 @@
+import asyncio
+
+import numpy as np
+
+from famnit_gym.envs.mill.mill_model import MillModel
+from famnit_gym.envs.mill.mill_record import GameWriter, game_result, UNFINISHED
+
+
+class Agent:
+    # A player of the sessions. The session awaits request_move() for every move of the agent, which returns
+    # the move [src, dst, take], or None for a random legal move. The same agent can play many games at once.
+    async def request_move(self, session, player):
+        return None
+
+    # Called when a game of the agent has ended.
+    async def game_over(self, session, player):
+        pass
+
+
+class RandomAgent(Agent):
+    # Play random legal moves, optionally after a delay in seconds.
+    def __init__(self, seed=None, delay=0):
+        self._rng = np.random.default_rng(seed)
+        self._delay = delay
+
+    async def request_move(self, session, player):
+        if self._delay > 0:
+            await asyncio.sleep(self._delay)
+        return session.legal_moves[int(self._rng.integers(len(session.legal_moves)))]
+
+
+class GameSession:
+    # A single game between two agents on its own model. The session awaits the moves of the agents in turns.
+    # A move that does not arrive within move_timeout seconds, or is not legal, is replaced by a random legal move,
+    # as in MillEnv.step. The game ends when a player loses, it is drawn, or after the move limit of the rules.
+    def __init__(self, game_id, agent_1, agent_2, rules=None, move_timeout=5.0, seed=None):
+        self.game_id = game_id
+        self.agents = [None, agent_1, agent_2]
+        self.move_timeout = move_timeout
+
+        self.model = MillModel(rules)
+        self.model.enable_history()
+        self._rng = np.random.default_rng(seed)
+
+        # The player to move, its legal moves, and the number of plies played.
+        self.player = 1
+        self.legal_moves = self.model.legal_moves(1)
+        self.ply = 0
+
+        # The moves played, and how many moves of each player timed out or were illegal.
+        self.moves = []
+        self.timeouts = [0, 0, 0]
+        self.illegal = [0, 0, 0]
+
+        self.result = None
+        self.truncated = False
+
+    # The number of moves of both players.
+    @property
+    def num_moves(self):
+        return self.ply // 2
+
+    def finished(self):
+        return self.result is not None
+
+    async def _request_move(self, player):
+        try:
+            move = await asyncio.wait_for(self.agents[player].request_move(self, player), self.move_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts[player] += 1
+            return None
+
+        if move is not None:
+            move = [int(x) for x in move]
+            if move not in self.legal_moves:
+                self.illegal[player] += 1
+                return None
+        return move
+
+    # Play the game to the end and return the result (see mill_record).
+    async def play(self):
+        model = self.model
+        move_limit = model.get_rules().move_limit
+
+        while not model.game_over():
+            if move_limit is not None and self.num_moves >= move_limit:
+                self.truncated = True
+                break
+
+            player = self.player
+            move = await self._request_move(player)
+            if move is None:
+                move = self.legal_moves[int(self._rng.integers(len(self.legal_moves)))]
+
+            model.make_move(player, move)
+            self.moves.append(move)
+            self.ply += 1
+
+            self.player = 3 - player
+            self.legal_moves = model.legal_moves(self.player)
+
+        self.result = game_result(model, self.truncated)
+
+        for player in (1, 2):
+            await self.agents[player].game_over(self, player)
+
+        return self.result
+
+
+class SessionManager:
+    # Run many games concurrently in one process, each as an asyncio task. The finished games can be
+    # stored to a game file (see mill_record).
+    def __init__(self, rules=None, move_timeout=5.0, game_file=None, seed=None):
+        self.rules = rules
+        self.move_timeout = move_timeout
+        self.sessions = {}
+        self.results = {}
+
+        self._writer = GameWriter(game_file, rules=rules) if game_file is not None else None
+        self._seeds = np.random.SeedSequence(seed)
+        self._tasks = set()
+        self._next_id = 1
+
+    # Start a game between the agents and return its session. The game runs in the background.
+    def start(self, agent_1, agent_2):
+        game_id = self._next_id
+        self._next_id += 1
+
+        seed = self._seeds.spawn(1)[0]
+        session = GameSession(game_id, agent_1, agent_2, self.rules, self.move_timeout, seed=seed)
+        self.sessions[game_id] = session
+
+        task = asyncio.create_task(self._run(session))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return session
+
+    async def _run(self, session):
+        try:
+            result = await session.play()
+        finally:
+            del self.sessions[session.game_id]
+
+        self.results[session.game_id] = result
+        if self._writer is not None and result != UNFINISHED:
+            self._writer.write(session.moves, result)
+
+    # Wait until all the started games have finished.
+    async def wait(self):
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+
+    # Cancel the running games and close the game file.
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+        if self._writer is not None:
+            self._writer.close()
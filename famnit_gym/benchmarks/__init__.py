@@ -0,0 +1,5 @@
+from famnit_gym.benchmarks.core import benchmarks, benchmark, measure
+import famnit_gym.benchmarks.mill
+import famnit_gym.benchmarks.sokoban
+import famnit_gym.benchmarks.render
+import famnit_gym.benchmarks.imports
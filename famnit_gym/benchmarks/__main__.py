@@ -0,0 +1,58 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from famnit_gym.__about__ import __version__
+from famnit_gym.benchmarks import benchmarks
+
+
+# Run the benchmarks and return the results in a JSON-serializable dict.
+def run(names, duration):
+    results = {}
+    for name in names:
+        start = time.perf_counter()
+        results[name] = benchmarks[name](duration)
+        print(f'{name}: done in {time.perf_counter() - start:.1f} s', file=sys.stderr)
+
+    return {
+        'famnit_gym': __version__,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'duration': duration,
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='famnit-gym-benchmark', description='Measure the speed of famnit_gym.')
+    parser.add_argument('names', nargs='*', help='The benchmarks to run. All of them by default.')
+    parser.add_argument('--duration', type=float, default=1.0, help='Seconds spent in each benchmark.')
+    parser.add_argument('--output', help='Write the JSON results to this file instead of the standard output.')
+    parser.add_argument('--list', action='store_true', help='List the benchmarks and exit.')
+    args = parser.parse_args()
+
+    if args.list:
+        print('\n'.join(benchmarks))
+        return
+
+    for name in args.names:
+        if name not in benchmarks:
+            parser.error(f"unknown benchmark '{name}'")
+
+    report = run(args.names if len(args.names) > 0 else list(benchmarks), args.duration)
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
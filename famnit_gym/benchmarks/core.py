@@ -0,0 +1,40 @@
+import time
+
+# All the registered benchmarks, by name.
+benchmarks = {}
+
+
+# Register the function as a benchmark. The function takes the duration in seconds and returns a dict of results.
+def benchmark(name):
+    def register(function):
+        benchmarks[name] = function
+        return function
+    return register
+
+
+# Call the function repeatedly for at least the given duration. Returns the number of calls and the time taken.
+def measure(function, duration):
+    calls = 0
+    start = time.perf_counter()
+    end = start + duration
+
+    # Call in growing batches, so reading the clock does not dominate very short calls.
+    batch = 1
+    while True:
+        for _ in range(batch):
+            function()
+        calls += batch
+
+        now = time.perf_counter()
+        if now >= end:
+            return calls, now - start
+        batch = min(2 * batch, 1024)
+
+
+# Return the rate and the mean time of calls, as reported in the results.
+def rate(calls, seconds, unit='calls'):
+    return {
+        f'{unit}_per_second': calls / seconds,
+        'microseconds': 1e6 * seconds / calls,
+        unit: calls
+    }
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+import time
+
+from famnit_gym.benchmarks.core import benchmark
+
+# The modules whose import time is measured, and the heavy dependencies that they should not load.
+_modules = [
+    'famnit_gym',
+    'famnit_gym.envs.mill',
+    'famnit_gym.wrappers.sokoban',
+    'famnit_gym.wrappers.mill'
+]
+
+_lazy = ['pygame', 'imageio_ffmpeg', 'progress']
+
+# Imports the module in a fresh interpreter and prints the seconds taken and the lazy modules that were loaded.
+_script = '''
+import sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(seconds, *[name for name in {lazy!r} if name in sys.modules])
+'''
+
+
+# Import the module in a new process, since the modules already imported by this process are cached.
+def _import_time(module):
+    output = subprocess.run(
+        [sys.executable, '-c', _script.format(module=module, lazy=_lazy)],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[0]), output[1:]
+
+
+@benchmark('import_time')
+def import_time(duration):
+    results = {}
+    for module in _modules:
+        # Repeat the import for the given duration and keep the fastest time, which is the least noisy.
+        times = []
+        end = time.perf_counter() + duration
+        while len(times) == 0 or time.perf_counter() < end:
+            (seconds, loaded) = _import_time(module)
+            times.append(seconds)
+
+        results[module] = {
+            'milliseconds': 1e3 * min(times),
+            'imports': len(times),
+            'loaded': loaded
+        }
+
+    return results
@@ -0,0 +1,106 @@
+import numpy as np
+
+from famnit_gym.benchmarks.core import benchmark, measure, rate
+from famnit_gym.envs import mill
+from famnit_gym.search.mill.perft import reference_position
+
+
+@benchmark('mill_reset')
+def mill_reset(duration):
+    env = mill.env()
+    (calls, seconds) = measure(env.reset, duration)
+    env.close()
+    return rate(calls, seconds, 'resets')
+
+
+@benchmark('mill_step')
+def mill_step(duration):
+    env = mill.env()
+    env.reset(seed=0)
+
+    # Play random moves, starting a new game when one ends.
+    def step():
+        if any(env.terminations.values()) or any(env.truncations.values()):
+            env.reset()
+        env.step(None)
+
+    (calls, seconds) = measure(step, duration)
+    env.close()
+    return rate(calls, seconds, 'steps')
+
+
+@benchmark('mill_legal_moves')
+def mill_legal_moves(duration):
+    results = {}
+
+    # Measure the move generation in every phase separately.
+    for phase in ['placing', 'moving', 'flying']:
+        (model, player) = reference_position(phase)
+        (calls, seconds) = measure(lambda: model.legal_moves(player), duration / 3)
+        results[phase] = rate(calls, seconds)
+
+    return results
+
+
+@benchmark('mill_make_move')
+def mill_make_move(duration):
+    (model, player) = reference_position('moving')
+    move = model.legal_moves(player)[0]
+
+    # The move is made on a clone, so the cost of cloning is reported separately.
+    (calls, seconds) = measure(model.clone, duration / 2)
+    results = {'clone': rate(calls, seconds)}
+
+    (calls, seconds) = measure(lambda: model.clone().make_move(player, move), duration / 2)
+    results['clone_and_make_move'] = rate(calls, seconds)
+
+    return results
+
+
+@benchmark('mill_parallel_step')
+def mill_parallel_step(duration):
+    env = mill.parallel_env()
+    env.reset(seed=0)
+
+    # Play random moves through the parallel API, the waiting player passes.
+    def step():
+        if len(env.agents) == 0:
+            env.reset()
+        env.step({agent: mill.no_op for agent in env.possible_agents if agent != env.agent_selection})
+
+    (calls, seconds) = measure(step, duration)
+    env.close()
+    return rate(calls, seconds, 'steps')
+
+
+@benchmark('mill_batch_step')
+def mill_batch_step(duration):
+    num_games = 256
+    batch = mill.MillBatch(num_games, seed=0)
+
+    # All the actions are illegal, so random legal moves are played in every game.
+    actions = np.zeros((num_games, 3), dtype=np.int64)
+    (calls, seconds) = measure(lambda: batch.step(actions), duration)
+    return rate(calls * num_games, seconds, 'steps')
+
+
+@benchmark('mill_legal_move_masks')
+def mill_legal_move_masks(duration):
+    num_games = 256
+    batch = mill.MillBatch(num_games, seed=0)
+
+    # Advance the games, so the positions come from all the phases.
+    actions = np.zeros((num_games, 3), dtype=np.int64)
+    for _ in range(40):
+        batch.step(actions)
+
+    models = batch.models()
+    results = {}
+
+    (calls, seconds) = measure(batch.legal_move_masks, duration / 2)
+    results['batched'] = rate(calls * num_games, seconds, 'positions')
+
+    (calls, seconds) = measure(lambda: [model.legal_moves(int(player)) for (model, player) in zip(models, batch.players)], duration / 2)
+    results['legal_moves'] = rate(calls * num_games, seconds, 'positions')
+
+    return results
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import time
+
+from famnit_gym.benchmarks.core import benchmark, measure, rate
+
+
+# Use a dummy video driver, so rendering can be measured without a display.
+def _init_pygame():
+    if 'DISPLAY' not in os.environ and 'SDL_VIDEODRIVER' not in os.environ:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+
+@benchmark('sokoban_render')
+def sokoban_render(duration):
+    _init_pygame()
+    from famnit_gym.envs.sokoban import SokobanEnv
+
+    env = SokobanEnv(render_mode='human', options={'map_template': 0})
+    env.reset(seed=0)
+
+    def frame():
+        env._map.paint(env._surface)
+        env._update_frame()
+
+    (calls, seconds) = measure(frame, duration)
+    env.close()
+    return rate(calls, seconds, 'frames')
+
+
+@benchmark('mill_render')
+def mill_render(duration):
+    _init_pygame()
+    from famnit_gym.envs import mill
+
+    env = mill.env(render_mode='human')
+    env.reset(seed=0)
+
+    def frame():
+        env._paint_board()
+        env._paint_pieces()
+        env._update_frame()
+
+    (calls, seconds) = measure(frame, duration)
+    env.close()
+    return rate(calls, seconds, 'frames')
+
+
+@benchmark('video_encoding')
+def video_encoding(duration):
+    num_frames = max(60, round(60 * duration))
+    _init_pygame()
+    from famnit_gym.envs.sokoban import SokobanEnv
+    from famnit_gym.wrappers.sokoban import Video
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = Video(SokobanEnv(options={'map_template': 0}), filename=os.path.join(directory, 'benchmark.mp4'))
+        env.reset(seed=0)
+
+        # Record the frames, as the environment does when rendering.
+        for _ in range(num_frames):
+            env._env._map.paint(env._env._surface)
+            env._env._update_frame()
+
+        # Encode the video.
+        start = time.perf_counter()
+        env.close()
+        seconds = time.perf_counter() - start
+
+    return rate(num_frames, seconds, 'frames')
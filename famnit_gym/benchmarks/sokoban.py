@@ -0,0 +1,87 @@
+import numpy as np
+import gymnasium as gym
+
+import famnit_gym
+import famnit_gym.envs
+from famnit_gym.benchmarks.core import benchmark, measure, rate
+from famnit_gym.envs.sokoban import SokobanMap, SokobanEnv, FailureSampler
+from famnit_gym.wrappers.sokoban import Insights
+
+
+def _random_steps(env, duration):
+    env.reset(seed=0)
+    actions = np.random.default_rng(0).integers(4, size=4096)
+    index = [0]
+
+    def step():
+        (_, _, terminated, truncated, _) = env.step(int(actions[index[0] % len(actions)]))
+        index[0] += 1
+        if terminated or truncated:
+            env.reset()
+
+    return measure(step, duration)
+
+
+@benchmark('sokoban_map_construction')
+def sokoban_map_construction(duration):
+    directory = famnit_gym.envs.DIR_ENVS + '/sokoban'
+    (calls, seconds) = measure(lambda: SokobanMap(map_template=0, dir=directory), duration)
+    return rate(calls, seconds, 'maps')
+
+
+@benchmark('sokoban_reset')
+def sokoban_reset(duration):
+    env = SokobanEnv(options={'map_template': 0})
+    (calls, seconds) = measure(env.reset, duration)
+    env.close()
+    return rate(calls, seconds, 'resets')
+
+
+@benchmark('sokoban_reset_level')
+def sokoban_reset_level(duration):
+    results = {}
+
+    # Swapping the level at reset, and choosing it with a level sampler.
+    env = SokobanEnv(options={'map_template': 0})
+    env.reset(seed=0)
+    level = [0]
+
+    def reset():
+        level[0] = (level[0] + 1) % 1000
+        env.reset(options={'map_template': level[0]})
+
+    (calls, seconds) = measure(reset, duration / 2)
+    results['map_template'] = rate(calls, seconds, 'resets')
+    env.close()
+
+    env = SokobanEnv(options={'level_sampler': FailureSampler()})
+    env.reset(seed=0)
+
+    def sampled_reset():
+        env.step(0)
+        env.reset()
+
+    (calls, seconds) = measure(sampled_reset, duration / 2)
+    results['failure_sampler'] = rate(calls, seconds, 'resets')
+    env.close()
+
+    return results
+
+
+@benchmark('sokoban_step')
+def sokoban_step(duration):
+    results = {}
+
+    # The raw environment, the environment created by gym.make (with its checkers), and the Insights wrapper.
+    environments = {
+        'raw': SokobanEnv(options={'map_template': 0}),
+        'gym_make': gym.make('famnit_gym/Sokoban-v1', options={'map_template': 0}),
+        'insights': Insights(gym.make('famnit_gym/Sokoban-v1', options={'map_template': 0}))
+    }
+
+    for (name, env) in environments.items():
+        (calls, seconds) = _random_steps(env, duration / len(environments))
+        results[name] = rate(calls, seconds, 'steps')
+        env.close()
+
+    return results
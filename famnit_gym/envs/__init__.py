@@ -1,4 +1,5 @@
 import os
 from famnit_gym.envs.sokoban.sokoban_env import SokobanEnv
+from famnit_gym.envs.sokoban.sokoban_push_env import SokobanPushEnv
 
 DIR_ENVS = os.path.dirname(__file__)
\ No newline at end of file
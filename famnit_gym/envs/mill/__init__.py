@@ -1,2 +1,9 @@
 from famnit_gym.envs.mill.mill_env import MillEnv
-from famnit_gym.envs.mill.mill_env import env, transition_model
\ No newline at end of file
+from famnit_gym.envs.mill.mill_env import env, transition_model
+from famnit_gym.envs.mill.mill_parallel_env import MillParallelEnv, MillBatch
+from famnit_gym.envs.mill.mill_parallel_env import parallel_env, no_op
+from famnit_gym.envs.mill.mill_record import GameWriter, game_file_rules, read_games, replay_game, replay_games
+from famnit_gym.envs.mill import mill_features, mill_masks
+from famnit_gym.envs.mill.mill_masks import legal_move_masks
+from famnit_gym.envs.mill.mill_rules import MillRules, get_rules, rule_sets
+from famnit_gym.envs.mill.mill_history import PositionHistory
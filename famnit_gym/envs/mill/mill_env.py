@@ -1,15 +1,20 @@
 import functools
+import time
 import numpy as np
 import gymnasium as gym
+from gymnasium.utils import seeding
 from pettingzoo import AECEnv
 from pettingzoo.utils import agent_selector as AgentSelector
 
 from famnit_gym.envs.mill.mill_model import MillModel
+from famnit_gym.envs.mill.mill_rules import get_rules
+from famnit_gym.envs.mill import mill_features
+from famnit_gym.envs.profiling import Profiler
 
 # Create the Mill environment.
-def env(render_mode=None):
+def env(render_mode=None, observation_mode='board', rules=None):
     internal_render_mode = None if render_mode != "human" else render_mode
-    env = MillEnv(render_mode=render_mode)
+    env = MillEnv(render_mode=render_mode, observation_mode=observation_mode, rules=rules)
     return env
 
 # Return the Mill transition model for off-line computations.
@@ -26,8 +31,19 @@ class MillEnv(AECEnv):
         "render_fps": 60
     }
 
-    def __init__(self, render_mode=None):
+    def __init__(self, render_mode=None, observation_mode='board', rules=None):
+        if observation_mode not in ('board', 'features'):
+            raise ValueError(f"Unknown observation mode '{observation_mode}'. Use 'board' or 'features'.")
+
+        # The rule set, e.g., 'nine', 'twelve', 'six' or MillRules.
+        self._rules = get_rules(rules)
+        num_positions = self._rules.num_positions
+
+        if observation_mode == 'features' and not self._rules.standard_board():
+            raise ValueError('The feature observations are only available on the 24-position board.')
+
         self.render_mode = render_mode
+        self.observation_mode = observation_mode
 
         # The names of the players.
         self.possible_agents = ["player_1", "player_2"]
@@ -38,18 +54,32 @@ class MillEnv(AECEnv):
         )
 
         # Actions are [from, to, capture]; 0 means ignore, 1 - 24 are board positions.
-        self._action_space = gym.spaces.MultiDiscrete(np.array([25, 25, 25]))
+        self._action_space = gym.spaces.MultiDiscrete(np.array([num_positions + 1] * 3))
 
         # Observation is an array of board positions: 0 - empty, 1 - player_1, 2 - player_2.
         self._observation_space = gym.spaces.Box(
             low=0, high=2,
-            shape=(24,),
+            shape=(num_positions,),
             dtype=np.uint8
         )
 
+        # Or the feature planes of the board from the agent's point of view (see mill_features.plane_names).
+        if observation_mode == 'features':
+            self._observation_space = gym.spaces.Box(
+                low=0, high=1,
+                shape=(len(mill_features.plane_names), 24),
+                dtype=np.float32
+            )
+
         # The model gets created at reset.
         self._model = None
 
+        # The random generator for the moves chosen instead of the illegal ones. It is seeded at reset.
+        self.np_random = None
+
+        # The profiler is only set when profiling is enabled.
+        self._profiler = None
+
         # Do we use pygame?
         self._pygame_initialized = False
 
@@ -65,12 +95,7 @@ class MillEnv(AECEnv):
             self._clock = pygame.time.Clock()
             self._pygame_initialized = True
 
-            self._render_positions = [
-                (0, 0), (0, 3), (0, 6), (1, 1), (1, 3), (1, 5),
-                (2, 2), (2, 3), (2, 4), (3, 0), (3, 1), (3, 2),
-                (3, 4), (3, 5), (3, 6), (4, 2), (4, 3), (4, 4),
-                (5, 1), (5, 3), (5, 5), (6, 0), (6, 3), (6, 6)
-            ]
+            self._render_positions = self._rules.coordinates
 
             self._animation = None
 
@@ -86,6 +111,9 @@ class MillEnv(AECEnv):
         return self._action_space
 
     def observe(self, agent):
+        if self.observation_mode == 'features':
+            return mill_features.model_features(self._model, self.agent_index[agent])
+
         # All agents observe the same board.
         return np.array(self._model._board)[1:]
 
@@ -95,9 +123,35 @@ class MillEnv(AECEnv):
         opponent_idx = 3 - agent_idx  # 1 -> 2, 2 -> 1
         return self.agents[opponent_idx - 1]
 
+    # Start measuring the time spent in the stages of reset and step. The callback receives the statistics after every step.
+    def enable_profiling(self, callback=None):
+        self._profiler = Profiler(callback)
+        if self._model is not None:
+            self._model._profiler = self._profiler
+        return self._profiler
+
+    def disable_profiling(self):
+        self._profiler = None
+        if self._model is not None:
+            self._model._profiler = None
+
+    # Return the profiling statistics as {stage: {'time': seconds, 'calls': count}}.
+    def profile(self):
+        return self._profiler.as_dict() if self._profiler is not None else {}
+
     def reset(self, seed=None, options=None):
+        profiler = self._profiler
+        if profiler is not None:
+            start = time.perf_counter()
+
+        # Seed the random generator. Without a seed, the generator continues its sequence.
+        if seed is not None or self.np_random is None:
+            (self.np_random, _) = seeding.np_random(seed)
+
         # Create a new model.
-        self._model = MillModel()
+        self._model = MillModel(self._rules)
+        self._model._profiler = profiler
+        self._model.enable_history()
 
         # Reset the environment variables.
         self.agents = self.possible_agents[:]
@@ -106,6 +160,7 @@ class MillEnv(AECEnv):
         self.terminations = {agent: False for agent in self.agents}
         self.truncations = {agent: False for agent in self.agents}
         self.num_moves = 0
+        self._last_move = None
 
         # Compute the legal moves for both players.
         self.legal_moves = {
@@ -119,6 +174,7 @@ class MillEnv(AECEnv):
                 'agent': agent,
                 'move': 1,
                 'phase': 'placing',
+                'draw': None,
                 'legal_moves': self.legal_moves[agent]
             } for agent in self.agents
         }
@@ -127,9 +183,15 @@ class MillEnv(AECEnv):
         self._agent_selector = AgentSelector(self.agents)
         self.agent_selection = self._agent_selector.next()
 
+        if profiler is not None:
+            start = profiler.record('reset', start)
+
         # Render the empty board.
         self.render()
 
+        if profiler is not None:
+            profiler.record('render', start)
+
     def step(self, action):
         # Get the current player and its opponent.
         agent = self.agent_selection
@@ -142,6 +204,10 @@ class MillEnv(AECEnv):
             )
             return
 
+        profiler = self._profiler
+        if profiler is not None:
+            start = time.perf_counter()
+
         # Actions must be a numpy array.
         if action is not None:
             action = np.array(action)
@@ -156,16 +222,23 @@ class MillEnv(AECEnv):
 
         # If action is none or not legal, choose a random legal action instead.
         if action is None:
-            action = legal_moves[np.random.choice(legal_moves.shape[0])]
+            action = legal_moves[self.np_random.integers(legal_moves.shape[0])]
 
         # Assert the shape of the action.
         assert action.shape == (3,)
 
+        if profiler is not None:
+            start = profiler.record('validation', start)
+
         # The previous reward has just been observed. Start anew.
         self._cumulative_rewards[agent] = 0
 
-        # Make the move.
-        move_info = self._model.make_move(self.agent_index[agent], action.tolist())
+        # Make the move. The move that was actually played is kept for the wrappers.
+        self._last_move = action.tolist()
+        move_info = self._model.make_move(self.agent_index[agent], self._last_move)
+
+        if profiler is not None:
+            start = profiler.record('model_update', start)
 
         # Set the rewards for both players.
         if move_info['pieces_captured'] > 0:
@@ -184,17 +257,28 @@ class MillEnv(AECEnv):
 
             # Check if the game is too long.
             self.truncations = {
-                agent: self.num_moves >= 100 for agent in self.agents
+                agent: self._rules.move_limit is not None and self.num_moves >= self._rules.move_limit
+                    for agent in self.agents
             }
         
-        # Check if the game is over.
+        # Check if the game is over, either lost or drawn by repetition or by too many plies without a capture.
         if self._model.game_over():
             self.terminations = {
                 agent: True for agent in self.agents
             }
 
+            draw = self._model.draw_reason()
+            for info in self.infos.values():
+                info['draw'] = draw
+
+        if profiler is not None:
+            start = profiler.record('bookkeeping', start)
+
         # Compute the legal moves for the opponent.
         self.legal_moves[opponent] = np.array(self._model.legal_moves(self.agent_index[opponent]))
+
+        if profiler is not None:
+            start = profiler.record('move_generation', start)
         
         # Update the agent's info.
         self.infos[agent]['phase'] = move_info['player_phase']
@@ -211,10 +295,17 @@ class MillEnv(AECEnv):
                 'player': agent
             }
 
+        if profiler is not None:
+            start = profiler.record('bookkeeping', start, count=False)
+
         self.render()
 
         # Set the next player.
         self.agent_selection = self._agent_selector.next()
+
+        if profiler is not None:
+            profiler.record('render', start)
+            profiler.export()
     
     def render(self):
         if self.render_mode is None:
@@ -232,8 +323,9 @@ class MillEnv(AECEnv):
                 player_idx = self.agent_index[self._animation['player']]
                 opponent_idx = self.agent_index[self._get_opponent(self._animation['player'])]
 
-                # Back up the current board.
-                model_backup = self._model.clone()
+                # Back up the current board. Only the board is changed for the animation, so the model itself
+                # (with its profiler and history) is kept.
+                board_backup = self._model._board[:]
 
                 # Remove the destination piece. It will be rendered separately.
                 self._model._board[self._animation['dst']] = 0
@@ -258,7 +350,7 @@ class MillEnv(AECEnv):
                 self._animate_board(p0, p1, player_idx)
             
                 # Restore the current board.
-                self._model = model_backup
+                self._model._board[:] = board_backup
 
                 # Animate capturing the piece.
                 if self._animation['captured'] > 0:
@@ -301,6 +393,23 @@ class MillEnv(AECEnv):
 
             # Background
             surface.fill("tan")
+
+            # Other boards are drawn from their connections.
+            if not self._rules.standard_board():
+                for (a, b) in self._rules.connections:
+                    (row_a, col_a) = self._render_positions[a - 1]
+                    (row_b, col_b) = self._render_positions[b - 1]
+                    pygame.draw.line(
+                        surface, "black",
+                        pygame.math.Vector2((52 + col_a * 100, 52 + row_a * 100)),
+                        pygame.math.Vector2((52 + col_b * 100, 52 + row_b * 100)),
+                        10
+                    )
+
+                for (row, col) in self._render_positions:
+                    pygame.gfxdraw.filled_circle(surface, 52 + col * 100, 52 + row * 100, 10, (0, 0, 0))
+                    pygame.gfxdraw.aacircle(surface, 52 + col * 100, 52 + row * 100, 10, (0, 0, 0))
+                return
             
             # Squares
             pygame.draw.rect(surface, "black", pygame.Rect((47, 47), (610, 610)), 10)
@@ -0,0 +1,104 @@
+import numpy as np
+
+from famnit_gym.envs.mill.mill_model import MillModel, FLYING
+
+# The tables use positions 0 - 23, which are the board positions 1 - 24.
+mills = np.array(MillModel.mills, dtype=np.int64) - 1
+
+# membership[m, p] is 1 if the mill m contains the position p. A position is a part of two or three mills.
+membership = np.zeros((len(mills), 24), dtype=np.int64)
+for (m, mill) in enumerate(mills):
+    membership[m, mill] = 1
+
+# adjacency[p, q] is 1 if a piece can move from p to q in the moving phase.
+adjacency = np.zeros((24, 24), dtype=np.int64)
+for (a, b, c) in mills:
+    adjacency[[a, b, b, c], [b, a, c, b]] = 1
+
+# The feature planes, in the order of the observation. All of them are from the point of view of the player.
+plane_names = [
+    'own_pieces', 'opponent_pieces', 'empty',
+    'own_in_mill', 'opponent_in_mill',
+    'own_open_mill', 'opponent_open_mill',
+    'own_mobility', 'opponent_mobility',
+    'opponent_capturable', 'own_capturable',
+    'own_holding', 'opponent_holding',
+    'own_flying', 'opponent_flying'
+]
+
+
+# The pieces (N x 24) that are a part of a formed mill.
+def _in_mill(pieces):
+    formed = pieces[:, mills].all(axis=2)
+    return (formed @ membership) > 0
+
+
+# The empty positions (N x 24) that would complete a mill with two of the pieces.
+def _open_mill(pieces, empty):
+    open = (pieces[:, mills].sum(axis=2) == 2) & empty[:, mills].any(axis=2)
+    return empty & ((open @ membership) > 0)
+
+
+# The pieces that the opponent can capture: the ones outside mills, or all of them if they are all in mills.
+def _capturable(pieces, in_mill):
+    free = pieces & ~in_mill
+    return np.where(free.any(axis=1, keepdims=True), free, pieces)
+
+
+# The fraction of neighbours (at most 4) that are empty, for every piece. A flying piece can move anywhere.
+def _mobility(pieces, empty, flying):
+    mobility = (empty @ adjacency) / 4
+    mobility = np.where(flying[:, None], empty.any(axis=1, keepdims=True), mobility)
+    return pieces * mobility
+
+
+# Compute the feature planes of the boards (24 or N x 24, values 0 - 2) for the player (1 or 2, or an array of N).
+# The pieces in hand and the phases are given as (N x) 2 arrays for (player 1, player 2) and default to the moving phase.
+# The pieces in hand are divided by the number of pieces of the rules, so the planes stay within 0 - 1.
+# Returns a (15, 24) or (N, 15, 24) float32 array with the planes listed in plane_names.
+def feature_planes(board, player, holding=None, flying=None, pieces=9):
+    board = np.asarray(board)
+    batched = board.ndim == 2
+    board = np.atleast_2d(board)
+    n = len(board)
+
+    player = np.broadcast_to(np.asarray(player), (n,))[:, None]
+    holding = np.zeros((n, 2)) if holding is None else np.atleast_2d(holding)
+    flying = np.zeros((n, 2), dtype=bool) if flying is None else np.atleast_2d(flying).astype(bool)
+
+    # The columns of player 1 and 2, reordered to (own, opponent).
+    rows = np.arange(n)
+    own_column = player[:, 0] - 1
+    opponent_column = 1 - own_column
+
+    own = board == player
+    opponent = board == 3 - player
+    empty = board == 0
+
+    own_in_mill = _in_mill(own)
+    opponent_in_mill = _in_mill(opponent)
+
+    planes = np.stack([
+        own, opponent, empty,
+        own_in_mill, opponent_in_mill,
+        _open_mill(own, empty), _open_mill(opponent, empty),
+        _mobility(own, empty, flying[rows, own_column]),
+        _mobility(opponent, empty, flying[rows, opponent_column]),
+        _capturable(opponent, opponent_in_mill), _capturable(own, own_in_mill),
+        np.broadcast_to(holding[rows, own_column][:, None] / pieces, (n, 24)),
+        np.broadcast_to(holding[rows, opponent_column][:, None] / pieces, (n, 24)),
+        np.broadcast_to(flying[rows, own_column][:, None], (n, 24)),
+        np.broadcast_to(flying[rows, opponent_column][:, None], (n, 24))
+    ], axis=1).astype(np.float32)
+
+    return planes if batched else planes[0]
+
+
+# Compute the feature planes of the model's position for the player.
+def model_features(model, player):
+    return feature_planes(
+        model._board[1:], player,
+        holding=[model.get_pieces_holding(1), model.get_pieces_holding(2)],
+        flying=[model.get_phase_code(1) == FLYING, model.get_phase_code(2) == FLYING],
+        pieces=model.get_rules().pieces
+    )
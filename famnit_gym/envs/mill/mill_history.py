@@ -0,0 +1,112 @@
+import numpy as np
+
+# The number of plies kept in the history when the rules have no limit on the plies without a capture.
+default_capacity = 256
+
+# Zobrist keys of the position hash: a key for every (position, piece), the player to move and the pieces in hand.
+# The keys are fixed, so the hashes are the same in every process.
+_rng = np.random.default_rng(0x4D494C4C)
+_max_positions = 64
+_max_pieces = 32
+piece_keys = [[int(key) for key in row] for row in _rng.integers(1, 1 << 63, size=(_max_positions + 1, 3))]
+turn_keys = [int(key) for key in _rng.integers(1, 1 << 63, size=3)]
+holding_keys = [[int(key) for key in row] for row in _rng.integers(1, 1 << 63, size=(3, _max_pieces + 1))]
+
+
+# Compute the hash of the board (with the dummy position 0), the pieces in hand and the player to move from scratch.
+# The model updates the same hash incrementally.
+def position_hash(board, holding, player):
+    key = turn_keys[player] ^ holding_keys[1][holding[1]] ^ holding_keys[2][holding[2]]
+    for (position, piece) in enumerate(board):
+        if piece != 0:
+            key ^= piece_keys[position][piece]
+    return key
+
+
+class PositionHistory:
+    # The hashes of the last capacity positions in a ring buffer, with a count of every hash in the buffer,
+    # so a repetition is found without scanning the history. Every entry also keeps the number of plies since
+    # the last capture and an undo record, so a search can take the moves back with pop().
+    def __init__(self, capacity=default_capacity):
+        self.capacity = capacity
+        self._keys = [0 for _ in range(capacity)]
+        self._quiet = [0 for _ in range(capacity)]
+        self._undo = [None for _ in range(capacity)]
+        self._start = 0
+        self._length = 0
+        self._counts = {}
+
+    def copy(self):
+        history = PositionHistory.__new__(PositionHistory)
+        history.capacity = self.capacity
+        history._keys = self._keys[:]
+        history._quiet = self._quiet[:]
+        history._undo = self._undo[:]
+        history._start = self._start
+        history._length = self._length
+        history._counts = dict(self._counts)
+        return history
+
+    def clear(self):
+        self._start = 0
+        self._length = 0
+        self._counts = {}
+
+    def __len__(self):
+        return self._length
+
+    def _last(self):
+        return (self._start + self._length - 1) % self.capacity
+
+    # Add the position after a move. If the buffer is full, the oldest position is dropped.
+    # Returns the number of times the position is in the history.
+    def push(self, key, capture=False, undo=None):
+        quiet = 0 if capture or self._length == 0 else self._quiet[self._last()] + 1
+
+        if self._length == self.capacity:
+            oldest = self._keys[self._start]
+            self._counts[oldest] -= 1
+            if self._counts[oldest] == 0:
+                del self._counts[oldest]
+            self._start = (self._start + 1) % self.capacity
+            self._length -= 1
+
+        index = (self._start + self._length) % self.capacity
+        self._keys[index] = key
+        self._quiet[index] = quiet
+        self._undo[index] = undo
+        self._length += 1
+
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+        return count
+
+    # Remove the last position and return its undo record. The positions dropped from a full buffer do not come back.
+    def pop(self):
+        if self._length == 0:
+            raise IndexError('pop from an empty position history')
+
+        index = self._last()
+        key = self._keys[index]
+        self._counts[key] -= 1
+        if self._counts[key] == 0:
+            del self._counts[key]
+        self._length -= 1
+
+        undo = self._undo[index]
+        self._undo[index] = None
+        return undo
+
+    # The hash of the current position.
+    def key(self):
+        return self._keys[self._last()] if self._length > 0 else None
+
+    # How many times the position with the given hash (the current one by default) is in the history.
+    def repetitions(self, key=None):
+        if key is None:
+            key = self.key()
+        return self._counts.get(key, 0)
+
+    # The number of plies since the last capture.
+    def quiet_plies(self):
+        return self._quiet[self._last()] if self._length > 0 else 0
@@ -0,0 +1,87 @@
+import numpy as np
+
+from famnit_gym.envs.mill.mill_model import phase_codes, PLACING, MOVING, FLYING, LOST
+from famnit_gym.envs.mill.mill_features import mills, adjacency, _in_mill, _capturable
+
+# The masks are indexed by the action [src, dst, take], with 0 meaning none and 1 - 24 the board positions,
+# as the MultiDiscrete([25, 25, 25]) action space of the environment.
+
+
+def _completion_table():
+    # Every (mill, position) pair: the position d completes the mill if the other two positions a and b are occupied.
+    entries = [(mill[k], *np.delete(mill, k)) for mill in mills for k in range(3)]
+    (d, a, b) = (np.array(column) for column in zip(*entries))
+
+    # table[e, src, dst] is 1 if the entry e forms a mill when a piece moves from src to dst (board positions),
+    # which it does not when the piece leaves one of the other two positions.
+    table = np.zeros((len(entries), 25, 25), dtype=np.float32)
+    for e in range(len(entries)):
+        table[e, :, d[e] + 1] = 1
+        table[e, [a[e] + 1, b[e] + 1], d[e] + 1] = 0
+
+    return a, b, table.reshape(len(entries), 25 * 25)
+
+
+(_first, _second, _completion) = _completion_table()
+
+
+# Convert the phases (strings or codes) to an array of codes.
+def _phase_array(phases):
+    phases = np.asarray(phases)
+    if phases.dtype.kind in 'US':
+        phases = np.vectorize(phase_codes.__getitem__, otypes=[np.int64])(phases)
+    return phases.astype(np.int64)
+
+
+# Compute the legal action masks of the boards (N x 24, values 0 - 2) for the players to move (N).
+# The phases of (player 1, player 2) are given as N x 2 codes or strings.
+# Returns an N x 25 x 25 x 25 boolean array: masks[n, src, dst, take] is True if the move is legal.
+def legal_move_masks(boards, players, phases):
+    boards = np.atleast_2d(boards)
+    n = len(boards)
+    players = np.broadcast_to(np.asarray(players), (n,))
+    phases = _phase_array(phases).reshape(n, 2)
+    rows = np.arange(n)
+
+    own = boards == players[:, None]
+    opponent = boards == 3 - players[:, None]
+    empty = boards == 0
+    phase = phases[rows, players - 1]
+
+    # The source and destination pairs, with source 0 for placing.
+    pairs = np.zeros((n, 25, 25), dtype=bool)
+    pairs[:, 0, 1:] = empty & (phase == PLACING)[:, None]
+    moves = own[:, :, None] & empty[:, None, :]
+    moves &= np.where((phase == MOVING)[:, None, None], adjacency > 0, (phase == FLYING)[:, None, None])
+    pairs[:, 1:, 1:] = moves
+
+    # No moves when the game is over.
+    pairs &= ~(phases == LOST).any(axis=1)[:, None, None]
+
+    # Does the move form a mill? The player's other pieces are unchanged by the move.
+    # The table is float32, so the product runs as a BLAS matrix multiplication.
+    complete = (own[:, _first] & own[:, _second]).astype(np.float32)
+    forms = ((complete @ _completion) > 0).reshape(n, 25, 25)
+
+    # A move that forms a mill must capture one of the opponent's capturable pieces.
+    capturable = _capturable(opponent, _in_mill(opponent))
+
+    masks = np.zeros((n, 25, 25, 25), dtype=bool)
+    masks[:, :, :, 0] = pairs & ~forms
+    # Only a few moves form a mill, so the captures are filled in for those only.
+    (game, src, dst) = np.nonzero(pairs & forms)
+    masks[game, src, dst, 1:] = capturable[game]
+
+    return masks
+
+
+# Compute the legal action masks of the models' positions for the players to move.
+def model_masks(models, players):
+    boards = [model._board[1:] for model in models]
+    phases = [[model.get_phase_code(1), model.get_phase_code(2)] for model in models]
+    return legal_move_masks(boards, players, phases)
+
+
+# Return the legal moves [src, dst, take] of one mask as an array, sorted by src, dst and take.
+def mask_moves(mask):
+    return np.argwhere(mask)
@@ -1,64 +1,105 @@
+import time
+
+from famnit_gym.envs.mill import mill_symmetry
+from famnit_gym.envs.mill.mill_history import PositionHistory, default_capacity, position_hash
+from famnit_gym.envs.mill.mill_history import piece_keys, turn_keys, holding_keys
+from famnit_gym.envs.mill.mill_rules import get_rules, nine_mens_morris
+
+# The phases as integer codes, for arrays of positions.
+PLACING, MOVING, FLYING, LOST = 0, 1, 2, 3
+phase_codes = {'placing': PLACING, 'moving': MOVING, 'flying': FLYING, 'lost': LOST}
+
+# The phase names by their codes. The dummy player 0 has the code 4.
+phase_names = ['placing', 'moving', 'flying', 'lost', 'dummy']
+
 class MillModel:
-    # Define all possible mill triplets.
-    mills = [
-        [1, 2, 3], [4, 5, 6], [7, 8, 9], [10, 11, 12],
-        [13, 14, 15], [16, 17, 18], [19, 20, 21], [22, 23, 24],
-        [1, 10, 22], [4, 11, 19], [7, 12, 16], [2, 5, 8],
-        [17, 20, 23], [9, 13, 18], [6, 14, 21], [3, 15, 24],
-        [1, 4, 7], [3, 6, 9], [16, 19, 22], [18, 21, 24]
-    ]
-
-    def __init__(self):
-        self._board = [0 for _ in range(25)]
-        
+    # The mill triplets and the connections of the default rules. Every model uses the tables of its own rules.
+    mills = nine_mens_morris.mills
+    connections = nine_mens_morris.connections
+
+    # An environment can set a profiler to measure the mobility check in make_move.
+    _profiler = None
+
+    # The rules are given by name ('nine', 'twelve', 'six') or as MillRules. The default is Nine Men's Morris.
+    def __init__(self, rules=None):
+        self._rules = get_rules(rules)
+        self._board = [0 for _ in range(self._rules.num_positions + 1)]
+
+        # The phase codes, the pieces in hand and the pieces on the board of both players.
         # Player with index 0 is a dummy to avoid index shifting.
-        self._player = [
-            {'phase': 'dummy', 'pieces_holding': 0, 'pieces_playing': 0},
-            {'phase': 'placing', 'pieces_holding': 9, 'pieces_playing': 0},
-            {'phase': 'placing', 'pieces_holding': 9, 'pieces_playing': 0}
-        ]
+        self._phase = [4, PLACING, PLACING]
+        self._holding = [0, self._rules.pieces, self._rules.pieces]
+        self._playing = [0, 0, 0]
 
-        # Compute the connections from the mills.
-        self.connections = []
-        for [a, b, c] in self.mills:
-            self.connections.extend([[a, b], [b, c]])
+        # The position history for the draw rules. It is only kept after enable_history() is called.
+        self._history = None
 
     def clone(self):
-        # Create and return a cuplicate of itself.
-        board = MillModel()
-        board._board = list(self._board)
-        board._player = [dict(player) for player in self._player]
+        # Create and return a cuplicate of itself, without running the constructor.
+        board = MillModel.__new__(MillModel)
+        board._rules = self._rules
+        board._board = self._board[:]
+        board._phase = self._phase[:]
+        board._holding = self._holding[:]
+        board._playing = self._playing[:]
+        board._history = self._history.copy() if self._history is not None else None
         return board
 
+    # Start keeping the position history, with the given player to move. The game is then drawn by repetition or
+    # after too many plies without a capture, as set by the rules, and the moves can be taken back with undo_move().
+    def enable_history(self, player=1):
+        capacity = self._rules.no_capture_limit + 1 if self._rules.no_capture_limit is not None else default_capacity
+        self._history = PositionHistory(capacity)
+        self._history.push(position_hash(self._board, self._holding, player), capture=True)
+
+    def get_history(self):
+        return self._history
+
+    # The hash of the current position and the player to move, if the history is kept.
+    def position_hash(self):
+        return self._history.key() if self._history is not None else None
+
+    def get_rules(self):
+        return self._rules
+
     def get_state(self):
         return self._board[1:]
 
+    def canonical(self):
+        # The symmetric variant of the board with the minimal hash as (board, hash, transform).
+        # The symmetries are only defined for the 24-position board.
+        if not self._rules.standard_board():
+            raise ValueError('The board symmetries are only available on the 24-position board.')
+        return mill_symmetry.canonical(self._board[1:])
+
     def get_phase(self, player):
-        return self._player[player]['phase']
+        return phase_names[self._phase[player]]
+
+    # The phase as an integer code: PLACING, MOVING, FLYING or LOST.
+    def get_phase_code(self, player):
+        return self._phase[player]
+
+    def get_pieces_holding(self, player):
+        return self._holding[player]
 
     def _in_mill(self, position):
         # Is the piece at the given position a part of a formed mill?
-        for mill in self.mills:
-            if position in mill:
-                if self._board[mill[0]] == self._board[mill[1]] == self._board[mill[2]]:
-                    return True
+        board = self._board
+        piece = board[position]
+        for (a, b) in self._rules.position_mills[position]:
+            if board[a] == piece and board[b] == piece:
+                return True
         return False
 
     def _all_pieces(self, player):
         # Return all the pieces of the given player.
-        positions = []
-        for (position, piece) in enumerate(self._board):
-            if piece == player:
-                positions.append(position)
-        return positions
+        return [position for (position, piece) in enumerate(self._board) if piece == player]
 
     def _free_pieces(self, player):
         # Return all pieces for of the given player that are not in a mill formation.
-        positions = []
-        for (position, piece) in enumerate(self._board):
-            if piece == player and not self._in_mill(position):
-                positions.append(position)
-        return positions
+        return [
+            position for (position, piece) in enumerate(self._board) if piece == player and not self._in_mill(position)
+        ]
 
     def _capture_pieces(self, player):
         # Return all pieces of the given player that can be captured.
@@ -68,179 +109,235 @@ class MillModel:
         return positions
 
     def count_pieces(self, player):
-        return len(self._all_pieces(player))
+        return self._board.count(player)
+
+    # Append the moves from src to dst to the list. If the piece forms a mill, every capture is a separate move.
+    def _add_moves(self, moves, src, dst, captures):
+        if self._in_mill(dst):
+            for piece in captures:
+                moves.append([src, dst, piece])
+        else:
+            moves.append([src, dst, 0])
 
     def legal_moves(self, player):
         # If game has finished, there are no legal moves.
         if self.game_over():
             return []
 
-        player_info = self._player[player]
-        opponent = 2 if player == 1 else 1
+        phase = self._phase[player]
+        opponent = 3 - player
+        board = self._board
+        positions = self._rules.positions
         moves = []
 
+        # The opponent's capturable pieces do not change with the player's move.
+        captures = self._capture_pieces(opponent)
+
         # If the player is in the placing phase.
-        if player_info['phase'] == 'placing':
-            # Check all board positions.
-            for (dst, piece) in enumerate(self._board):
-                # Can only place on any empty position.
-                if dst == 0 or piece != 0:
+        if phase == PLACING:
+            # Can only place on any empty position.
+            for dst in positions:
+                if board[dst] != 0:
                     continue
 
-                # Do the move.
-                self._board[dst] = player
-
-                # If a mill has been formed, an opponent's piece must be captured.
-                if self._in_mill(dst):
-                    for piece in self._capture_pieces(opponent):
-                        moves.append([0, dst, piece])
-                
-                # If a mill has not been formed, non-capturing move is possible.
-                else:
-                    moves.append([0, dst, 0])
-
-                # Undo the move.
-                self._board[dst] = 0
+                # Do the move, check for a mill, and undo the move.
+                board[dst] = player
+                self._add_moves(moves, 0, dst, captures)
+                board[dst] = 0
 
-        # If the player is in the flying phase.
-        elif player_info['phase'] == 'moving':
-            # Check all board positions.
-            for (src, src_piece) in enumerate(self._board):
+        # If the player is in the moving phase.
+        elif phase == MOVING:
+            neighbours = self._rules.neighbours
+            for src in positions:
                 # Can only move it's own piece.
-                if src == 0 or src_piece != player:
+                if board[src] != player:
                     continue
 
-                # Check all connections.¸
-                for connection in self.connections:
-                    if src not in connection:
-                        continue
-
-                    # Get the connecting position.
-                    dst = connection[0] if src != connection[0] else connection[1]
-
-                    # If destination is empty, the player can move the piece there.
-                    if self._board[dst] == 0:
-                        # Do the move.
-                        self._board[src] = 0
-                        self._board[dst] = player
-
-                        # If a mill has been formed, an opponent's piece must be captured.
-                        if self._in_mill(dst):
-                            for piece in self._capture_pieces(opponent):
-                                moves.append([src, dst, piece])
-                        
-                        # If a mill has not been formed, non-capturing move is possible.
-                        else:
-                            moves.append([src, dst, 0])
-
-                        # Undo the move.
-                        self._board[src] = player
-                        self._board[dst] = 0
+                # Move along the connections to the empty neighbours.
+                board[src] = 0
+                for dst in neighbours[src]:
+                    if board[dst] == 0:
+                        board[dst] = player
+                        self._add_moves(moves, src, dst, captures)
+                        board[dst] = 0
+                board[src] = player
 
         # If the player is in the flying phase.
-        elif player_info['phase'] == 'flying':
-            # Check all board positions.
-            for (src, src_piece) in enumerate(self._board):
+        elif phase == FLYING:
+            empty = [dst for dst in positions if board[dst] == 0]
+
+            for src in positions:
                 # Can only move it's own piece.
-                if src == 0 or src_piece != player:
+                if board[src] != player:
                     continue
 
-                # Check all empty positions.
-                for (dst, dst_piece) in enumerate(self._board):
-                    # Can only move to an empty position.
-                    if dst == 0 or dst_piece != 0:
-                        continue
-
-                    # Do the move.
-                    self._board[src] = 0
-                    self._board[dst] = player
-
-                    # If a mill has been formed, an opponent's piece must be captured.
-                    if self._in_mill(dst):
-                        for piece in self._capture_pieces(opponent):
-                            moves.append([src, dst, piece])
-                    
-                    # If a mill has not been formed, non-capturing move is possible.
-                    else:
-                        moves.append([src, dst, 0])
-
-                    # Undo the move.
-                    self._board[src] = player
-                    self._board[dst] = 0
+                # Fly to any empty position.
+                board[src] = 0
+                for dst in empty:
+                    board[dst] = player
+                    self._add_moves(moves, src, dst, captures)
+                    board[dst] = 0
+                board[src] = player
 
         return moves
 
+    # Can the player make any move? This is the same as having legal moves, but much cheaper to check.
+    def _can_move(self, player):
+        if self._phase[1] == LOST or self._phase[2] == LOST:
+            return False
+
+        phase = self._phase[player]
+        board = self._board
+
+        # Placing and flying only need an empty position (and a piece to fly with).
+        if phase == PLACING:
+            return 0 in board[1:]
+        if phase == FLYING:
+            return 0 in board[1:] and player in board
+
+        # Moving needs a piece with an empty neighbour.
+        if phase == MOVING:
+            neighbours = self._rules.neighbours
+            for src in self._rules.positions:
+                if board[src] == player:
+                    for dst in neighbours[src]:
+                        if board[dst] == 0:
+                            return True
+        return False
+
     def make_move(self, player, move):
         (src, dst, take) = move
 
-        player_info = self._player[player]
+        phase = self._phase[player]
         opponent = 2 if player == 1 else 1
         captured = 0
 
+        # The state before the move, to take it back.
+        history = self._history
+        if history is not None:
+            undo = (player, move, self._phase[:], self._holding[:], self._playing[:])
+
         # If the player is in the placing phase.
-        if player_info['phase'] == 'placing':
+        if phase == PLACING:
             self._board[dst] = player
-            
-            player_info['pieces_playing'] += 1
-            player_info['pieces_holding'] -= 1
-            
-            if player_info['pieces_holding'] == 0:
-                player_info['phase'] = 'moving'
 
-        # If the player is in the moving phase.
-        elif player_info['phase'] == 'moving':
-            self._board[src] = 0
-            self._board[dst] = player
+            self._playing[player] += 1
+            self._holding[player] -= 1
 
-        # If the player is in the flying phase.
-        elif player_info['phase'] == 'flying':
+            if self._holding[player] == 0:
+                self._phase[player] = MOVING
+
+        # If the player is in the moving or the flying phase.
+        elif phase == MOVING or phase == FLYING:
             self._board[src] = 0
             self._board[dst] = player
 
         # If in any other phase, ignore the move.
         else:
             return {}
-        
-        # Get the information about the opponent.
-        opponent_info = self._player[opponent]
 
         # If a piece is taken, consider what happens with the opponent.
         if take > 0:
-            opponent_info['pieces_playing'] -= 1
+            self._playing[opponent] -= 1
             self._board[take] = 0
             captured = 1
 
-            # The opponent goes from moving to flying.
-            if opponent_info['phase'] == 'moving':
-                if opponent_info['pieces_playing'] <= 3:
-                    opponent_info['phase'] = 'flying'
-            
+            # The opponent goes from moving to flying, or loses if flying is not allowed.
+            flying = self._rules.flying
+            if self._phase[opponent] == MOVING:
+                if flying is not None and self._playing[opponent] <= flying:
+                    self._phase[opponent] = FLYING
+                elif flying is None and self._playing[opponent] <= 2:
+                    self._phase[opponent] = LOST
+
             # The opponent goes from flying to losing.
-            elif opponent_info['phase'] == 'flying':
-                if opponent_info['pieces_playing'] <= 2:
-                    opponent_info['phase'] = 'lost'
-        
+            elif self._phase[opponent] == FLYING:
+                if self._playing[opponent] <= 2:
+                    self._phase[opponent] = LOST
+
         # Check if the opponent can make moves.
-        if len(self.legal_moves(opponent)) == 0:
+        if self._profiler is not None:
+            start = time.perf_counter()
+
+        if not self._can_move(opponent):
             # If not, the opponent lost the game.
-            opponent_info['phase'] = 'lost'
-        
+            self._phase[opponent] = LOST
+
+        if self._profiler is not None:
+            self._profiler.record('model_update/mobility_check', start)
+
+        # Update the position hash with the changed positions, the pieces in hand and the player to move.
+        if history is not None:
+            key = history.key() ^ piece_keys[dst][player] ^ turn_keys[player] ^ turn_keys[opponent]
+            if src > 0:
+                key ^= piece_keys[src][player]
+            else:
+                key ^= holding_keys[player][self._holding[player] + 1] ^ holding_keys[player][self._holding[player]]
+            if take > 0:
+                key ^= piece_keys[take][opponent]
+            history.push(key, capture=take > 0, undo=undo)
+
         # Return the info.
         move_info = {
-            'player_phase': player_info['phase'],
-            'opponent_phase': opponent_info['phase'],
-            'pieces_holding': player_info['pieces_holding'],
-            'pieces_playing': player_info['pieces_playing'],
+            'player_phase': phase_names[self._phase[player]],
+            'opponent_phase': phase_names[self._phase[opponent]],
+            'pieces_holding': self._holding[player],
+            'pieces_playing': self._playing[player],
             'pieces_captured': captured
         }
 
         return move_info
-    
+
+    # Take back the last move. Only possible while the history is kept, for as many moves as the history holds.
+    def undo_move(self):
+        if self._history is None:
+            raise ValueError('The moves can only be taken back after enable_history() is called.')
+        if len(self._history) <= 1:
+            raise IndexError('There is no move to take back.')
+
+        (player, (src, dst, take), phase, holding, playing) = self._history.pop()
+        self._board[dst] = 0
+        if src > 0:
+            self._board[src] = player
+        if take > 0:
+            self._board[take] = 3 - player
+
+        self._phase = phase
+        self._holding = holding
+        self._playing = playing
+        return [src, dst, take]
+
+    # Why the game is drawn: 'repetition', 'no_capture', or None if it is not (or the history is not kept).
+    def draw_reason(self):
+        history = self._history
+        if history is None or self._phase[1] == LOST or self._phase[2] == LOST:
+            return None
+
+        rules = self._rules
+        if rules.repetitions is not None and history.repetitions() >= rules.repetitions:
+            return 'repetition'
+        if rules.no_capture_limit is not None and history.quiet_plies() >= rules.no_capture_limit:
+            return 'no_capture'
+        return None
+
+    def is_draw(self):
+        return self.draw_reason() is not None
+
     def game_over(self):
-        return self._player[1]['phase'] == 'lost' or self._player[2]['phase'] == 'lost'
+        if self._phase[1] == LOST or self._phase[2] == LOST:
+            return True
+        return self._history is not None and self.draw_reason() is not None
 
     def __str__(self):
         b = self._board
+
+        # Other boards are printed as the positions on the grid.
+        if self._rules.num_positions != 24:
+            grid = [['.' for _ in range(7)] for _ in range(7)]
+            for (position, (row, col)) in enumerate(self._rules.coordinates, start=1):
+                grid[row][col] = str(b[position])
+            return '\n'.join(' '.join(row) for row in grid)
+
         return (
             f"{b[1]}---------{b[2]}---------{b[3]}\n"
             f"| \\       |       / |\n"
@@ -253,4 +350,4 @@ class MillModel:
             f"|   {b[19]}-----{b[20]}-----{b[21]}   |\n"
             f"| /       |       \\ |\n"
             f"{b[22]}---------{b[23]}---------{b[24]}"
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,223 @@
+import functools
+import numpy as np
+from pettingzoo import ParallelEnv
+
+from famnit_gym.envs.mill.mill_env import MillEnv
+from famnit_gym.envs.mill.mill_model import MillModel, FLYING
+from famnit_gym.envs.mill import mill_features, mill_masks
+from famnit_gym.envs.mill.mill_rules import get_rules
+
+# The action of the player that waits for its turn. Any action of the waiting player is ignored.
+no_op = np.zeros(3, dtype=np.int64)
+
+# Create the Mill environment with the parallel API.
+def parallel_env(render_mode=None, observation_mode='board', rules=None):
+    return MillParallelEnv(render_mode=render_mode, observation_mode=observation_mode, rules=rules)
+
+class MillParallelEnv(ParallelEnv):
+    metadata = {
+        "framework": "PettingZoo",
+        "name": "mill_parallel_v1",
+        "render_modes": ["ansi", "human"],
+        "render_fps": 60
+    }
+
+    # Both players act at every step, but only the action of the player to move is executed.
+    # The game itself is played by the AEC environment, so the rules, rewards and rendering are the same.
+    def __init__(self, render_mode=None, observation_mode='board', rules=None):
+        self.render_mode = render_mode
+        self._env = MillEnv(render_mode=render_mode, observation_mode=observation_mode, rules=rules)
+
+        self.possible_agents = self._env.possible_agents[:]
+        self.agent_index = self._env.agent_index
+
+    @functools.lru_cache(maxsize=None)
+    def observation_space(self, agent):
+        return self._env.observation_space(agent)
+
+    @functools.lru_cache(maxsize=None)
+    def action_space(self, agent):
+        return self._env.action_space(agent)
+
+    # The AEC environment that plays the game.
+    @property
+    def aec_env(self):
+        return self._env
+
+    # The agent whose action is executed in the next step.
+    @property
+    def agent_selection(self):
+        return self._env.agent_selection
+
+    def enable_profiling(self, callback=None):
+        return self._env.enable_profiling(callback)
+
+    def disable_profiling(self):
+        self._env.disable_profiling()
+
+    def profile(self):
+        return self._env.profile()
+
+    def _observations(self):
+        # The board is the same for all agents, the features are from their own point of view.
+        if self._env.observation_mode == 'board':
+            board = self._env.observe(self._env.agent_selection)
+            return {agent: board for agent in self.possible_agents}
+        return {agent: self._env.observe(agent) for agent in self.possible_agents}
+
+    def _infos(self):
+        infos = {}
+        for agent in self.possible_agents:
+            info = dict(self._env.infos[agent])
+            info['to_move'] = agent == self._env.agent_selection
+
+            # The waiting player can only pass.
+            if not info['to_move']:
+                info['legal_moves'] = np.zeros((0, 3), dtype=np.int64)
+
+            infos[agent] = info
+        return infos
+
+    def reset(self, seed=None, options=None):
+        self._env.reset(seed=seed, options=options)
+        self.agents = self.possible_agents[:]
+        return self._observations(), self._infos()
+
+    # The actions are {agent: [from, to, capture]}. The waiting player's action may be omitted or no_op.
+    # If the action of the player to move is missing or illegal, a random legal move is chosen.
+    def step(self, actions):
+        agent = self._env.agent_selection
+        self._env.step(actions.get(agent))
+
+        observations = self._observations()
+        rewards = dict(self._env.rewards)
+        terminations = dict(self._env.terminations)
+        truncations = dict(self._env.truncations)
+        infos = self._infos()
+
+        # Agents are removed when the game ends.
+        if any(terminations.values()) or any(truncations.values()):
+            self.agents = []
+
+        return observations, rewards, terminations, truncations, infos
+
+    def render(self):
+        self._env.render()
+
+    def state(self):
+        return np.array(self._env._model._board)[1:]
+
+    def close(self):
+        self._env.close()
+
+class MillBatch:
+    # Play many games at once without the per-agent dictionaries. The games are reset automatically when they end.
+    # The games are truncated after max_moves moves of both players, which defaults to the move limit of the rules.
+    def __init__(self, num_games, max_moves=None, seed=None, rules=None):
+        self.num_games = num_games
+        self._rules = get_rules(rules)
+        self._max_moves = max_moves if max_moves is not None else self._rules.move_limit
+        self._rng = np.random.default_rng(seed)
+        self.reset()
+
+    def _reset_game(self, i):
+        self._models[i] = MillModel(self._rules)
+        self._models[i].enable_history()
+        self.players[i] = 1
+        self.num_moves[i] = 0
+        self.legal_moves[i] = self._models[i].legal_moves(1)
+
+    # Start all the games anew. Returns the observations.
+    def reset(self, seed=None):
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+
+        self._models = [None for _ in range(self.num_games)]
+
+        # The player to move, the number of full moves and the legal moves of the player to move, per game.
+        self.players = np.ones(self.num_games, dtype=np.int64)
+        self.num_moves = np.zeros(self.num_games, dtype=np.int64)
+        self.legal_moves = [None for _ in range(self.num_games)]
+
+        for i in range(self.num_games):
+            self._reset_game(i)
+
+        return self.observations()
+
+    # The boards of all the games as a num_games x num_positions array.
+    def observations(self):
+        return np.array([model._board[1:] for model in self._models], dtype=np.uint8)
+
+    # The feature planes of all the games from the point of view of the players to move, as a num_games x 15 x 24 array.
+    def features(self):
+        self._require_standard_board('feature planes')
+        holding = [[model.get_pieces_holding(1), model.get_pieces_holding(2)] for model in self._models]
+        flying = [[model.get_phase_code(1) == FLYING, model.get_phase_code(2) == FLYING] for model in self._models]
+        return mill_features.feature_planes(self.observations(), self.players, holding, flying, self._rules.pieces)
+
+    # The legal action masks of the players to move in all the games, as a num_games x 25 x 25 x 25 boolean array.
+    def legal_move_masks(self):
+        self._require_standard_board('legal move masks')
+        return mill_masks.model_masks(self._models, self.players)
+
+    def _require_standard_board(self, name):
+        if not self._rules.standard_board():
+            raise ValueError(f'The {name} are only available on the 24-position board.')
+
+    def models(self):
+        return self._models
+
+    # Execute the actions (num_games x 3) of the players to move in all the games.
+    # Illegal actions are replaced by random legal moves, as in the AEC environment.
+    # Returns the observations, the rewards (num_games x 2, by player), terminations, truncations and the info.
+    def step(self, actions):
+        actions = np.asarray(actions).tolist()
+
+        rewards = np.zeros((self.num_games, 2), dtype=np.int64)
+        terminations = np.zeros(self.num_games, dtype=bool)
+        truncations = np.zeros(self.num_games, dtype=bool)
+        illegal = np.zeros(self.num_games, dtype=bool)
+        draws = np.zeros(self.num_games, dtype=bool)
+        final_observations = {}
+
+        for i in range(self.num_games):
+            model = self._models[i]
+            player = int(self.players[i])
+            move = actions[i]
+
+            if move not in self.legal_moves[i]:
+                illegal[i] = True
+                move = self.legal_moves[i][int(self._rng.integers(len(self.legal_moves[i])))]
+
+            move_info = model.make_move(player, move)
+
+            # The player that captures a piece gets a reward of 1, the opponent -1.
+            if move_info['pieces_captured'] > 0:
+                rewards[i, player - 1] = 1
+                rewards[i, 2 - player] = -1
+
+            # A full move ends after the second player.
+            if player == 2:
+                self.num_moves[i] += 1
+                truncations[i] = self._max_moves is not None and self.num_moves[i] >= self._max_moves
+
+            terminations[i] = model.game_over()
+            draws[i] = terminations[i] and model.is_draw()
+
+            # Start a new game if this one ended, keeping its final board in the info.
+            if terminations[i] or truncations[i]:
+                final_observations[i] = np.array(model._board[1:], dtype=np.uint8)
+                self._reset_game(i)
+            else:
+                self.players[i] = 3 - player
+                self.legal_moves[i] = model.legal_moves(3 - player)
+
+        info = {
+            'players': self.players.copy(),
+            'legal_moves': self.legal_moves,
+            'illegal': illegal,
+            'draws': draws,
+            'final_observations': final_observations
+        }
+
+        return self.observations(), rewards, terminations, truncations, info
@@ -0,0 +1,155 @@
+import os
+import struct
+
+import numpy as np
+
+from famnit_gym.envs.mill.mill_model import MillModel, LOST
+from famnit_gym.envs.mill.mill_rules import get_rules, rule_sets
+
+# A game file starts with a header with the name of the rules, followed by the game records. Every record has
+# a header with the result and the number of moves, followed by the moves, one byte for each of the positions
+# [src, dst, take].
+_magic = b'MILLGAME'
+_version = 2
+_file_header = struct.Struct('<8sII16s')
+_record_header = struct.Struct('<BH')
+
+# The results of the games.
+UNFINISHED = 0
+PLAYER_1_WON = 1
+PLAYER_2_WON = 2
+DRAW = 3
+
+
+# Return the result of the game in the model's position.
+def game_result(model, truncated=False):
+    if model.get_phase_code(2) == LOST:
+        return PLAYER_1_WON
+    if model.get_phase_code(1) == LOST:
+        return PLAYER_2_WON
+    return DRAW if truncated or model.is_draw() else UNFINISHED
+
+
+# Encode a game as a record.
+def encode_game(moves, result):
+    moves = np.asarray(moves, dtype=np.uint8).reshape(-1, 3)
+    return _record_header.pack(result, len(moves)) + moves.tobytes()
+
+
+# Read the header of the game file and return the name of the rules of its games.
+def game_file_rules(filename):
+    with open(filename, 'rb') as f:
+        header = f.read(_file_header.size)
+
+    if len(header) < _file_header.size or header[:8] != _magic:
+        raise ValueError(f'The file {filename} does not contain Mill games.')
+
+    (_, version, _, name) = _file_header.unpack(header)
+    if version != _version:
+        raise ValueError(f'The game file {filename} has version {version}, not {_version}.')
+    return name.rstrip(b'\0').decode()
+
+
+# Return the rules to replay the games of the file with. The rules given by name are found from the file,
+# other rules must be given and have the same name.
+def _file_rules(filename, rules):
+    name = game_file_rules(filename)
+    if rules is None:
+        if name not in rule_sets:
+            raise ValueError(f"The games in {filename} use the rules '{name}', give them as MillRules to replay them.")
+        return rule_sets[name]
+
+    rules = get_rules(rules)
+    if rules.name != name:
+        raise ValueError(f"The games in {filename} use the rules '{name}', not '{rules.name}'.")
+    return rules
+
+
+class GameWriter:
+    # Append the games played under the rules to the file. The records are buffered and written in blocks.
+    # An existing file must hold games of the same rules.
+    def __init__(self, filename, buffer_size=1 << 16, rules=None):
+        self.rules = get_rules(rules)
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            _file_rules(filename, self.rules)
+
+        self._file = open(filename, 'ab')
+        self._buffer = []
+        self._buffered = 0
+        self._buffer_size = buffer_size
+        self.games = 0
+
+        # A new file gets the header.
+        if self._file.tell() == 0:
+            self._file.write(_file_header.pack(_magic, _version, 0, self.rules.name.encode()))
+
+    # Add a game, given as the list of moves [src, dst, take] starting with player 1, and its result.
+    def write(self, moves, result):
+        record = encode_game(moves, result)
+        self._buffer.append(record)
+        self._buffered += len(record)
+        self.games += 1
+
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        self._file.write(b''.join(self._buffer))
+        self._file.flush()
+        self._buffer = []
+        self._buffered = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# Stream the games from the file as (moves, result), where moves is a (length, 3) array of uint8.
+# The file is memory-mapped, so only the records that are read get loaded.
+def read_games(filename):
+    if os.path.getsize(filename) <= _file_header.size:
+        return
+
+    game_file_rules(filename)
+    data = np.memmap(filename, dtype=np.uint8, mode='r')
+
+    offset = _file_header.size
+    while offset + _record_header.size <= len(data):
+        (result, length) = _record_header.unpack(data[offset:offset + _record_header.size].tobytes())
+        offset += _record_header.size
+
+        moves = data[offset:offset + 3 * length].reshape(length, 3)
+        offset += 3 * length
+
+        yield moves, result
+
+
+# Replay the game, yielding (model, player, move) before every move and (model, player, None) after the last one.
+# The same model is updated in place, so clone it to keep a position.
+def replay_game(moves, rules=None):
+    model = MillModel(rules)
+    player = 1
+
+    for move in moves.tolist() if isinstance(moves, np.ndarray) else moves:
+        yield model, player, move
+        model.make_move(player, move)
+        player = 3 - player
+
+    yield model, player, None
+
+
+# Stream the positions of all the games in the file as (model, player, move, result). The games are replayed
+# with the rules of the file. Rules that are not given by name ('nine', 'twelve', 'six') must be passed.
+def replay_games(filename, rules=None):
+    rules = _file_rules(filename, rules)
+    for (moves, result) in read_games(filename):
+        for (model, player, move) in replay_game(moves, rules):
+            yield model, player, move, result
@@ -0,0 +1,122 @@
+class MillRules:
+    # A rule set of the game, compiled into lookup tables for the move generator.
+    # The positions are numbered 1 - len(coordinates), the coordinates (row, column) place them on a 7 x 7 grid.
+    # The connections default to the neighbouring positions of the mills. A player starts flying when reduced to
+    # the given number of pieces (None if flying is not allowed), and the game is truncated after move_limit
+    # moves of both players (None for no limit). The game is drawn when a position occurs for the given number
+    # of repetitions, or after no_capture_limit plies without a capture (None for no such rule).
+    def __init__(
+        self, name, mills, coordinates, connections=None, pieces=9, flying=3, move_limit=100,
+        repetitions=3, no_capture_limit=50
+    ):
+        self.name = name
+        self.mills = [list(mill) for mill in mills]
+        self.coordinates = [tuple(position) for position in coordinates]
+        self.num_positions = len(self.coordinates)
+        self.pieces = pieces
+        self.flying = flying
+        self.move_limit = move_limit
+        self.repetitions = repetitions
+        self.no_capture_limit = no_capture_limit
+
+        if connections is None:
+            connections = []
+            for [a, b, c] in self.mills:
+                connections.extend([[a, b], [b, c]])
+        self.connections = [list(connection) for connection in connections]
+
+        # The board positions, without the dummy position 0.
+        self.positions = range(1, self.num_positions + 1)
+
+        # The neighbours of every position.
+        self.neighbours = [[] for _ in range(self.num_positions + 1)]
+        for (a, b) in self.connections:
+            self.neighbours[a].append(b)
+            self.neighbours[b].append(a)
+
+        # The other two positions of every mill that contains the position.
+        self.position_mills = [[] for _ in range(self.num_positions + 1)]
+        for [a, b, c] in self.mills:
+            self.position_mills[a].append((b, c))
+            self.position_mills[b].append((a, c))
+            self.position_mills[c].append((a, b))
+
+    # Return a copy of the rules with some of the options changed, e.g., rules.replace(flying=None).
+    def replace(self, **options):
+        arguments = {
+            'name': self.name,
+            'mills': self.mills,
+            'coordinates': self.coordinates,
+            'connections': self.connections,
+            'pieces': self.pieces,
+            'flying': self.flying,
+            'move_limit': self.move_limit,
+            'repetitions': self.repetitions,
+            'no_capture_limit': self.no_capture_limit
+        }
+        arguments.update(options)
+        return MillRules(**arguments)
+
+    # Do the rules use the 24-position board with the default mills? The symmetries, the feature planes,
+    # the batched move masks and the opening book are only defined for this board.
+    def standard_board(self):
+        return self.num_positions == 24 and self.mills == nine_mens_morris.mills
+
+    def __repr__(self):
+        return (
+            f'MillRules({self.name!r}, positions={self.num_positions}, pieces={self.pieces}, '
+            f'flying={self.flying}, move_limit={self.move_limit}, repetitions={self.repetitions}, '
+            f'no_capture_limit={self.no_capture_limit})'
+        )
+
+
+# The board of three squares, connected in the middle of the sides and in the corners.
+_coordinates_24 = [
+    (0, 0), (0, 3), (0, 6), (1, 1), (1, 3), (1, 5),
+    (2, 2), (2, 3), (2, 4), (3, 0), (3, 1), (3, 2),
+    (3, 4), (3, 5), (3, 6), (4, 2), (4, 3), (4, 4),
+    (5, 1), (5, 3), (5, 5), (6, 0), (6, 3), (6, 6)
+]
+
+_mills_24 = [
+    [1, 2, 3], [4, 5, 6], [7, 8, 9], [10, 11, 12],
+    [13, 14, 15], [16, 17, 18], [19, 20, 21], [22, 23, 24],
+    [1, 10, 22], [4, 11, 19], [7, 12, 16], [2, 5, 8],
+    [17, 20, 23], [9, 13, 18], [6, 14, 21], [3, 15, 24],
+    [1, 4, 7], [3, 6, 9], [16, 19, 22], [18, 21, 24]
+]
+
+# The board of two squares, connected in the middle of the sides. Only the sides of the squares form mills.
+_coordinates_16 = [
+    (0, 0), (0, 3), (0, 6), (1, 1), (1, 3), (1, 5),
+    (3, 0), (3, 1), (3, 5), (3, 6),
+    (5, 1), (5, 3), (5, 5), (6, 0), (6, 3), (6, 6)
+]
+
+_mills_16 = [
+    [1, 2, 3], [4, 5, 6], [11, 12, 13], [14, 15, 16],
+    [1, 7, 14], [4, 8, 11], [6, 9, 13], [3, 10, 16]
+]
+
+_connections_16 = [
+    [1, 2], [2, 3], [4, 5], [5, 6], [11, 12], [12, 13], [14, 15], [15, 16],
+    [1, 7], [7, 14], [4, 8], [8, 11], [6, 9], [9, 13], [3, 10], [10, 16],
+    [2, 5], [7, 8], [9, 10], [12, 15]
+]
+
+nine_mens_morris = MillRules('nine', _mills_24, _coordinates_24, pieces=9, flying=3)
+twelve_mens_morris = MillRules('twelve', _mills_24, _coordinates_24, pieces=12, flying=3)
+six_mens_morris = MillRules('six', _mills_16, _coordinates_16, connections=_connections_16, pieces=6, flying=None)
+
+rule_sets = {rules.name: rules for rules in [nine_mens_morris, twelve_mens_morris, six_mens_morris]}
+
+
+# Return the rules given by name or as MillRules. None gives the default rules.
+def get_rules(rules=None):
+    if rules is None:
+        return nine_mens_morris
+    if isinstance(rules, MillRules):
+        return rules
+    if rules not in rule_sets:
+        raise ValueError(f"Unknown rules '{rules}'. Use one of {list(rule_sets)} or a MillRules object.")
+    return rule_sets[rules]
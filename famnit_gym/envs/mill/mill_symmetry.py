@@ -0,0 +1,82 @@
+import numpy as np
+
+from famnit_gym.envs.mill.mill_rules import nine_mens_morris
+
+# The (row, column) coordinates of board positions 1 - 24 on a 7 x 7 grid.
+_coordinates = nine_mens_morris.coordinates
+
+
+# Rotate the coordinates by k quarter turns, mirroring them first if k >= 4.
+def _rotate(k, row, col):
+    if k >= 4:
+        col = 6 - col
+    for _ in range(k % 4):
+        (row, col) = (col, 6 - row)
+    return row, col
+
+
+# Swap the outer and the inner square. The middle square stays in place.
+def _swap_rings(row, col):
+    ring = min(row, col, 6 - row, 6 - col)
+    if ring == 0:
+        return 3 + (row - 3) // 3, 3 + (col - 3) // 3
+    if ring == 2:
+        return 3 + (row - 3) * 3, 3 + (col - 3) * 3
+    return row, col
+
+
+def _compute_symmetries():
+    index = {coordinates: position for (position, coordinates) in enumerate(_coordinates, start=1)}
+    symmetries = []
+
+    # Transforms 0 - 7 are rotations and reflections, 8 - 15 additionally swap the rings.
+    for swap in (False, True):
+        for k in range(8):
+            permutation = [0]
+            for (row, col) in _coordinates:
+                if swap:
+                    (row, col) = _swap_rings(row, col)
+                permutation.append(index[_rotate(k, row, col)])
+            symmetries.append(permutation)
+
+    return np.array(symmetries, dtype=np.int64)
+
+
+# symmetries[t][p] is the position to which transform t moves position p (0 stays 0).
+symmetries = _compute_symmetries()
+
+# inverse_transform[t] is the transform that undoes transform t.
+inverse_transform = np.array([
+    next(u for u in range(len(symmetries)) if np.array_equal(symmetries[u][symmetries[t]], symmetries[0]))
+    for t in range(len(symmetries))
+], dtype=np.int64)
+
+# Index arrays that gather a transformed 24-position board from the original one.
+_gather = np.argsort(symmetries[:, 1:], axis=1)
+
+# The weights of the base-3 position hash.
+_powers = 3 ** np.arange(24, dtype=np.int64)
+
+
+# Return the base-3 hash of the 24-position board.
+def position_hash(board):
+    return int(np.dot(np.asarray(board, dtype=np.int64), _powers))
+
+
+# Return the board (24 positions) transformed by the given transform.
+def transform_board(board, transform):
+    return np.asarray(board)[_gather[transform]]
+
+
+# Return the move [src, dst, take] transformed by the given transform.
+def transform_move(move, transform):
+    return [int(symmetries[transform][position]) for position in move]
+
+
+# Return the symmetric variant of the board with the minimal hash as (board, hash, transform),
+# where transform_board(board, transform) gives the canonical board.
+def canonical(board):
+    variants = np.asarray(board, dtype=np.int64)[_gather]
+    hashes = variants @ _powers
+    transform = int(np.argmin(hashes))
+    return variants[transform], int(hashes[transform]), transform
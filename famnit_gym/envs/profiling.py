@@ -0,0 +1,30 @@
+import time
+
+
+class Profiler:
+    # Collects the cumulative time and the number of calls of every stage.
+    # Stage names with a '/' are sub-stages, whose time is also included in the parent stage.
+    def __init__(self, callback=None):
+        self._callback = callback
+        self.reset()
+
+    def reset(self):
+        self.times = {}
+        self.calls = {}
+
+    # Add the time since start to the stage. Returns the current time, so stages can be chained.
+    # A stage measured in several parts per call should only count one of them.
+    def record(self, stage, start, count=True):
+        now = time.perf_counter()
+        self.times[stage] = self.times.get(stage, 0.0) + now - start
+        self.calls[stage] = self.calls.get(stage, 0) + count
+        return now
+
+    # Return the statistics as {stage: {'time': seconds, 'calls': count}}.
+    def as_dict(self):
+        return {stage: {'time': self.times[stage], 'calls': self.calls[stage]} for stage in self.times}
+
+    # Pass the statistics to the callback, if there is one.
+    def export(self):
+        if self._callback is not None:
+            self._callback(self.as_dict())
@@ -0,0 +1,7 @@
+import numpy as np
+
+
+# Split a seed into the given number of independent seeds, e.g., one for every environment or process.
+# The seeds are spawned from a SeedSequence, so the streams do not overlap and the split is reproducible.
+def split_seed(seed, count):
+    return [int(child.generate_state(1, np.uint64)[0]) for child in np.random.SeedSequence(seed).spawn(count)]
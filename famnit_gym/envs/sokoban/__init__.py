@@ -1,2 +1,7 @@
-from famnit_gym.envs.sokoban.sokoban_env import SokobanEnv
-from famnit_gym.envs.sokoban.sokoban_map import SokobanMap
\ No newline at end of file
+from famnit_gym.envs.sokoban.sokoban_env import SokobanEnv, transition_model
+from famnit_gym.envs.sokoban.sokoban_push_env import SokobanPushEnv
+from famnit_gym.envs.sokoban.sokoban_map import SokobanMap
+from famnit_gym.envs.sokoban.sokoban_generator import SokobanGenerator, generate_levels
+from famnit_gym.envs.sokoban.sokoban_vector import make_vector_env
+from famnit_gym.envs.sokoban.sokoban_levels import LevelIndex, level_index
+from famnit_gym.envs.sokoban.sokoban_sampler import LevelSampler, UniformSampler, FailureSampler, DifficultySampler
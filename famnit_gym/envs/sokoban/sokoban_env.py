@@ -1,9 +1,17 @@
 from typing import Optional
+import time
 import numpy as np
 import gymnasium as gym
 
 import famnit_gym.envs
 import famnit_gym.envs.sokoban as sokoban
+from famnit_gym.envs.profiling import Profiler
+
+# Return the Sokoban transition model for off-line computations.
+def transition_model(env):
+    if not isinstance(getattr(env, 'unwrapped', None), SokobanEnv):
+        raise AttributeError(f'The environment must be an instance of the SokobanEnv class.')
+    return env.unwrapped._map.clone()
 
 class SokobanEnv(gym.Env):
     metadata = {
@@ -23,34 +31,77 @@ class SokobanEnv(gym.Env):
     def __init__(self, render_mode: Optional[str] = None, options: Optional[dict] = None):
         self._render_mode = render_mode
         map_template = None
-        scale = None
+        self._scale = None
+        self._levels = None
+        self._level_sampler = None
+        self._steps = 0
 
         if options is not None:
             if 'map_template' in options:
                 map_template = options['map_template']
             if 'scale' in options:
-                scale = options['scale']
+                self._scale = options['scale']
+            if 'levels' in options:
+                self._levels = list(options['levels'])
+            if 'level_sampler' in options:
+                self._level_sampler = options['level_sampler']
+
+        # With a level sampler, the sampler chooses the first level.
+        if map_template is None and self._level_sampler is not None:
+            map_template = self._level_sampler.sample(self.np_random)
+
+        # With a list of levels, the first one is used until reset chooses one.
+        if map_template is None and self._levels is not None and len(self._levels) > 0:
+            map_template = self._levels[0]
+
+        # Without a map, a random level is chosen. It is chosen again when reset is given a seed.
+        self._random_level = map_template is None
         
         # Do we use pygame?
         self._pygame_initialized = False
 
-        self._map = sokoban.SokobanMap(
-            map_template=map_template,
-            scale=scale,
-            dir=famnit_gym.envs.DIR_ENVS + '/sokoban'
-        )
-
-        self.observation_space = gym.spaces.Box(
-            low=0, high=5,
-            shape=self._map.get_map_size(),
-            dtype=np.uint8
-        )
+        # The profiler is only set when profiling is enabled.
+        self._profiler = None
+
+        self._load_map(map_template)
         
         self.action_space = gym.spaces.Discrete(4)
         
         # Wrappers can set a frame callback that is called before updating the frame.
         self._frame_callback = None
     
+    def _load_map(self, map_template):
+        # The ID of the level, reported to the level sampler.
+        self._level = int(map_template) if isinstance(map_template, (int, np.integer)) else None
+
+        # The map is replaced in place, so the images stay loaded.
+        if getattr(self, '_map', None) is not None:
+            self._map.load(map_template, rng=self.np_random)
+        else:
+            self._map = sokoban.SokobanMap(
+                map_template=map_template,
+                scale=self._scale,
+                dir=famnit_gym.envs.DIR_ENVS + '/sokoban',
+                rng=self.np_random
+            )
+
+        # The observation is the map array of shape (height, width). The space only changes with the size of the map.
+        shape = self._map.get_array().shape
+        if getattr(self, 'observation_space', None) is None or self.observation_space.shape != shape:
+            self.observation_space = gym.spaces.Box(
+                low=0, high=5,
+                shape=shape,
+                dtype=np.uint8
+            )
+
+    # The pygame resources cannot be pickled. They are created again at reset.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_surface', None)
+        state.pop('_clock', None)
+        state['_pygame_initialized'] = False
+        return state
+
     def _get_obs(self):
         return self._map.get_array()
 
@@ -59,12 +110,58 @@ class SokobanEnv(gym.Env):
             'steps': self._steps
         }
 
+    # Start measuring the time spent in the stages of reset and step. The callback receives the statistics after every step.
+    def enable_profiling(self, callback=None):
+        self._profiler = Profiler(callback)
+        return self._profiler
+
+    def disable_profiling(self):
+        self._profiler = None
+
+    # Return the profiling statistics as {stage: {'time': seconds, 'calls': count}}.
+    def profile(self):
+        return self._profiler.as_dict() if self._profiler is not None else {}
+
     def reset(self, seed: Optional[int] = None, options: Optional[dict] = None):
+        profiler = self._profiler
+        if profiler is not None:
+            start = time.perf_counter()
+
         super().reset(seed=seed)
 
+        # Tell the level sampler whether the last episode was solved.
+        sampler = self._level_sampler
+        if sampler is not None and self._level is not None and self._steps > 0:
+            sampler.update(self._level, self._map.game_finished())
+
+        # A new map can be given at reset, e.g., a generated level.
+        new_map = options is not None and 'map_template' in options
+        if new_map:
+            self._load_map(options['map_template'])
+
+        # Otherwise, the level sampler chooses the level.
+        elif sampler is not None:
+            level = sampler.sample(self.np_random)
+            new_map = level != self._level
+            if new_map:
+                self._load_map(level)
+
+        # Otherwise, choose one of the levels assigned to this environment.
+        elif self._levels is not None and len(self._levels) > 1:
+            self._load_map(self._levels[self.np_random.integers(len(self._levels))])
+            new_map = True
+
+        # A randomly chosen level depends on the seed.
+        elif self._random_level and seed is not None:
+            self._load_map(None)
+            new_map = True
+
         self._map.reset()
         self._steps = 0
 
+        if profiler is not None:
+            start = profiler.record('reset', start)
+
         # If 'human' rendering mode, initialize pygame.
         if self._render_mode == 'human':
             if not self._pygame_initialized:
@@ -76,13 +173,23 @@ class SokobanEnv(gym.Env):
                 pygame.display.set_caption("Sokoban")
                 self._clock = pygame.time.Clock()
                 self._pygame_initialized = True
+
+            # The window has to match the size of the new map.
+            elif new_map and self._surface.get_size() != self._map.window_size():
+                self._surface = pygame.display.set_mode(self._map.window_size())
             
             self._map.paint(self._surface)
             self._update_frame()
 
+        if profiler is not None:
+            start = profiler.record('render', start)
+
         observation = self._get_obs()
         info = self._get_info()
 
+        if profiler is not None:
+            profiler.record('bookkeeping', start)
+
         return observation, info
 
     def step(self, action: int):
@@ -97,32 +204,69 @@ class SokobanEnv(gym.Env):
 
             return observation, reward, terminated, truncated, info
 
+        truncated = self._move(action)
+
+        profiler = self._profiler
+        if profiler is not None:
+            start = time.perf_counter()
+        
+        self._steps += 1
+        
+        reward = 1 if self._map.game_finished() else 0 
+        terminated = self._map.game_finished()
+        observation = self._get_obs()
+        info = self._get_info()
+
+        if profiler is not None:
+            profiler.record('bookkeeping', start)
+            profiler.export()
+
+        return observation, reward, terminated, truncated, info
+
+    # Capture the state of the episode without the rendering resources.
+    def snapshot(self):
+        return {
+            'map': self._map.snapshot(),
+            'steps': self._steps
+        }
+
+    # Restore the state of the episode captured by snapshot().
+    def restore(self, snapshot):
+        self._map.restore(snapshot['map'])
+        self._steps = snapshot['steps']
+
+    # Move the player in the given direction. Returns True if the user closed the window.
+    def _move(self, action):
+        closed = False
         animate = self._render_mode == 'human'
 
+        profiler = self._profiler
+        if profiler is not None:
+            start = time.perf_counter()
+
         (dx, dy) = self.action_direction[action]
         self._map.move_player(dx, dy, animate=animate)
 
+        if profiler is not None:
+            start = profiler.record('model_update', start)
+
         if animate:
             global pygame
-            while self._map.animation_running() and not truncated:
+            while self._map.animation_running() and not closed:
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
-                        truncated = True
+                        closed = True
 
                 self._map.animate_step()
                 self._map.paint(self._surface)
                 self._update_frame()
 
                 self._clock.tick(self.metadata['render_fps'])
-        
-        self._steps += 1
-        
-        reward = 1 if self._map.game_finished() else 0 
-        terminated = self._map.game_finished()
-        observation = self._get_obs()
-        info = self._get_info()
 
-        return observation, reward, terminated, truncated, info
+            if profiler is not None:
+                profiler.record('render', start)
+
+        return closed
 
     def _update_frame(self):
         if self._frame_callback is not None:
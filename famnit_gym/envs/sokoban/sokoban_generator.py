@@ -0,0 +1,246 @@
+import multiprocessing
+
+import numpy as np
+
+
+class SokobanGenerator:
+    _tile_code = {
+        'floor': 0,
+        'wall': 1,
+        'crate': 2,
+        'goal': 3,
+        'goal_crate': 4,
+        'player': 5
+    }
+
+    # Generates random levels with the given size and number of crates.
+    def __init__(self, width=10, height=10, num_crates=4, num_pulls=40, fill=0.5, seed=None):
+        if width < 4 or height < 4:
+            raise ValueError('The level must be at least 4 x 4 tiles large.')
+
+        if num_crates < 1:
+            raise ValueError('The level must contain at least one crate.')
+
+        # Goals and crates must leave enough floor for the player to move around.
+        interior = (width - 2) * (height - 2)
+        self._num_floor = max(round(interior * fill), 2 * num_crates + 2)
+        if self._num_floor > interior:
+            raise ValueError('Too many crates for the given level size.')
+
+        self._width = width
+        self._height = height
+        self._num_crates = num_crates
+        self._num_pulls = num_pulls
+        self._rng = np.random.default_rng(seed)
+
+        # Offsets of the flat map index for actions 0 - 3 (up, right, down, left).
+        self._offsets = [-width, 1, width, -1]
+
+    # Generate a level. Returns the map as a numpy array and the info about the level.
+    def generate(self, max_attempts=100):
+        for _ in range(max_attempts):
+            level = self._try_generate()
+            if level is not None:
+                return level
+
+        raise RuntimeError('Could not generate a level with the given parameters.')
+
+    def _try_generate(self):
+        walls = self._carve_room()
+
+        # Choose the goals and the initial player position among the floor tiles.
+        floor = [i for (i, wall) in enumerate(walls) if not wall]
+        chosen = self._rng.choice(len(floor), size=self._num_crates + 1, replace=False)
+        goals = [floor[i] for i in chosen[:-1]]
+        player = floor[chosen[-1]]
+
+        # In the solved configuration, all the crates are on goals.
+        crates = list(goals)
+        result = self._reverse_play(walls, goals, crates, player)
+        if result is None:
+            return None
+
+        (crates, player, reverse_moves, info) = result
+
+        # The solution is the reverse play, backwards and in opposite directions.
+        solution = [(action + 2) % 4 for action in reversed(reverse_moves)]
+
+        # Compose the map.
+        goal_set = set(goals)
+        crate_set = set(crates)
+        map = np.array(walls, dtype=np.uint8).reshape((self._height, self._width))
+        flat = map.reshape(-1)
+
+        for i in goal_set:
+            flat[i] = self._tile_code['goal_crate'] if i in crate_set else self._tile_code['goal']
+
+        for i in crate_set - goal_set:
+            flat[i] = self._tile_code['crate']
+
+        flat[player] = self._tile_code['player']
+
+        info['solution'] = solution
+        info['moves'] = len(solution)
+
+        return map, info
+
+    # Carve a random room by a random walk with changes of direction.
+    def _carve_room(self):
+        (width, height) = (self._width, self._height)
+        walls = [1] * (width * height)
+
+        x = int(self._rng.integers(1, width - 1))
+        y = int(self._rng.integers(1, height - 1))
+        direction = int(self._rng.integers(4))
+        carved = 0
+
+        while carved < self._num_floor:
+            if walls[y * width + x]:
+                walls[y * width + x] = 0
+                carved += 1
+
+            # Occasionally change the direction of the walk.
+            if self._rng.random() < 0.35:
+                direction = int(self._rng.integers(4))
+
+            (dx, dy) = [(0, -1), (1, 0), (0, 1), (-1, 0)][direction]
+
+            # Keep the border of the map walled.
+            if 1 <= x + dx < width - 1 and 1 <= y + dy < height - 1:
+                x += dx
+                y += dy
+
+        return walls
+
+    # Walk the player from the given position over all the tiles without pushing.
+    def _flood(self, walls, crates, player):
+        parents = {player: None}
+        queue = [player]
+        i = 0
+
+        while i < len(queue):
+            position = queue[i]
+            i += 1
+
+            for (action, offset) in enumerate(self._offsets):
+                successor = position + offset
+                if walls[successor] or successor in crates or successor in parents:
+                    continue
+
+                parents[successor] = (position, action)
+                queue.append(successor)
+
+        return parents
+
+    # The list of actions that walk the player to the target.
+    def _path(self, parents, target):
+        path = []
+        while parents[target] is not None:
+            (target, action) = parents[target]
+            path.append(action)
+        path.reverse()
+        return path
+
+    # Pull the crates away from the goals and keep the most scrambled state.
+    def _reverse_play(self, walls, goals, crates, player):
+        offsets = self._offsets
+        origin = list(goals)
+        moves = []
+        pulls = 0
+        switches = 0
+        last_crate = None
+        best = None
+
+        for _ in range(self._num_pulls):
+            occupied = set(crates)
+            parents = self._flood(walls, occupied, player)
+
+            # Find all the possible pulls: the player stands next to a crate and steps away from it.
+            options = []
+            for position in parents:
+                for (action, offset) in enumerate(offsets):
+                    crate = position + offset
+                    target = position - offset
+                    if crate in occupied and not walls[target] and target not in occupied:
+                        options.append((position, action))
+
+            if len(options) == 0:
+                break
+
+            (position, action) = options[int(self._rng.integers(len(options)))]
+            crate = crates.index(position + offsets[action])
+
+            # Walk to the crate and pull it, which moves the player in the opposite direction. The walk to the first
+            # pull is not recorded: backwards, it would follow the last push of the solution.
+            if pulls > 0:
+                moves.extend(self._path(parents, position))
+            moves.append((action + 2) % 4)
+            player = position - offsets[action]
+            crates[crate] = position
+            pulls += 1
+
+            if crate != last_crate:
+                switches += 1
+                last_crate = crate
+
+            # The score prefers levels that move many crates far away from their goals.
+            displacement = 0
+            for (a, b) in zip(crates, origin):
+                displacement += abs(a % self._width - b % self._width) + abs(a // self._width - b // self._width)
+            score = switches * displacement
+
+            if best is None or score > best[0]:
+                best = (score, list(crates), player, len(moves), pulls, switches, displacement)
+
+        # The crates must not all end up on goals, or the level would already be solved.
+        if best is None or set(best[1]) <= set(goals):
+            return None
+
+        (score, crates, player, length, pulls, switches, displacement) = best
+        moves = moves[:length]
+
+        # The player cannot stand on a goal, so walk it away to a free floor tile.
+        if player in set(goals):
+            parents = self._flood(walls, set(crates), player)
+            free = [position for position in parents if position not in set(goals)]
+            if len(free) == 0:
+                return None
+
+            target = free[int(self._rng.integers(len(free)))]
+            moves.extend(self._path(parents, target))
+            player = target
+
+        info = {
+            'pushes': pulls,
+            'crate_switches': switches,
+            'displacement': displacement,
+            'difficulty': score
+        }
+
+        return crates, player, moves, info
+
+
+def _generate_chunk(args):
+    (count, seed, kwargs) = args
+    generator = SokobanGenerator(seed=seed, **kwargs)
+    return [generator.generate() for _ in range(count)]
+
+
+# Generate many levels at once, optionally using a pool of processes.
+def generate_levels(count, seed=None, processes=None, chunk_size=64, **kwargs):
+    num_chunks = max(1, (count + chunk_size - 1) // chunk_size)
+
+    # Each chunk gets its own independent seed, so the result does not depend on the number of processes.
+    seeds = np.random.SeedSequence(seed).spawn(num_chunks)
+    tasks = []
+    for (i, chunk_seed) in enumerate(seeds):
+        size = min(chunk_size, count - i * chunk_size)
+        tasks.append((size, chunk_seed, kwargs))
+
+    if processes == 1:
+        chunks = [_generate_chunk(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            chunks = pool.map(_generate_chunk, tasks)
+
+    return [level for chunk in chunks for level in chunk]
@@ -0,0 +1,90 @@
+import json
+import os
+
+import numpy as np
+
+# The index of the level pack, written by python -m famnit_gym.search.sokoban index.
+default_index_file = os.path.join(os.path.dirname(__file__), 'levels_index.json')
+
+# The statistics of every level: whether the solver solved it, the pushes and moves of the solution with the
+# fewest pushes, the number of crates, the nodes the solver expanded, and the dead squares the player can reach.
+index_fields = ['solved', 'pushes', 'moves', 'crates', 'nodes', 'dead_squares']
+
+# The index files that have already been read.
+_index_cache = {}
+
+
+class LevelIndex:
+    # The statistics of the levels from the index file, to choose the levels by difficulty.
+    def __init__(self, filename=None):
+        filename = filename if filename is not None else default_index_file
+        if not os.path.exists(filename):
+            raise FileNotFoundError(
+                f'The level index {filename} does not exist. Build it with: python -m famnit_gym.search.sokoban index'
+            )
+
+        with open(filename) as file:
+            index = json.load(file)
+
+        self.max_nodes = index['max_nodes']
+        self._records = {int(id): record for (id, record) in index['levels'].items()}
+        self.ids = np.array(sorted(self._records), dtype=np.int64)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, id):
+        return id in self._records
+
+    # The statistics of the level with the given ID.
+    def __getitem__(self, id):
+        return self._records[id]
+
+    # The values of a field for all the levels, in the order of the IDs. The unsolved levels have -1 pushes and moves.
+    def field(self, name):
+        values = [self._records[id][name] for id in self.ids.tolist()]
+        return np.array([-1 if value is None else value for value in values], dtype=np.int64)
+
+    # The level IDs from the easiest to the hardest by the given field, with ties broken by the search nodes.
+    # The unsolved levels are the hardest.
+    def ordered(self, key='pushes'):
+        solved = self.field('solved').astype(bool)
+        order = np.lexsort((self.field('nodes'), self.field(key), ~solved))
+        return self.ids[order]
+
+    # Split the ordered levels into bands of (almost) equal size, from the easiest to the hardest.
+    def bands(self, num_bands=5, key='pushes'):
+        return np.array_split(self.ordered(key), num_bands)
+
+    # The IDs of the levels whose fields lie within the given ranges (low, high), inclusive, or equal the given values,
+    # e.g., index.select(pushes=(10, 20), solved=True).
+    def select(self, **ranges):
+        mask = np.ones(len(self.ids), dtype=bool)
+        for (name, value) in ranges.items():
+            values = self.field(name)
+            if isinstance(value, tuple):
+                (low, high) = value
+                if low is not None:
+                    mask &= values >= low
+                if high is not None:
+                    mask &= values <= high
+            else:
+                mask &= values == value
+        return self.ids[mask]
+
+    # Sample level IDs from a difficulty band (0 is the easiest), or from all the levels if band is None.
+    # Returns a single ID, or an array of IDs with the given size.
+    def sample(self, band=None, num_bands=5, key='pushes', size=None, rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        ids = self.ids if band is None else self.bands(num_bands, key)[band]
+        if size is None:
+            return int(ids[rng.integers(len(ids))])
+        return rng.choice(ids, size=size)
+
+
+# Return the level index from the file (the one in the package by default). Every file is only read once.
+def level_index(filename=None):
+    filename = filename if filename is not None else default_index_file
+    if filename not in _index_cache:
+        _index_cache[filename] = LevelIndex(filename)
+    return _index_cache[filename]
@@ -1,6 +1,48 @@
-import pygame
 import numpy as np
 
+from famnit_gym.envs.sokoban.sokoban_reachability import flood_fill, legal_pushes, shortest_path
+
+
+# The levels files that have already been read, so every process only parses them once.
+_levels_cache = {}
+
+# The processed levels (map without the player, player position) by (dir, ID), so loading a level again is a copy.
+_processed_cache = {}
+
+
+# Read all the levels from the levels.txt file in the given directory into a dict {ID: numpy array}.
+def _read_levels(dir):
+    if dir in _levels_cache:
+        return _levels_cache[dir]
+
+    f = open(f'{dir}/levels.txt', 'r')
+    lines = f.readlines()
+    f.close()
+
+    levels = {}
+    id = None
+    rows = []
+    for line in lines + ['']:
+        line = line.strip()
+
+        # A new level starts with its ID.
+        if len(line) > 0 and line[0] == ';':
+            id = int(line.split(' ')[1])
+            rows = []
+
+        # An empty line ends the level.
+        elif len(line) == 0:
+            if id is not None and len(rows) > 0:
+                levels[id] = np.array(rows, dtype=np.uint8)
+            id = None
+
+        # Another row of the level.
+        elif id is not None:
+            rows.append([int(c) for c in line])
+
+    _levels_cache[dir] = levels
+    return levels
+
 
 class SokobanMap:
     _image_names = [
@@ -32,25 +74,31 @@ class SokobanMap:
     }
 
     # Initialized the map with the given map_template - ID (0 - 999) or numpy array.
-    def __init__(self, map_template=None, scale=None, dir=''):
+    # Without a map_template, a random level is chosen with the given generator (np.random.Generator).
+    def __init__(self, map_template=None, scale=None, dir='', rng=None):
         self._images = None
         self._tile_size = None
+        self._scale = scale
+        self._dir = dir
+        self.load(map_template, rng)
+
+    # Replace the level with another one (see the constructor). The images stay loaded, so this is cheap.
+    def load(self, map_template=None, rng=None):
         self._map = None
         self._map_size = None
         self._player_position = None
         self._player_direction = None
         self._initial_state = None
         self._animation = None
-
-        self._load_images(scale, dir)
+        self._reachability = None
 
         if map_template is None:
-            map_template = np.random.randint(1000)
+            rng = rng if rng is not None else np.random.default_rng()
+            map_template = int(rng.integers(1000))
 
-        if isinstance(map_template, int):
+        if isinstance(map_template, (int, np.integer)):
             if map_template >= 0 and map_template <= 999:
-                self._load_map(map_template, dir)
-                self._process_map()
+                self._load_processed(int(map_template))
 
         elif isinstance(map_template, np.ndarray):
             if map_template.ndim == 2:
@@ -73,15 +121,22 @@ class SokobanMap:
             }
         }
 
-    # Load the tiles from PNG files.
-    def _load_images(self, scale=None, dir=''):
+    # Load the tiles from PNG files. The images are only loaded when they are needed for rendering.
+    def _load_images(self):
+        if self._images is not None:
+            return
+
+        global pygame
+        import pygame
+
+        scale = self._scale
         self._tile_size = None
 
         # Iterate through all the tiles.
-        self._images = {}
+        images = {}
         for image_name in self._image_names:
             # Load the PNG file.
-            img = pygame.image.load(f'{dir}/img/{image_name}.png')
+            img = pygame.image.load(f'{self._dir}/img/{image_name}.png')
             
             # The size of the tile has to match other tiles.
             if self._tile_size is None:
@@ -95,52 +150,35 @@ class SokobanMap:
 
             # Store the tile in the original size or scale it.
             if scale is None:
-                self._images[image_name] = img
+                images[image_name] = img
             else:
-                self._images[image_name] = pygame.transform.scale(img,  (img_width, img_height))
+                images[image_name] = pygame.transform.scale(img,  (img_width, img_height))
         
         # Set the tile size globally.
         self._tile_size = (img_width, img_height)
+        self._images = images
 
     # Load the map with the given ID from the levels.txt file.
     def _load_map(self, id, dir):
-        # Read the levels file.
-        f = open(f'{dir}/levels.txt', 'r')
-        lines = f.readlines()
-        f.close()
-
-        # Find and load the map from the file.
-        i = 0
-        found = False
-        loaded = False
-        while not (found and loaded) and i < len(lines):
-            # Load a line from the file.
-            line = lines[i].strip()
-
-            # If we are still searching for the map.
-            if not found:
-                if len(line) > 0 and line[0] == ';':
-                    if int(line.split(' ')[1]) == id:
-                        found = True
-                        self._map = []
-            
-            # If we are loading the map:
-            else:
-                # If all the map lines have been read.
-                if len(line) == 0:
-                    loaded = True
-                    continue
-
-                # If another row is being loaded.
-                row = []
-                for c in line:
-                    row.append(int(c))
-                self._map.append(row)
-
-            i += 1
+        levels = _read_levels(dir)
+        if id in levels:
+            self._map = np.copy(levels[id])
+
+    # Load and process the map with the given ID, or copy it from the cache if it has been processed before.
+    def _load_processed(self, id):
+        key = (self._dir, id)
+        if key not in _processed_cache:
+            self._load_map(id, self._dir)
+            self._process_map()
+            if self._map is None:
+                return
+            _processed_cache[key] = (np.copy(self._map), self._player_position)
 
-        # Convert the map to numpy array.
-        self._map = np.array(self._map, dtype=np.uint8)
+        (map, self._player_position) = _processed_cache[key]
+        self._map = np.copy(map)
+        (map_height, map_width) = map.shape
+        self._map_size = (map_width, map_height)
+        self._player_direction = 'down'
 
     def _process_map(self):
         if self._map is None:
@@ -181,6 +219,8 @@ class SokobanMap:
 
     # Return the window size in pixels.
     def window_size(self):
+        self._load_images()
+
         if self._tile_size is None or self._map_size is None:
             return (640, 640)
         
@@ -197,6 +237,43 @@ class SokobanMap:
         self._map = np.copy(self._initial_state['map'])
         self._player_position = self._initial_state['player']['position']
         self._player_direction = self._initial_state['player']['direction']
+        self._reachability = None
+
+    # Capture the mutable state of the map. A running animation is finished first.
+    def snapshot(self):
+        if self._animation is not None:
+            self.stop_animation()
+
+        return (np.copy(self._map), self._player_position, self._player_direction, self._reachability)
+
+    # Restore the state captured by snapshot().
+    def restore(self, snapshot):
+        (map, self._player_position, self._player_direction, self._reachability) = snapshot
+
+        if self._map is not None and self._map.shape == map.shape:
+            np.copyto(self._map, map)
+        else:
+            self._map = np.copy(map)
+
+        self._animation = None
+
+    # Create a copy of the map that shares the images and only duplicates the mutable state.
+    def clone(self):
+        map = SokobanMap.__new__(SokobanMap)
+        map.__dict__.update(self.__dict__)
+
+        # The clone gets its own map array and reachability cache, so its moves do not change this map.
+        map._map = None
+        map.restore(self.snapshot())
+        map._reachability = None
+        return map
+
+    # The pygame images cannot be pickled, so they are loaded again when needed.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_images'] = None
+        state['_tile_size'] = None
+        return state
 
     # Return the current player position.
     def player_position(self):
@@ -209,6 +286,55 @@ class SokobanMap:
         map[y][x] = self._tile_code['player']
         return map
 
+    # The tiles the player can walk on.
+    def _free_tiles(self):
+        return (self._map == self._tile_code['floor']) | (self._map == self._tile_code['goal'])
+
+    # The tiles with a crate.
+    def _crate_tiles(self):
+        return (self._map == self._tile_code['crate']) | (self._map == self._tile_code['goal_crate'])
+
+    # Compute the player's reachable region. It only changes when a crate moves.
+    def _get_reachability(self):
+        if self._reachability is None:
+            free = self._free_tiles()
+            crates = self._crate_tiles()
+            reachable = flood_fill(free, self._player_position)
+            reachable.flags.writeable = False
+
+            # The top-left reachable tile identifies the region regardless of where the player stands in it.
+            (y, x) = divmod(int(np.argmax(reachable)), reachable.shape[1])
+
+            self._reachability = {
+                'reachable': reachable,
+                'normalized': (x, y),
+                'pushes': legal_pushes(reachable, crates, free)
+            }
+
+        return self._reachability
+
+    # Return the mask of the tiles the player can reach without pushing a crate.
+    def reachable(self):
+        return self._get_reachability()['reachable']
+
+    # Return the top-left tile the player can reach without pushing a crate.
+    def normalized_position(self):
+        return self._get_reachability()['normalized']
+
+    # Return the list of pushes (x, y, action) of the crates at (x, y) the player can make.
+    def legal_pushes(self):
+        return list(self._get_reachability()['pushes'])
+
+    # Return the shortest list of actions that walks the player to (x, y) without pushing, or None.
+    def walking_path(self, x, y):
+        if not self.reachable()[y][x]:
+            return None
+        return shortest_path(self._free_tiles(), self._player_position, (x, y))
+
+    # Return the positions (x, y) of all the crates in row-major order.
+    def crate_positions(self):
+        return [(int(x), int(y)) for (y, x) in zip(*np.nonzero(self._crate_tiles()))]
+
     # Return the maps dimensions.
     def get_map_size(self):
         return self._map_size
@@ -216,11 +342,7 @@ class SokobanMap:
     # Check if game is finished.
     def game_finished(self):
         # Find a crate that is not on a goal position.
-        for row in self._map:
-            for cell in row:
-                if cell == self._tile_code['crate']:
-                    return False
-        return True
+        return not np.any(self._map == self._tile_code['crate'])
 
     # Start animating player motion.
     def move_player(self, dx, dy, animate=False, speed=4.0/60):
@@ -233,9 +355,13 @@ class SokobanMap:
             self.stop_animation()
 
         (map_width, map_height) = self._map_size
-        (tile_width, tile_height) = self._tile_size
         (x, y) = self._player_position
 
+        # The tile size is only needed for the animation.
+        if animate:
+            self._load_images()
+            (tile_width, tile_height) = self._tile_size
+
         # Turn the player.
         if dx == 1:
             self._player_direction = 'right'
@@ -330,12 +456,16 @@ class SokobanMap:
                     elif self._map[y2][x2] == self._tile_code['goal']:
                         self._map[y2][x2] = self._tile_code['goal_crate']
 
+                    # The crate has moved.
+                    self._reachability = None
+
     # Make one animation step.
     def animate_step(self):
         if self._animation is None:
             return
 
         # Get tile size.
+        self._load_images()
         (tile_width, tile_height) = self._tile_size
 
         # increase the animation progress.
@@ -397,6 +527,9 @@ class SokobanMap:
             elif self._map[y][x] == self._tile_code['goal']:
                 self._map[y][x] = self._tile_code['goal_crate']
 
+            # The crate has moved.
+            self._reachability = None
+
         # Stop the animation.
         self._animation = None
 
@@ -406,6 +539,7 @@ class SokobanMap:
 
     # Paint the map on a pygame surface.
     def paint(self, surface):
+        self._load_images()
         (tile_width, tile_height) = self._tile_size
         (map_width, map_height) = self._map_size
 
@@ -0,0 +1,151 @@
+from typing import Optional
+import time
+import numpy as np
+import gymnasium as gym
+
+from famnit_gym.envs.sokoban.sokoban_env import SokobanEnv
+
+class SokobanPushEnv(SokobanEnv):
+    metadata = {
+        "framework": "Gymnasium",
+        "name": "famnit_gym/SokobanPush-v1",
+        "render_modes": ["human"],
+        "render_fps": 60
+    }
+
+    def __init__(self, render_mode: Optional[str] = None, options: Optional[dict] = None):
+        self._crates = None
+
+        # The number of crates the action space is made for. It defaults to the crates of the first level.
+        self._max_crates = options.get('max_crates') if options is not None else None
+
+        super().__init__(render_mode=render_mode, options=options)
+        self._set_action_space()
+
+    # An action pushes crate c in direction d: action = 4 * c + d. The crates are numbered in row-major order
+    # at reset and keep their numbers when they are pushed, so an action always refers to the same crate.
+    # The action space stays the same for all the levels (as vector environments require), and the actions
+    # of the crates that a level does not have are masked out.
+    def _set_action_space(self):
+        self._num_crates = len(self._map.crate_positions())
+        if self._max_crates is None:
+            self._max_crates = max(1, self._num_crates)
+
+        if self._num_crates > self._max_crates:
+            raise ValueError(
+                f"The level has {self._num_crates} crates, but the action space is made for {self._max_crates}. "
+                "Set the 'max_crates' option."
+            )
+
+        if getattr(self, 'action_space', None) is None or self.action_space.n != 4 * self._max_crates:
+            self.action_space = gym.spaces.Discrete(4 * self._max_crates)
+
+    def _load_map(self, map_template):
+        super()._load_map(map_template)
+        self._set_action_space()
+
+    # The positions of the crates by their numbers, taken from the map at reset.
+    def _crate_list(self):
+        if self._crates is None:
+            self._crates = list(self._map.crate_positions())
+        return self._crates
+
+    # Give the pushed crate's number to its new position.
+    def _update_crates(self):
+        crates = self._crate_list()
+        positions = self._map.crate_positions()
+        moved = [i for (i, crate) in enumerate(crates) if crate not in positions]
+        added = [position for position in positions if position not in crates]
+        for (i, position) in zip(moved, added):
+            crates[i] = position
+
+    # The mask of the actions that push a crate, by the crates' numbers.
+    def _action_mask(self):
+        mask = np.zeros(self.action_space.n, dtype=np.int8)
+        crates = self._crate_list()
+
+        for (x, y, direction) in self._map.legal_pushes():
+            mask[4 * crates.index((x, y)) + direction] = 1
+
+        return mask
+
+    def _get_info(self):
+        return {
+            'steps': self._steps,
+            'moves': self._moves,
+            'action_mask': self._action_mask()
+        }
+
+    def snapshot(self):
+        snapshot = super().snapshot()
+        snapshot['moves'] = self._moves
+        snapshot['crates'] = list(self._crate_list())
+        return snapshot
+
+    def restore(self, snapshot):
+        super().restore(snapshot)
+        self._moves = snapshot['moves']
+        self._crates = list(snapshot['crates'])
+
+    def reset(self, seed: Optional[int] = None, options: Optional[dict] = None):
+        self._moves = 0
+        self._crates = None
+        return super().reset(seed=seed, options=options)
+
+    def step(self, action: int):
+        terminated = False
+        truncated = False
+
+        reward = 0
+
+        profiler = self._profiler
+        if profiler is not None:
+            start = time.perf_counter()
+
+        # Find the crate and check if it can be pushed in the given direction.
+        (crate, direction) = divmod(int(action), 4)
+        crates = self._crate_list()
+        path = None
+
+        if action >= 0 and crate < len(crates):
+            (x, y) = crates[crate]
+            if (x, y, direction) in self._map.legal_pushes():
+                # Walk next to the crate.
+                (dx, dy) = self.action_direction[direction]
+                path = self._map.walking_path(x - dx, y - dy)
+
+        if profiler is not None:
+            profiler.record('validation', start)
+
+        # Pushes that are not possible have no effect.
+        if path is None:
+            observation = self._get_obs()
+            info = self._get_info()
+
+            return observation, reward, terminated, truncated, info
+
+        # Walk to the crate and push it.
+        for move in path + [direction]:
+            truncated = self._move(move)
+            self._moves += 1
+
+            if truncated:
+                break
+
+        self._update_crates()
+
+        if profiler is not None:
+            start = time.perf_counter()
+
+        self._steps += 1
+
+        reward = 1 if self._map.game_finished() else 0
+        terminated = self._map.game_finished()
+        observation = self._get_obs()
+        info = self._get_info()
+
+        if profiler is not None:
+            profiler.record('bookkeeping', start)
+            profiler.export()
+
+        return observation, reward, terminated, truncated, info
@@ -0,0 +1,99 @@
+import numpy as np
+
+# Actions 0 - 3 (up, right, down, left) as (dx, dy).
+_directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+
+# Pad the passable tiles with a border, so no bounds checks are needed on the flat array.
+def _flatten(passable):
+    (height, width) = passable.shape
+    padded = np.zeros((height + 2, width + 2), dtype=bool)
+    padded[1:-1, 1:-1] = passable
+    return padded.ravel().tolist(), width + 2
+
+
+# Return the mask of all the passable tiles reachable from the start position (x, y).
+def flood_fill(passable, start):
+    (height, width) = passable.shape
+    (free, stride) = _flatten(passable)
+    offsets = (-stride, 1, stride, -1)
+
+    (x, y) = start
+    position = (y + 1) * stride + x + 1
+    visited = bytearray(len(free))
+    visited[position] = 1
+    stack = [position]
+
+    while stack:
+        position = stack.pop()
+        for offset in offsets:
+            successor = position + offset
+            if free[successor] and not visited[successor]:
+                visited[successor] = 1
+                stack.append(successor)
+
+    mask = np.frombuffer(bytes(visited), dtype=np.uint8).reshape((height + 2, width + 2))
+    return mask[1:-1, 1:-1].astype(bool)
+
+
+# Return the shortest list of actions that walks from the start to the target, or None if not reachable.
+def shortest_path(passable, start, target):
+    (free, stride) = _flatten(passable)
+    offsets = (-stride, 1, stride, -1)
+
+    (x, y) = start
+    source = (y + 1) * stride + x + 1
+    (x, y) = target
+    target = (y + 1) * stride + x + 1
+
+    # Breadth-first search, storing the action that reached each tile.
+    actions = {source: None}
+    queue = [source]
+    i = 0
+    while i < len(queue) and target not in actions:
+        position = queue[i]
+        i += 1
+
+        for (action, offset) in enumerate(offsets):
+            successor = position + offset
+            if free[successor] and successor not in actions:
+                actions[successor] = action
+                queue.append(successor)
+
+    if target not in actions:
+        return None
+
+    # Reconstruct the path backwards from the target.
+    path = []
+    position = target
+    while actions[position] is not None:
+        action = actions[position]
+        path.append(action)
+        position -= offsets[action]
+    path.reverse()
+
+    return path
+
+
+# Return all the pushes (x, y, action) of the crates at (x, y) that the player can make from the reachable tiles.
+def legal_pushes(reachable, crates, free):
+    pushes = []
+
+    for (action, (dx, dy)) in enumerate(_directions):
+        # The player stands at (x - dx, y - dy) and the crate moves to (x + dx, y + dy).
+        pushable = np.zeros_like(crates)
+        (height, width) = crates.shape
+        ys = slice(max(dy, -dy), height - max(dy, -dy))
+        xs = slice(max(dx, -dx), width - max(dx, -dx))
+        pushable[ys, xs] = (
+            crates[ys, xs]
+            & reachable[ys.start - dy:ys.stop - dy, xs.start - dx:xs.stop - dx]
+            & free[ys.start + dy:ys.stop + dy, xs.start + dx:xs.stop + dx]
+        )
+
+        for (y, x) in zip(*np.nonzero(pushable)):
+            pushes.append((int(x), int(y), action))
+
+    # Sort the pushes by the crate position in row-major order.
+    pushes.sort(key=lambda push: (push[1], push[0], push[2]))
+    return pushes
@@ -0,0 +1,190 @@
+import weakref
+from abc import ABC, abstractmethod
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from famnit_gym.envs.sokoban.sokoban_levels import level_index
+
+
+class _SharedMemory(shared_memory.SharedMemory):
+    # The arrays that view the memory may still exist when it is collected, so closing it can fail.
+    def __del__(self):
+        try:
+            self.close()
+        except (BufferError, OSError):
+            pass
+
+
+# Attach to the shared memory of another process. Where possible (Python 3.13), the memory is not registered with
+# the resource tracker, so a worker that exits does not remove it.
+def _attach(name):
+    try:
+        return _SharedMemory(name=name, track=False)
+    except TypeError:
+        return _SharedMemory(name=name)
+
+
+# Remove the shared memory when its owner is collected.
+def _unlink(memory):
+    try:
+        memory.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class LevelSampler(ABC):
+    # Chooses the level at every reset of SokobanEnv (the 'level_sampler' option) and learns from the outcomes:
+    # the environment reports every played episode with update(level, solved). The statistics of every level are
+    # the number of episodes and the recent failure rate, averaged over about window episodes.
+    def __init__(self, levels=None, window=20):
+        self.levels = np.array(list(levels) if levels is not None else range(1000), dtype=np.int64)
+        self.window = window
+        self._index = {int(level): i for (i, level) in enumerate(self.levels)}
+        self._episodes = np.zeros(len(self.levels), dtype=np.float64)
+        self._failure_rate = np.zeros(len(self.levels), dtype=np.float64)
+        self._memory = None
+
+    # Move the statistics to shared memory, so all the environments in the worker processes of an AsyncVectorEnv
+    # learn together. A pickled sampler attaches to the same memory by its name, so this works with all the start
+    # methods of the processes (fork, spawn and forkserver). The updates are not locked, which at worst loses
+    # a rare update. The process that shares the sampler owns the memory and removes it when the sampler is collected.
+    def share(self):
+        if self._memory is not None:
+            return self
+
+        arrays = [getattr(self, name) for name in self._shared_arrays()]
+        memory = _SharedMemory(create=True, size=max(1, sum(array.nbytes for array in arrays)))
+        weakref.finalize(self, _unlink, memory)
+
+        self._attach_arrays(memory, [array.shape for array in arrays])
+        for (name, array) in zip(self._shared_arrays(), arrays):
+            getattr(self, name)[...] = array
+        return self
+
+    # Replace the statistics arrays with views of the shared memory, with the given shapes.
+    def _attach_arrays(self, memory, shapes):
+        self._memory = memory
+        offset = 0
+        for (name, shape) in zip(self._shared_arrays(), shapes):
+            array = np.ndarray(shape, dtype=np.float64, buffer=memory.buf, offset=offset)
+            setattr(self, name, array)
+            offset += array.nbytes
+
+    # A shared sampler is pickled with the name of its memory instead of the statistics.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self._memory is not None:
+            state['_memory'] = self._memory.name
+            for name in self._shared_arrays():
+                state[name] = getattr(self, name).shape
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._memory is not None:
+            self._attach_arrays(_attach(state['_memory']), [state[name] for name in self._shared_arrays()])
+
+    # The names of the statistics arrays. Subclasses add their own.
+    def _shared_arrays(self):
+        return ['_episodes', '_failure_rate']
+
+    # Return the next level, using the environment's random generator.
+    @abstractmethod
+    def sample(self, rng):
+        pass
+
+    # Record the outcome of an episode on the level.
+    def update(self, level, solved):
+        i = self._index.get(int(level))
+        if i is None:
+            return
+
+        self._episodes[i] += 1
+        rate = 1 / min(self._episodes[i], self.window)
+        self._failure_rate[i] += rate * ((0.0 if solved else 1.0) - self._failure_rate[i])
+
+    # The statistics of the levels as {'levels', 'episodes', 'failure_rate'} arrays.
+    def statistics(self):
+        return {
+            'levels': self.levels,
+            'episodes': self._episodes.astype(np.int64),
+            'failure_rate': self._failure_rate.copy()
+        }
+
+
+class UniformSampler(LevelSampler):
+    # Every level is equally likely.
+    def sample(self, rng):
+        return int(self.levels[rng.integers(len(self.levels))])
+
+
+class FailureSampler(LevelSampler):
+    # The levels are chosen in proportion to their recent failure rate, so the agent practices what it cannot
+    # solve yet. The levels that have not been played yet have the highest priority, and every level keeps
+    # a small priority epsilon, so the solved levels are revisited now and then.
+    def __init__(self, levels=None, window=20, epsilon=0.05):
+        super().__init__(levels, window)
+        self.epsilon = epsilon
+
+    def sample(self, rng):
+        priority = np.where(self._episodes > 0, self._failure_rate, 1.0) + self.epsilon
+        cumulative = np.cumsum(priority)
+        i = int(np.searchsorted(cumulative, rng.random() * cumulative[-1], side='right'))
+        return int(self.levels[min(i, len(self.levels) - 1)])
+
+
+class DifficultySampler(LevelSampler):
+    # A curriculum over the difficulty bands of the level index (see LevelIndex.bands), from the easiest one.
+    # The next band is unlocked when the agent solves at least threshold of the current band's episodes,
+    # averaged over about window episodes. A share of replay episodes revisits the easier bands.
+    def __init__(self, levels=None, window=20, index=None, key='pushes', num_bands=5, threshold=0.8, replay=0.2):
+        index = index if index is not None else level_index()
+        ordered = index.ordered(key)
+        if levels is not None:
+            allowed = set(int(level) for level in levels)
+            ordered = np.array([level for level in ordered.tolist() if level in allowed], dtype=np.int64)
+
+        super().__init__(ordered, window)
+        self.threshold = threshold
+        self.replay = replay
+
+        # The bands as [start, end) ranges of the ordered levels, split as by LevelIndex.bands.
+        sizes = [len(band) for band in np.array_split(ordered, num_bands)]
+        self._bounds = np.cumsum([0] + sizes)
+        self.num_bands = num_bands
+
+        # The current band, and the number of episodes and the success rate in it.
+        self._band = np.zeros(3, dtype=np.float64)
+
+    def _shared_arrays(self):
+        return super()._shared_arrays() + ['_band']
+
+    # The index of the current band (0 is the easiest).
+    @property
+    def band(self):
+        return int(self._band[0])
+
+    def sample(self, rng):
+        band = self.band
+        if band > 0 and rng.random() < self.replay:
+            (start, end) = (0, self._bounds[band])
+        else:
+            (start, end) = (self._bounds[band], self._bounds[band + 1])
+        return int(self.levels[rng.integers(start, end)])
+
+    def update(self, level, solved):
+        super().update(level, solved)
+
+        i = self._index.get(int(level))
+        band = self.band
+        if i is None or not self._bounds[band] <= i < self._bounds[band + 1]:
+            return
+
+        # Average the successes in the current band, and move on when they are frequent enough.
+        self._band[1] += 1
+        rate = 1 / min(self._band[1], self.window)
+        self._band[2] += rate * ((1.0 if solved else 0.0) - self._band[2])
+
+        if self._band[1] >= self.window and self._band[2] >= self.threshold and band + 1 < self.num_bands:
+            self._band[:] = [band + 1, 0, 0]
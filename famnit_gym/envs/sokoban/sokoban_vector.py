@@ -0,0 +1,47 @@
+import functools
+
+import gymnasium as gym
+
+from famnit_gym.envs.sokoban.sokoban_env import SokobanEnv
+
+
+def _make_env(env_class, options):
+    return env_class(options=options)
+
+
+# Create a vector of Sokoban environments, where every environment gets its own share of the levels.
+# All the levels must have the same size, so the observations can be stacked (and shared between processes).
+# With a level sampler, all the environments choose their levels with the same sampler instead, whose
+# statistics are shared between the processes. The context is the start method of the processes, e.g., 'spawn'.
+def make_vector_env(
+    num_envs, levels=None, options=None, env_class=SokobanEnv, asynchronous=True, shared_memory=True,
+    level_sampler=None, context=None
+):
+    if levels is None:
+        levels = list(range(1000))
+
+    if level_sampler is not None:
+        if asynchronous:
+            level_sampler.share()
+        env_options = dict(options) if options is not None else {}
+        env_options['level_sampler'] = level_sampler
+        env_fns = [functools.partial(_make_env, env_class, env_options) for _ in range(num_envs)]
+
+        if asynchronous:
+            return gym.vector.AsyncVectorEnv(env_fns, shared_memory=shared_memory, context=context)
+        return gym.vector.SyncVectorEnv(env_fns)
+
+    env_fns = []
+    for i in range(num_envs):
+        # Split the levels round-robin. If there are fewer levels than environments, they are repeated.
+        env_levels = levels[i::num_envs]
+        if len(env_levels) == 0:
+            env_levels = [levels[i % len(levels)]]
+
+        env_options = dict(options) if options is not None else {}
+        env_options['levels'] = env_levels
+        env_fns.append(functools.partial(_make_env, env_class, env_options))
+
+    if asynchronous:
+        return gym.vector.AsyncVectorEnv(env_fns, shared_memory=shared_memory, context=context)
+    return gym.vector.SyncVectorEnv(env_fns)
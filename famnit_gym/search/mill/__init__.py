@@ -0,0 +1,4 @@
+from famnit_gym.search.mill.mcts import MCTS, rollout, random_policy, capture_policy
+from famnit_gym.search.mill.perft import perft, divide
+from famnit_gym.search.mill.opening_book import OpeningBook, build_opening_book, write_opening_book
+from famnit_gym.search.mill.dataset import MillDataset, DatasetWriter, export_game_file, export_self_play
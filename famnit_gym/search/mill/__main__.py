@@ -0,0 +1,74 @@
+import argparse
+
+from famnit_gym.search.mill.perft import backends, benchmark, reference_position, reference_positions
+from famnit_gym.search.mill.opening_book import build_opening_book
+from famnit_gym.search.mill.dataset import export_game_file, export_self_play
+
+
+def book(args):
+    count = build_opening_book(
+        args.filename, games=args.games, iterations=args.iterations,
+        processes=args.processes, seed=args.seed, rules=args.rules, rollout_policy='capture', max_plies=60
+    )
+    print(f'Stored {count} positions in {args.filename}.')
+
+
+def dataset(args):
+    if args.game_file is not None:
+        count = export_game_file(args.game_file, args.directory, processes=args.processes)
+    else:
+        count = export_self_play(
+            args.directory, args.games, policy=args.policy, processes=args.processes, seed=args.seed, rules=args.rules
+        )
+    print(f'Stored {count} positions in {args.directory}.')
+
+
+def run_perft(args):
+    names = [args.position] if args.position is not None else list(reference_positions)
+    for name in names:
+        for depth in range(1, args.depth + 1):
+            (model, player) = reference_position(name, backends[args.backend])
+            (nodes, seconds, speed) = benchmark(model, player, depth)
+            print(f'{name:>8} depth {depth}: {nodes:>10} nodes {seconds:>9.3f} s {speed:>10.0f} nodes/s')
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m famnit_gym.search.mill', description='Mill search tools.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    # Build an opening book from self-play.
+    parser_book = commands.add_parser('book', help='Build an opening book from self-play.')
+    parser_book.add_argument('filename', help='The output book file.')
+    parser_book.add_argument('--games', type=int, default=100, help='The number of self-play games.')
+    parser_book.add_argument('--iterations', type=int, default=200, help='MCTS iterations per move.')
+    parser_book.add_argument('--processes', type=int, default=None, help='The number of worker processes.')
+    parser_book.add_argument('--seed', type=int, default=None, help='The random seed.')
+    parser_book.add_argument('--rules', choices=['nine', 'twelve'], default='nine', help='The rules of the games.')
+    parser_book.set_defaults(run=book)
+
+    # Export positions for training.
+    parser_dataset = commands.add_parser('dataset', help='Export positions from self-play or a game file.')
+    parser_dataset.add_argument('directory', help='The dataset directory. New shards are added to it.')
+    parser_dataset.add_argument('--game-file', help='Replay the games from this file instead of playing them.')
+    parser_dataset.add_argument('--games', type=int, default=1000, help='The number of self-play games.')
+    parser_dataset.add_argument('--policy', choices=['random', 'capture'], default='capture', help='The self-play policy.')
+    parser_dataset.add_argument('--processes', type=int, default=None, help='The number of worker processes.')
+    parser_dataset.add_argument('--seed', type=int, default=None, help='The random seed.')
+    parser_dataset.add_argument(
+        '--rules', choices=['nine', 'twelve'], default='nine', help='The rules of the self-play games.'
+    )
+    parser_dataset.set_defaults(run=dataset)
+
+    # Count the leaf nodes from the reference positions.
+    parser_perft = commands.add_parser('perft', help='Count and time move generation from reference positions.')
+    parser_perft.add_argument('--depth', type=int, default=3, help='The maximal depth in plies.')
+    parser_perft.add_argument('--position', choices=list(reference_positions), help='Only this position.')
+    parser_perft.add_argument('--backend', choices=list(backends), default='MillModel', help='The model.')
+    parser_perft.set_defaults(run=run_perft)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
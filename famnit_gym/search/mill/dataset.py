@@ -0,0 +1,246 @@
+import json
+import multiprocessing
+import os
+
+import numpy as np
+
+from famnit_gym.envs.mill.mill_model import MillModel
+from famnit_gym.envs.mill.mill_record import game_result, read_games, replay_game, _file_rules, PLAYER_1_WON, PLAYER_2_WON
+from famnit_gym.envs.mill.mill_rules import get_rules
+from famnit_gym.search.mill.mcts import _policies
+
+# Every position is stored as a fixed-size record. The phases and the pieces in hand are given for (player 1, player 2).
+# The records hold the 24-position board, so only the rules on that board ('nine', 'twelve') can be exported.
+record_dtype = np.dtype([
+    ('board', 'u1', (24,)),
+    ('player', 'u1'),
+    ('phases', 'u1', (2,)),
+    ('holding', 'u1', (2,)),
+    ('ply', '<u2'),
+    ('outcome', 'i1')
+])
+
+_index_name = 'index.json'
+
+# The record layout as stored in the index file.
+_layout = json.loads(json.dumps(record_dtype.descr))
+
+
+# Return the rules, which must be on the 24-position board of the records.
+def _dataset_rules(rules):
+    rules = get_rules(rules)
+    if rules.num_positions != 24:
+        raise ValueError(f"The dataset records hold 24 positions, the rules '{rules.name}' have {rules.num_positions}.")
+    return rules
+
+
+# Convert the positions of a game to records. The outcome is 1 if the player to move won the game, -1 if it lost, else 0.
+def game_records(moves, result, rules=None):
+    rules = _dataset_rules(rules)
+    records = np.zeros(len(moves) + 1, dtype=record_dtype)
+
+    for (ply, (model, player, _)) in enumerate(replay_game(moves, rules)):
+        record = records[ply]
+        record['board'] = model._board[1:]
+        record['player'] = player
+        record['phases'] = [model.get_phase_code(1), model.get_phase_code(2)]
+        record['holding'] = [model.get_pieces_holding(1), model.get_pieces_holding(2)]
+        record['ply'] = ply
+
+        if (result == PLAYER_1_WON and player == 1) or (result == PLAYER_2_WON and player == 2):
+            record['outcome'] = 1
+        elif result in (PLAYER_1_WON, PLAYER_2_WON):
+            record['outcome'] = -1
+
+    return records
+
+
+# Play a game with the policy until it ends or reaches max_plies, which is a draw. Returns (moves, result).
+def play_game(policy, max_plies, rng, rules=None):
+    model = MillModel(rules)
+    player = 1
+    moves = []
+
+    while not model.game_over() and len(moves) < max_plies:
+        move = policy(model, player, model.legal_moves(player), rng)
+        model.make_move(player, move)
+        moves.append(move)
+        player = 3 - player
+
+    return moves, game_result(model, truncated=True)
+
+
+def _replay_task(args):
+    (games, rules) = args
+    return np.concatenate([game_records(moves, result, rules) for (moves, result) in games])
+
+
+def _self_play_task(args):
+    (count, policy, max_plies, rules, seed) = args
+    rng = np.random.default_rng(seed)
+    policy = _policies.get(policy, policy)
+    return np.concatenate([game_records(*play_game(policy, max_plies, rng, rules), rules) for _ in range(count)])
+
+
+class DatasetWriter:
+    # Append records to the dataset in the directory. Every shard is a .npy file with a fixed number of records,
+    # and the index file lists the shards and the name of the rules. Existing shards are never modified, and
+    # an existing dataset must have the same rules.
+    def __init__(self, directory, shard_size=1 << 20, rules=None):
+        self._directory = directory
+        self._shard_size = shard_size
+        self._rules = _dataset_rules(rules).name
+        os.makedirs(directory, exist_ok=True)
+
+        (self._shards, rules) = _read_index(directory)
+        if len(self._shards) > 0 and rules != self._rules:
+            raise ValueError(f"The dataset in {directory} has the rules '{rules}', not '{self._rules}'.")
+        self._buffer = []
+        self._buffered = 0
+
+    def write(self, records):
+        self._buffer.append(records)
+        self._buffered += len(records)
+
+        while self._buffered >= self._shard_size:
+            self._write_shard(self._shard_size)
+
+    def _write_shard(self, size):
+        records = np.concatenate(self._buffer)
+        (shard, rest) = (records[:size], records[size:])
+        self._buffer = [rest]
+        self._buffered = len(rest)
+
+        name = f'shard_{len(self._shards):05d}.npy'
+        array = np.lib.format.open_memmap(os.path.join(self._directory, name), mode='w+', dtype=record_dtype, shape=(size,))
+        array[:] = shard
+        array.flush()
+        del array
+
+        self._shards.append({'file': name, 'records': size})
+        _write_index(self._directory, self._shards, self._rules)
+
+    # Write the remaining records into a last, smaller shard.
+    def close(self):
+        if self._buffered > 0:
+            self._write_shard(self._buffered)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# Return the shards of the dataset and the name of its rules. The datasets without the rules are of the default ones.
+def _read_index(directory):
+    filename = os.path.join(directory, _index_name)
+    if not os.path.exists(filename):
+        return [], None
+    with open(filename) as f:
+        index = json.load(f)
+    if index.get('dtype') != _layout:
+        raise ValueError(f'The dataset in {directory} has a different record layout.')
+    return index['shards'], index.get('rules', get_rules().name)
+
+
+def _write_index(directory, shards, rules):
+    index = {'dtype': _layout, 'rules': rules, 'shards': shards}
+
+    # Replace the index atomically, so a reader never sees a partial file.
+    filename = os.path.join(directory, _index_name)
+    with open(filename + '.tmp', 'w') as f:
+        json.dump(index, f, indent=1)
+    os.replace(filename + '.tmp', filename)
+
+
+# Run the tasks in worker processes, yielding the results in order.
+def _map(task, tasks, processes):
+    if processes == 1:
+        yield from map(task, tasks)
+        return
+
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap(task, tasks)
+
+
+# Export the positions of all the games in the game file (see famnit_gym.envs.mill.GameWriter) to the dataset.
+# The games are replayed with the rules of the file (see replay_games). Returns the number of records written.
+def export_game_file(game_file, directory, processes=None, games_per_task=256, shard_size=1 << 20, rules=None):
+    rules = _dataset_rules(_file_rules(game_file, rules))
+
+    def chunks():
+        chunk = []
+        for (moves, result) in read_games(game_file):
+            chunk.append((np.array(moves), result))
+            if len(chunk) == games_per_task:
+                yield chunk, rules
+                chunk = []
+        if len(chunk) > 0:
+            yield chunk, rules
+
+    count = 0
+    with DatasetWriter(directory, shard_size, rules) as writer:
+        for records in _map(_replay_task, chunks(), processes):
+            writer.write(records)
+            count += len(records)
+    return count
+
+
+# Play the games with the rollout policy ('random', 'capture' or a function) under the rules and export their
+# positions to the dataset. Returns the number of records written.
+def export_self_play(
+    directory, games, policy='random', max_plies=200, processes=None, seed=None, games_per_task=64, shard_size=1 << 20,
+    rules=None
+):
+    rules = _dataset_rules(rules)
+    num_tasks = (games + games_per_task - 1) // games_per_task
+    seeds = np.random.SeedSequence(seed).spawn(num_tasks)
+    tasks = [
+        (min(games_per_task, games - i * games_per_task), policy, max_plies, rules, task_seed)
+        for (i, task_seed) in enumerate(seeds)
+    ]
+
+    count = 0
+    with DatasetWriter(directory, shard_size, rules) as writer:
+        for records in _map(_self_play_task, tasks, processes):
+            writer.write(records)
+            count += len(records)
+    return count
+
+
+class MillDataset:
+    # Open the dataset in the directory. The shards are memory-mapped, not loaded.
+    def __init__(self, directory):
+        (shards, self.rules) = _read_index(directory)
+        self._shards = [np.load(os.path.join(directory, shard['file']), mmap_mode='r') for shard in shards]
+        self._offsets = np.cumsum([0] + [len(shard) for shard in self._shards])
+
+    def __len__(self):
+        return int(self._offsets[-1])
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError('The record index is out of range.')
+        shard = int(np.searchsorted(self._offsets, i, side='right')) - 1
+        return self._shards[shard][i - self._offsets[shard]]
+
+    # Return the records with the given indices as an array.
+    def take(self, indices):
+        indices = np.asarray(indices, dtype=np.int64)
+        records = np.empty(len(indices), dtype=record_dtype)
+        shards = np.searchsorted(self._offsets, indices, side='right') - 1
+
+        # Gather the records shard by shard, so every shard is read only once.
+        for shard in np.unique(shards):
+            where = shards == shard
+            records[where] = self._shards[shard][indices[where] - self._offsets[shard]]
+
+        return records
+
+    # Return a random batch of records.
+    def sample(self, batch_size, rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        return self.take(rng.integers(len(self), size=batch_size))
@@ -0,0 +1,351 @@
+import math
+import multiprocessing
+import weakref
+
+import numpy as np
+
+from famnit_gym.envs.mill.mill_model import LOST
+
+
+# Return the winning player (1 or 2), or 0 if the game has not finished.
+def _winner(model):
+    if model.get_phase_code(1) == LOST:
+        return 2
+    if model.get_phase_code(2) == LOST:
+        return 1
+    return 0
+
+
+# Choose a uniformly random legal move.
+def random_policy(model, player, moves, rng):
+    return moves[int(rng.integers(len(moves)))]
+
+
+# Choose a random capturing move if there is one, otherwise a random legal move.
+def capture_policy(model, player, moves, rng):
+    captures = [move for move in moves if move[2] != 0]
+    if len(captures) > 0:
+        moves = captures
+    return moves[int(rng.integers(len(moves)))]
+
+
+_policies = {
+    'random': random_policy,
+    'capture': capture_policy
+}
+
+
+# Play the game from the given position until it ends or runs out of plies.
+# Returns the winner, or 0 for a draw.
+def rollout(model, player, policy, max_plies, rng):
+    for _ in range(max_plies):
+        if model.game_over():
+            return _winner(model)
+
+        moves = model.legal_moves(player)
+        model.make_move(player, policy(model, player, moves, rng))
+        player = 3 - player
+
+    if model.game_over():
+        return _winner(model)
+
+    # If the rollout is cut short, the player with more pieces left is considered the winner.
+    pieces = [0] + [model.count_pieces(p) + model.get_pieces_holding(p) for p in (1, 2)]
+    if pieces[1] == pieces[2]:
+        return 0
+    return 1 if pieces[1] > pieces[2] else 2
+
+
+def _rollout_task(args):
+    (model, player, policy, max_plies, seed) = args
+    return rollout(model, player, _policies.get(policy, policy), max_plies, np.random.default_rng(seed))
+
+
+def _search_task(args):
+    (model, player, iterations, options, seed) = args
+    mcts = MCTS(seed=seed, **options)
+    mcts._search(model, player, iterations)
+    return mcts.root_statistics()
+
+
+class MCTS:
+    # Monte Carlo tree search with UCT selection. The tree is stored in flat arrays,
+    # where the children of every node occupy a contiguous block of indices.
+    def __init__(
+        self, iterations=1000, exploration=math.sqrt(2), rollout_policy='random', max_plies=200,
+        parallel=None, processes=None, capacity=4096, seed=None
+    ):
+        if parallel not in (None, 'root', 'leaf'):
+            raise ValueError(f"Unknown parallelization '{parallel}'. Use None, 'root' or 'leaf'.")
+
+        self._iterations = iterations
+        self._exploration = exploration
+        self._policy_name = rollout_policy
+        self._policy = _policies.get(rollout_policy, rollout_policy)
+        self._max_plies = max_plies
+        self._parallel = parallel
+        self._processes = processes if processes is not None else multiprocessing.cpu_count()
+        self._pool = None
+        self._finalizer = None
+        self._rng = np.random.default_rng(seed)
+
+        self._allocate_arrays(capacity)
+        self._clear()
+
+    def _allocate_arrays(self, capacity):
+        self._capacity = capacity
+        self._parent = np.full(capacity, -1, dtype=np.int32)
+        self._first_child = np.full(capacity, -1, dtype=np.int32)
+        self._num_children = np.zeros(capacity, dtype=np.int32)
+        self._move = np.zeros((capacity, 3), dtype=np.int8)
+        self._mover = np.zeros(capacity, dtype=np.int8)
+        self._visits = np.zeros(capacity, dtype=np.float64)
+        self._wins = np.zeros(capacity, dtype=np.float64)
+
+    # Remove all the nodes from the tree.
+    def _clear(self):
+        self._size = 0
+        self._root = -1
+        self._root_model = None
+        self._merged = None
+
+    # Return the number of nodes in the tree.
+    def tree_size(self):
+        return self._size
+
+    # Make room for the given number of new nodes and return the index of the first one.
+    def _new_nodes(self, count):
+        if self._size + count > self._capacity:
+            capacity = max(2 * self._capacity, self._size + count)
+            old = (self._parent, self._first_child, self._num_children, self._move, self._mover, self._visits, self._wins)
+            self._allocate_arrays(capacity)
+            for (new_array, old_array) in zip(
+                (self._parent, self._first_child, self._num_children, self._move, self._mover, self._visits, self._wins),
+                old
+            ):
+                new_array[:len(old_array)] = old_array
+
+        first = self._size
+        self._size += count
+
+        self._parent[first:self._size] = -1
+        self._first_child[first:self._size] = -1
+        self._num_children[first:self._size] = 0
+        self._visits[first:self._size] = 0
+        self._wins[first:self._size] = 0
+
+        return first
+
+    # Drop the nodes that are not reachable from the root by copying the subtree to the front of the arrays.
+    def _compact(self):
+        if self._root <= 0:
+            return
+
+        arrays = (self._parent, self._first_child, self._num_children, self._move, self._mover, self._visits, self._wins)
+        order = [self._root]
+        new_index = {self._root: 0}
+        i = 0
+        while i < len(order):
+            node = order[i]
+            i += 1
+            first = self._first_child[node]
+            for child in range(first, first + self._num_children[node]):
+                new_index[child] = len(order)
+                order.append(child)
+
+        # Breadth-first order keeps the children of every node contiguous.
+        order = np.array(order, dtype=np.int64)
+        for array in arrays:
+            array[:len(order)] = array[order]
+
+        for j in range(len(order)):
+            if self._parent[j] >= 0:
+                self._parent[j] = new_index.get(int(self._parent[j]), -1)
+            if self._first_child[j] >= 0:
+                self._first_child[j] = new_index[int(self._first_child[j])]
+
+        self._parent[0] = -1
+        self._root = 0
+        self._size = len(order)
+
+    # Set the root to the given position, reusing the existing tree if it matches.
+    def _set_root(self, model, player):
+        if self._root >= 0 and self._same_position(self._root_model, model) and self._mover[self._root] == 3 - player:
+            return
+
+        self._clear()
+        self._root = self._new_nodes(1)
+        self._mover[self._root] = 3 - player
+        self._root_model = model.clone()
+
+    def _same_position(self, a, b):
+        return (
+            a is not None and a._board == b._board and a._phase == b._phase
+            and a._holding == b._holding and a._playing == b._playing
+        )
+
+    # Update the root after a move was played in the game, keeping the subtree below it.
+    def advance(self, move):
+        if self._root < 0:
+            return
+
+        move = list(move)
+        first = self._first_child[self._root]
+        for child in range(first, first + self._num_children[self._root]):
+            if self._move[child].tolist() == move:
+                self._root_model.make_move(int(self._mover[child]), move)
+                self._root = child
+                self._parent[child] = -1
+                self._merged = None
+                return
+
+        # The move has not been explored yet, so the tree is discarded.
+        self._clear()
+
+    # Select a child of the node by the UCT formula.
+    def _select_child(self, node):
+        first = self._first_child[node]
+        children = slice(first, first + self._num_children[node])
+        visits = self._visits[children]
+
+        unvisited = np.flatnonzero(visits == 0)
+        if len(unvisited) > 0:
+            return first + int(unvisited[int(self._rng.integers(len(unvisited)))])
+
+        uct = self._wins[children] / visits + self._exploration * np.sqrt(math.log(self._visits[node]) / visits)
+        return first + int(np.argmax(uct))
+
+    # Create the children of the node for all the legal moves.
+    def _expand(self, node, model):
+        player = 3 - int(self._mover[node])
+        moves = model.legal_moves(player)
+        if len(moves) == 0:
+            return
+
+        first = self._new_nodes(len(moves))
+        self._first_child[node] = first
+        self._num_children[node] = len(moves)
+        self._parent[first:first + len(moves)] = node
+        self._move[first:first + len(moves)] = moves
+        self._mover[first:first + len(moves)] = player
+
+    # Walk from the root to a leaf, expanding it. Returns the leaf and its position.
+    def _select_leaf(self):
+        node = self._root
+        model = self._root_model.clone()
+
+        while not model.game_over():
+            if self._num_children[node] == 0:
+                if self._visits[node] == 0 and node != self._root:
+                    break
+                self._expand(node, model)
+                if self._num_children[node] == 0:
+                    break
+
+            node = self._select_child(node)
+            model.make_move(int(self._mover[node]), self._move[node].tolist())
+
+            if self._visits[node] == 0:
+                break
+
+        return node, model
+
+    # Propagate the result of a rollout from the leaf to the root.
+    def _backpropagate(self, node, winner, count=1):
+        while node >= 0:
+            self._visits[node] += count
+            if winner == 0:
+                self._wins[node] += 0.5 * count
+            elif winner == self._mover[node]:
+                self._wins[node] += count
+            node = self._parent[node]
+
+    def _search(self, model, player, iterations):
+        self._set_root(model, player)
+
+        # The nodes above a reused root are no longer needed. Node indices change, so this is only done between searches.
+        self._compact()
+
+        for _ in range(iterations):
+            (node, leaf_model) = self._select_leaf()
+            mover = 3 - int(self._mover[node])
+
+            if self._parallel == 'leaf' and not leaf_model.game_over():
+                # Run several rollouts from the same leaf at once.
+                seeds = self._rng.integers(2 ** 63, size=self._processes)
+                tasks = [(leaf_model, mover, self._policy_name, self._max_plies, int(seed)) for seed in seeds]
+                for winner in self._get_pool().map(_rollout_task, tasks):
+                    self._backpropagate(node, winner)
+            else:
+                winner = rollout(leaf_model, mover, self._policy, self._max_plies, self._rng)
+                self._backpropagate(node, winner)
+
+    # Return the statistics {move: (visits, wins)} of the root's children.
+    def root_statistics(self):
+        if self._merged is not None:
+            return dict(self._merged)
+
+        statistics = {}
+        if self._root < 0:
+            return statistics
+
+        first = self._first_child[self._root]
+        for child in range(first, first + self._num_children[self._root]):
+            statistics[tuple(self._move[child].tolist())] = (float(self._visits[child]), float(self._wins[child]))
+
+        return statistics
+
+    # The pool is terminated by close(), or when the search is garbage collected or the interpreter exits.
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self._processes)
+            self._finalizer = weakref.finalize(self, self._pool.terminate)
+        return self._pool
+
+    # Search the given position and return the best move for the player.
+    def search(self, model, player, iterations=None):
+        iterations = iterations if iterations is not None else self._iterations
+
+        if self._parallel == 'root':
+            # The workers search independent trees and their root statistics are merged with the local tree.
+            options = {
+                'exploration': self._exploration,
+                'rollout_policy': self._policy_name,
+                'max_plies': self._max_plies
+            }
+            workers = max(1, self._processes - 1)
+            seeds = self._rng.integers(2 ** 63, size=workers)
+            tasks = [(model, player, iterations, options, int(seed)) for seed in seeds]
+            results = self._get_pool().map_async(_search_task, tasks)
+
+            self._merged = None
+            self._search(model, player, iterations)
+            merged = self.root_statistics()
+
+            for statistics in results.get():
+                for (move, (visits, wins)) in statistics.items():
+                    (merged_visits, merged_wins) = merged.get(move, (0.0, 0.0))
+                    merged[move] = (merged_visits + visits, merged_wins + wins)
+
+            self._merged = merged
+        else:
+            self._search(model, player, iterations)
+
+        statistics = self.root_statistics()
+        if len(statistics) == 0:
+            return None
+
+        # The most visited move is the most robust choice.
+        return list(max(statistics.items(), key=lambda item: item[1][0])[0])
+
+    def close(self):
+        if self._pool is not None:
+            self._finalizer()
+            self._pool = None
+            self._finalizer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,182 @@
+import multiprocessing
+import struct
+
+import numpy as np
+
+from famnit_gym.envs.mill import mill_symmetry
+from famnit_gym.envs.mill.mill_model import MillModel, PLACING
+from famnit_gym.envs.mill.mill_rules import get_rules
+from famnit_gym.search.mill.mcts import MCTS
+
+# The book file starts with a header with the name of the rules, followed by records sorted by the key.
+_magic = b'MILLBOOK'
+_version = 2
+_header = struct.Struct('<8sII16sQ')
+
+record_dtype = np.dtype([
+    ('key', '<u8'),
+    ('move', 'u1', (3,)),
+    ('score', '<f4'),
+    ('visits', '<u4')
+])
+
+
+# The key of a placing-phase position: the canonical board hash and the pieces both players still hold.
+# The player to move follows from the pieces held, since player 1 always places first. The pieces held take
+# 4 bits each, which is enough for the 12 pieces of Twelve Men's Morris.
+def position_key(model):
+    (_, hash, transform) = model.canonical()
+    key = (hash * 16 + model.get_pieces_holding(1)) * 16 + model.get_pieces_holding(2)
+    return key, transform
+
+
+# Return the player to move in the placing phase.
+def _player_to_move(model):
+    return 1 if model.get_pieces_holding(1) == model.get_pieces_holding(2) else 2
+
+
+def _in_book(model):
+    return not model.game_over() and (model.get_phase_code(1) == PLACING or model.get_phase_code(2) == PLACING)
+
+
+# Play one self-play game through the placing phase and collect the search statistics of every position.
+def _self_play(args):
+    (iterations, temperature_plies, rules, mcts_options, seed) = args
+    rng = np.random.default_rng(seed)
+    mcts = MCTS(seed=int(rng.integers(2 ** 63)), **mcts_options)
+    model = MillModel(rules)
+    positions = []
+
+    while _in_book(model):
+        player = _player_to_move(model)
+        mcts.search(model, player, iterations)
+        statistics = mcts.root_statistics()
+        if len(statistics) == 0:
+            break
+
+        # Store the statistics with the moves in the canonical frame.
+        (key, transform) = position_key(model)
+        canonical = {
+            tuple(mill_symmetry.transform_move(move, transform)): counts for (move, counts) in statistics.items()
+        }
+        positions.append((key, canonical))
+
+        # Sample the first moves proportionally to the visits, so the games cover more openings.
+        moves = list(statistics.keys())
+        visits = np.array([statistics[move][0] for move in moves])
+        if len(positions) <= temperature_plies:
+            move = list(moves[int(rng.choice(len(moves), p=visits / visits.sum()))])
+        else:
+            move = list(moves[int(np.argmax(visits))])
+
+        model.make_move(player, move)
+        mcts.advance(move)
+
+    return positions
+
+
+# Build the opening book from self-play games under the rules (the standard board only) and write it to the file.
+def build_opening_book(
+    filename, games=100, iterations=200, temperature_plies=8, processes=None, seed=None, rules=None, **mcts_options
+):
+    rules = get_rules(rules)
+    if not rules.standard_board():
+        raise ValueError('The opening book is only available on the 24-position board.')
+
+    seeds = np.random.SeedSequence(seed).spawn(games)
+    tasks = [(iterations, temperature_plies, rules, mcts_options, seed) for seed in seeds]
+
+    if processes == 1:
+        results = [_self_play(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(_self_play, tasks)
+
+    # Merge the statistics of positions that repeat between games.
+    merged = {}
+    for positions in results:
+        for (key, statistics) in positions:
+            entry = merged.setdefault(key, {})
+            for (move, (visits, wins)) in statistics.items():
+                (merged_visits, merged_wins) = entry.get(move, (0.0, 0.0))
+                entry[move] = (merged_visits + visits, merged_wins + wins)
+
+    records = np.zeros(len(merged), dtype=record_dtype)
+    for (i, key) in enumerate(sorted(merged)):
+        (move, (visits, wins)) = max(merged[key].items(), key=lambda item: item[1][0])
+        records[i] = (key, move, wins / visits, visits)
+
+    write_opening_book(filename, records, rules)
+    return len(records)
+
+
+# Write the records, sorted by the key, to the book file of the rules.
+def write_opening_book(filename, records, rules=None):
+    records = np.sort(np.asarray(records, dtype=record_dtype), order='key')
+    name = get_rules(rules).name.encode()
+
+    with open(filename, 'wb') as f:
+        f.write(_header.pack(_magic, _version, 0, name, len(records)))
+        f.write(records.tobytes())
+
+
+class OpeningBook:
+    # Open the book file. The records are memory-mapped, not loaded.
+    def __init__(self, filename):
+        with open(filename, 'rb') as f:
+            header = f.read(_header.size)
+
+        if len(header) < _header.size or header[:8] != _magic:
+            raise ValueError(f'The file {filename} is not a Mill opening book.')
+
+        (_, version, _, name, count) = _header.unpack(header)
+        if version != _version:
+            raise ValueError(f'The opening book {filename} has version {version}, rebuild it for version {_version}.')
+
+        # The name of the rules the book was built with.
+        self.rules = name.rstrip(b'\0').decode()
+
+        if count > 0:
+            self._records = np.memmap(filename, dtype=record_dtype, mode='r', offset=_header.size, shape=(count,))
+        else:
+            self._records = np.zeros(0, dtype=record_dtype)
+
+    def __len__(self):
+        return len(self._records)
+
+    # Binary search for the record with the given key. Only O(log n) records are read from the file.
+    def _find(self, key):
+        (low, high) = (0, len(self._records))
+        while low < high:
+            middle = (low + high) // 2
+            if int(self._records[middle]['key']) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < len(self._records) and int(self._records[low]['key']) == key:
+            return self._records[low]
+        return None
+
+    # Return (move, score) for the position of the model, or None if the position is not in the book.
+    # The model must use the rules of the book.
+    def lookup(self, model):
+        if model.get_rules().name != self.rules:
+            raise ValueError(f"The opening book is for the rules '{self.rules}', not '{model.get_rules().name}'.")
+        if not _in_book(model):
+            return None
+
+        (key, transform) = position_key(model)
+        record = self._find(key)
+        if record is None:
+            return None
+
+        # Translate the canonical move back to the orientation of the model's board.
+        move = mill_symmetry.transform_move(record['move'].tolist(), mill_symmetry.inverse_transform[transform])
+        return move, float(record['score'])
+
+    # Return the book move for the position of the model, or None.
+    def move(self, model):
+        entry = self.lookup(model)
+        return entry[0] if entry is not None else None
+
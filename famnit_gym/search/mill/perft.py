@@ -0,0 +1,81 @@
+import time
+
+from famnit_gym.envs.mill.mill_model import MillModel
+
+# All the implementations of the Mill model that must generate the same moves.
+backends = {
+    'MillModel': MillModel
+}
+
+# Reference positions, given as the moves played from the initial position.
+reference_positions = {
+    'initial': [],
+    'placing': [
+        [0, 21, 0], [0, 15, 0], [0, 12, 0], [0, 6, 0], [0, 8, 0],
+        [0, 1, 0], [0, 3, 0], [0, 2, 0], [0, 7, 0], [0, 22, 0]
+    ],
+    'moving': [
+        [0, 21, 0], [0, 15, 0], [0, 12, 0], [0, 6, 0], [0, 8, 0],
+        [0, 1, 0], [0, 3, 0], [0, 2, 0], [0, 7, 0], [0, 22, 0],
+        [0, 16, 1], [0, 17, 0], [0, 13, 0], [0, 14, 0], [0, 9, 6],
+        [0, 20, 0], [0, 6, 20], [0, 23, 0], [21, 18, 22], [23, 22, 0],
+        [18, 21, 0], [2, 5, 0], [3, 2, 0], [17, 20, 0], [2, 3, 22],
+        [15, 24, 0]
+    ],
+    'flying': [
+        [0, 21, 0], [0, 7, 0], [0, 3, 0], [0, 9, 0], [0, 12, 0],
+        [0, 8, 21], [0, 11, 0], [0, 17, 0], [0, 24, 0], [0, 5, 0],
+        [0, 15, 5], [0, 6, 0], [0, 10, 6], [0, 16, 0], [0, 5, 0],
+        [0, 18, 5], [0, 2, 0], [0, 13, 2], [24, 21, 0], [9, 6, 0],
+        [21, 24, 13], [6, 9, 24], [10, 22, 0], [9, 6, 0], [22, 10, 6],
+        [8, 5, 0], [11, 4, 0], [16, 19, 0], [15, 14, 0], [19, 16, 12],
+        [14, 6, 0], [18, 21, 0], [4, 11, 0], [21, 18, 6], [3, 12, 5],
+        [7, 8, 0], [12, 22, 0], [8, 9, 0], [11, 13, 0], [17, 20, 0]
+    ]
+}
+
+
+# Create the model for the named reference position. Returns the model and the player to move.
+def reference_position(name, backend=MillModel):
+    model = backend()
+    player = 1
+    for move in reference_positions[name]:
+        model.make_move(player, move)
+        player = 3 - player
+    return model, player
+
+
+# Count the positions reached after exactly the given number of plies.
+def perft(model, player, depth):
+    if depth == 0:
+        return 1
+
+    moves = model.legal_moves(player)
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        child = model.clone()
+        child.make_move(player, move)
+        nodes += perft(child, 3 - player, depth - 1)
+
+    return nodes
+
+
+# Count the positions after every move separately, which helps to find where two backends differ.
+def divide(model, player, depth):
+    counts = {}
+    for move in model.legal_moves(player):
+        child = model.clone()
+        child.make_move(player, move)
+        counts[tuple(move)] = perft(child, 3 - player, depth - 1)
+    return counts
+
+
+# Run perft and measure its speed. Returns (nodes, seconds, nodes per second).
+def benchmark(model, player, depth):
+    start = time.perf_counter()
+    nodes = perft(model, player, depth)
+    seconds = time.perf_counter() - start
+    return nodes, seconds, nodes / seconds if seconds > 0 else float('inf')
@@ -0,0 +1,2 @@
+from famnit_gym.search.sokoban.solver import solve
+from famnit_gym.search.sokoban.level_index import build_level_index
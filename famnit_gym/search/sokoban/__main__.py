@@ -0,0 +1,48 @@
+import argparse
+import time
+
+import famnit_gym.envs
+from famnit_gym.envs.sokoban.sokoban_map import _read_levels
+from famnit_gym.search.sokoban.level_index import build_level_index
+from famnit_gym.search.sokoban.solver import solve
+
+
+def index(args):
+    start = time.perf_counter()
+    solved = build_level_index(args.filename, max_nodes=args.max_nodes, processes=args.processes)
+    print(f'Solved {solved} levels in {time.perf_counter() - start:.1f} s.')
+
+
+def run_solve(args):
+    levels = _read_levels(famnit_gym.envs.DIR_ENVS + '/sokoban')
+    for id in args.ids:
+        info = solve(levels[id], args.max_nodes)
+        if info['solved']:
+            print(f"{id:>4}: {info['pushes']} pushes, {info['moves']} moves, {info['nodes']} nodes")
+        else:
+            print(f"{id:>4}: not solved after {info['nodes']} nodes")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m famnit_gym.search.sokoban', description='Sokoban search tools.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    # Solve the level pack and store the level statistics.
+    parser_index = commands.add_parser('index', help='Solve all the levels and write the level index.')
+    parser_index.add_argument('--filename', default=None, help='The index file. The default is the one in the package.')
+    parser_index.add_argument('--max-nodes', type=int, default=1000000, help='The search limit per level.')
+    parser_index.add_argument('--processes', type=int, default=None, help='The number of worker processes.')
+    parser_index.set_defaults(run=index)
+
+    # Solve single levels.
+    parser_solve = commands.add_parser('solve', help='Solve the levels with the given IDs.')
+    parser_solve.add_argument('ids', type=int, nargs='+', help='The level IDs (0 - 999).')
+    parser_solve.add_argument('--max-nodes', type=int, default=1000000, help='The search limit per level.')
+    parser_solve.set_defaults(run=run_solve)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
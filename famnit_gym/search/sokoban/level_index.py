@@ -0,0 +1,43 @@
+import json
+import multiprocessing
+import os
+
+import famnit_gym.envs
+from famnit_gym.envs.sokoban.sokoban_map import _read_levels
+from famnit_gym.envs.sokoban.sokoban_levels import default_index_file, index_fields
+from famnit_gym.search.sokoban.solver import solve
+
+
+def _solve_level(args):
+    (id, level, max_nodes) = args
+    info = solve(level, max_nodes)
+    return id, {field: info[field] for field in index_fields}
+
+
+# Solve the levels of the level pack (all by default) with a pool of processes and store their statistics
+# in the index file, which SokobanLevels reads. Returns the number of solved levels.
+def build_level_index(filename=None, ids=None, max_nodes=1000000, processes=None):
+    filename = filename if filename is not None else default_index_file
+    levels = _read_levels(famnit_gym.envs.DIR_ENVS + '/sokoban')
+    ids = sorted(levels) if ids is None else sorted(ids)
+    tasks = [(id, levels[id], max_nodes) for id in ids]
+
+    if processes == 1:
+        results = [_solve_level(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(_solve_level, tasks, chunksize=8)
+
+    index = {
+        'version': 1,
+        'max_nodes': max_nodes,
+        'levels': {str(id): record for (id, record) in results}
+    }
+
+    # Replace the index at once, so it is never read half written.
+    temporary = f'{filename}.tmp'
+    with open(temporary, 'w') as file:
+        json.dump(index, file, separators=(',', ':'))
+    os.replace(temporary, filename)
+
+    return sum(1 for (_, record) in results if record['solved'])
@@ -0,0 +1,176 @@
+import numpy as np
+
+# The tile codes of the maps.
+_wall, _crate, _goal, _goal_crate, _player = 1, 2, 3, 4, 5
+
+
+def _parse(level):
+    # Pad the map with walls, so no bounds checks are needed on the flat array.
+    level = np.asarray(level)
+    (height, width) = level.shape
+    stride = width + 2
+    padded = np.full((height + 2, stride), _wall, dtype=np.uint8)
+    padded[1:-1, 1:-1] = level
+    flat = padded.ravel().tolist()
+
+    free = [tile != _wall for tile in flat]
+    goals = sorted(i for (i, tile) in enumerate(flat) if tile in (_goal, _goal_crate))
+    crates = tuple(sorted(i for (i, tile) in enumerate(flat) if tile in (_crate, _goal_crate)))
+    players = [i for (i, tile) in enumerate(flat) if tile == _player]
+    if len(players) != 1:
+        raise ValueError('The level must have exactly one player.')
+
+    return free, goals, crates, players[0], stride
+
+
+def _flood(free, blocked, start, stride):
+    # The tiles reachable from the start, without walking through the blocked tiles.
+    offsets = (-stride, 1, stride, -1)
+    visited = {start}
+    stack = [start]
+    while stack:
+        position = stack.pop()
+        for offset in offsets:
+            successor = position + offset
+            if free[successor] and successor not in visited and successor not in blocked:
+                visited.add(successor)
+                stack.append(successor)
+    return visited
+
+
+# The tiles from which a crate can never reach a goal, found by pulling a crate away from every goal.
+def _dead_squares(free, goals, stride):
+    offsets = (-stride, 1, stride, -1)
+    live = set(goals)
+    stack = list(goals)
+    while stack:
+        position = stack.pop()
+        for offset in offsets:
+            # The player stands at position + offset and pulls the crate there, stepping to position + 2 offset.
+            target = position + offset
+            if free[target] and free[target + offset] and target not in live:
+                live.add(target)
+                stack.append(target)
+    return [not (is_free and position in live) for (position, is_free) in enumerate(free)]
+
+
+def _walk(free, crates, start, target, stride):
+    # The shortest list of actions from the start to the target that does not move any crate.
+    offsets = (-stride, 1, stride, -1)
+    actions = {start: None}
+    queue = [start]
+    i = 0
+    while i < len(queue) and target not in actions:
+        position = queue[i]
+        i += 1
+        for (action, offset) in enumerate(offsets):
+            successor = position + offset
+            if free[successor] and successor not in crates and successor not in actions:
+                actions[successor] = action
+                queue.append(successor)
+
+    path = []
+    position = target
+    while actions[position] is not None:
+        action = actions[position]
+        path.append(action)
+        position -= offsets[action]
+    path.reverse()
+    return path
+
+
+# Find a solution of the level (a map array with the tile codes of SokobanMap) with the fewest pushes, by
+# breadth-first search over the crate positions and the player's reachable region. The crates are never pushed
+# onto the dead squares. The search gives up after max_nodes expanded states. Returns the info about the level:
+# whether it was solved, the number of pushes and moves of the solution, the solution itself (actions 0 - 3),
+# the number of crates, the expanded search nodes, and the number of dead squares the player can walk on.
+def solve(level, max_nodes=1000000):
+    (free, goals, crates, player, stride) = _parse(level)
+    offsets = (-stride, 1, stride, -1)
+    dead = _dead_squares(free, goals, stride)
+    goal_key = tuple(goals)
+
+    # The dead squares that matter are those in the player's part of the map.
+    area = _flood(free, (), player, stride)
+    info = {
+        'solved': False,
+        'pushes': None,
+        'moves': None,
+        'solution': None,
+        'crates': len(crates),
+        'nodes': 0,
+        'dead_squares': sum(1 for position in area if dead[position])
+    }
+
+    if len(goals) != len(crates):
+        return info
+
+    # The states are (crates, player). Two states with the same crates and the player in the same region
+    # are equivalent, so only the first one is expanded.
+    start = (crates, player)
+    parents = {start: None}
+    expanded = set()
+    frontier = [start]
+    found = start if crates == goal_key else None
+
+    while frontier and found is None and info['nodes'] < max_nodes:
+        next_frontier = []
+
+        for state in frontier:
+            (crates, player) = state
+            occupied = set(crates)
+            region = _flood(free, occupied, player, stride)
+
+            key = (crates, min(region))
+            if key in expanded:
+                continue
+            expanded.add(key)
+            info['nodes'] += 1
+
+            for (index, crate) in enumerate(crates):
+                for (action, offset) in enumerate(offsets):
+                    target = crate + offset
+                    if crate - offset not in region or dead[target] or target in occupied:
+                        continue
+
+                    moved = tuple(sorted(crates[:index] + (target,) + crates[index + 1:]))
+                    child = (moved, crate)
+                    if child in parents:
+                        continue
+
+                    parents[child] = (state, crate, action)
+                    if moved == goal_key:
+                        found = child
+                        break
+                    next_frontier.append(child)
+
+                if found is not None:
+                    break
+            if found is not None or info['nodes'] >= max_nodes:
+                break
+
+        frontier = next_frontier
+
+    if found is None:
+        return info
+
+    # Walk the pushes from the start, adding the walks between them.
+    pushes = []
+    state = found
+    while parents[state] is not None:
+        (state, crate, action) = parents[state]
+        pushes.append((crate, action))
+    pushes.reverse()
+
+    (crates, player) = start
+    occupied = set(crates)
+    solution = []
+    for (crate, action) in pushes:
+        solution.extend(_walk(free, occupied, player, crate - offsets[action], stride))
+        solution.append(action)
+        occupied.remove(crate)
+        occupied.add(crate + offsets[action])
+        player = crate
+
+    info.update(solved=True, pushes=len(pushes), moves=len(solution), solution=solution)
+    return info
@@ -1,3 +1,4 @@
 from famnit_gym.wrappers.mill.delay_move import DelayMove
 from famnit_gym.wrappers.mill.user_interaction import UserInteraction
-from famnit_gym.wrappers.mill.video import Video
\ No newline at end of file
+from famnit_gym.wrappers.mill.video import Video
+from famnit_gym.wrappers.mill.recorder import Recorder
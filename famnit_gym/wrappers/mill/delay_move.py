@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from typing import Any
 
-import pygame
 import gymnasium.spaces
 import numpy as np
 
@@ -52,6 +51,9 @@ class DelayMove(AECEnv[AgentID, ObsType, ActionType]):
     def step(self, action: ActionType) -> None:
         # This wrapper only has effect in human render mode.
         if self.env.unwrapped.render_mode == 'human':
+            global pygame
+            import pygame
+
             time = 0
             wait = True
             
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import Any
+
+import gymnasium.spaces
+import numpy as np
+
+from pettingzoo.utils.env import ActionType, AECEnv, AgentID, ObsType
+from famnit_gym.envs.mill import MillEnv
+from famnit_gym.envs.mill.mill_record import GameWriter, game_result, UNFINISHED
+
+class Recorder(AECEnv[AgentID, ObsType, ActionType]):
+    def __init__(self, env: AECEnv[AgentID, ObsType, ActionType], filename='mill.games', record_unfinished=False):
+        super().__init__()
+
+        if type(env.unwrapped) is not MillEnv:
+            raise AttributeError(f'The wrapped environment must be an instance of the MillEnv class.')
+
+        self.env = env
+
+        # The games are appended to the file.
+        self._writer = GameWriter(filename, rules=env.unwrapped._rules)
+        self._record_unfinished = record_unfinished
+        self._moves = []
+
+        # A game is only recorded from reset until it ends, so the records always start from the initial position.
+        self._recording = False
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") and name != "_cumulative_rewards":
+            raise AttributeError(f"accessing private attribute '{name}' is prohibited")
+        return getattr(self.env, name)
+
+    @property
+    def unwrapped(self) -> AECEnv:
+        return self.env.unwrapped
+
+    # The number of games written so far.
+    @property
+    def games(self) -> int:
+        return self._writer.games
+
+    # Write the current game, if it has any moves.
+    def _write_game(self, truncated=False) -> None:
+        if len(self._moves) > 0:
+            result = game_result(self.env.unwrapped._model, truncated)
+            if result != UNFINISHED or self._record_unfinished:
+                self._writer.write(self._moves, result)
+        self._moves = []
+        self._recording = False
+
+    def close(self) -> None:
+        self._write_game()
+        self._writer.close()
+        self.env.close()
+
+    def render(self) -> None | np.ndarray | str | list:
+        return self.env.render()
+
+    def reset(self, seed: int | None = None, options: dict | None = None):
+        self._write_game()
+        self.env.reset(seed=seed, options=options)
+        self._recording = True
+
+    def observe(self, agent: AgentID) -> ObsType | None:
+        return self.env.observe(agent)
+
+    def state(self) -> np.ndarray:
+        return self.env.state()
+
+    def step(self, action: ActionType) -> None:
+        mill = self.env.unwrapped
+        mill._last_move = None
+        self.env.step(action)
+
+        # Record the move that was actually played, which may differ from an illegal action.
+        # The moves after the end of the game, before the next reset, are not recorded.
+        if self._recording and mill._last_move is not None:
+            self._moves.append(mill._last_move)
+
+            # Write the game as soon as it ends.
+            truncated = any(mill.truncations.values())
+            if mill._model.game_over() or truncated:
+                self._write_game(truncated)
+
+    def observation_space(self, agent: AgentID) -> gymnasium.spaces.Space:
+        return self.env.observation_space(agent)
+
+    def action_space(self, agent: AgentID) -> gymnasium.spaces.Space:
+        return self.env.action_space(agent)
+
+    def __str__(self) -> str:
+        return f"{type(self).__name__}<{str(self.env)}>"
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from typing import Any
 
-import pygame
 import gymnasium.spaces
 import numpy as np
 
@@ -68,6 +67,10 @@ class UserInteraction(AECEnv[AgentID, ObsType, ActionType]):
         # This wrapper only has effect in human render mode.
         if not self.env.unwrapped.render_mode == 'human':
             return {}
+
+        global pygame
+        import pygame
+        import pygame.gfxdraw
         
         # Unwrap the environment.
         mill = self.env.unwrapped
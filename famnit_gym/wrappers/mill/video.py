@@ -7,10 +7,6 @@ import shutil
 import numpy as np
 import gymnasium as gym
 from pettingzoo.utils.env import ActionType, AECEnv, AgentID, ObsType
-import pygame
-
-from progress.bar import Bar
-import imageio_ffmpeg
 
 class FrameCallback:
     def __init__(self):
@@ -37,6 +33,11 @@ class Video(AECEnv[AgentID, ObsType, ActionType]):
         self._filename = filename
         self.env.unwrapped._render_mode = 'human'
         self.env.unwrapped._frame_callback = FrameCallback()
+
+        # The encoder is only imported when a video is recorded.
+        global imageio_ffmpeg
+        import imageio_ffmpeg
+
         self._ffmpeg_binary = imageio_ffmpeg.get_ffmpeg_exe()
         self._closed = False
 
@@ -80,6 +81,11 @@ class Video(AECEnv[AgentID, ObsType, ActionType]):
             fps = env.metadata["render_fps"]
             size = env._frame_callback.frames[0].get_size()
             
+            # Pygame converts the frames and progress shows the encoding progress.
+            global pygame
+            import pygame
+            from progress.bar import Bar
+
             writer = imageio_ffmpeg.write_frames(self._filename, size=size, fps=60, quality=10)
             writer.send(None)
             
@@ -84,14 +84,15 @@ class Insights(gym.Wrapper):
             'actions': {
                 'moving': np.array(actions_moving),
                 'pushing': np.array(actions_pushing),
-            }
+            },
+            'pushes': np.array(self._env._map.legal_pushes(), dtype=int)
         }
 
     def _augment_info(self, info):
         return info | self._get_insights()
 
     def reset(self, seed: Optional[int] = None, options: Optional[dict] = None):
-        observation, info = super().reset(seed=seed)
+        observation, info = super().reset(seed=seed, options=options)
         return observation, self._augment_info(info)
 
     def step(self, action: int):
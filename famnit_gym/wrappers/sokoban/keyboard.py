@@ -2,7 +2,6 @@ from typing import Optional
 
 import gymnasium as gym
 from gymnasium.core import ActType, ObsType
-import pygame
 
 import famnit_gym.envs.sokoban as sokoban
 
@@ -15,6 +14,10 @@ class Keyboard(gym.Wrapper):
 
         self._env = env.unwrapped
         self._env._render_mode = 'human'
+
+        # The keyboard is only read through pygame, so it is imported when the wrapper is created.
+        global pygame
+        import pygame
         
     def step(self, action: int):
         quit = False
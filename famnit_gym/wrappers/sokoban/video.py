@@ -5,10 +5,6 @@ from typing import Optional
 import numpy as np
 import gymnasium as gym
 from gymnasium.core import ActType, ObsType
-import pygame
-
-from progress.bar import Bar
-import imageio_ffmpeg
 
 class FrameCallback:
     def __init__(self):
@@ -34,6 +30,11 @@ class Video(gym.Wrapper):
         self._filename = filename
         self._env._render_mode = 'human'
         self._env._frame_callback = FrameCallback()
+
+        # The encoder is only imported when a video is recorded.
+        global imageio_ffmpeg
+        import imageio_ffmpeg
+
         self._ffmpeg_binary = imageio_ffmpeg.get_ffmpeg_exe()
         self._closed = False
         
@@ -51,6 +52,11 @@ class Video(gym.Wrapper):
             fps = self._env.metadata["render_fps"]
             size = self._env._frame_callback.frames[0].get_size()
             
+            # Pygame converts the frames and progress shows the encoding progress.
+            global pygame
+            import pygame
+            from progress.bar import Bar
+
             writer = imageio_ffmpeg.write_frames(self._filename, size=size, fps=60, quality=10)
             writer.send(None)
             
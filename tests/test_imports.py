@@ -0,0 +1,29 @@
+import json
+import subprocess
+import sys
+
+# The optional dependencies are imported only when they are needed (rendering, videos, progress bars).
+lazy = ['pygame', 'imageio_ffmpeg', 'progress']
+
+script = '''
+import json
+import sys
+
+import famnit_gym.envs
+import famnit_gym.envs.mill
+import famnit_gym.envs.sokoban
+import famnit_gym.wrappers
+import famnit_gym.wrappers.mill
+import famnit_gym.wrappers.sokoban
+
+print(json.dumps(sorted(sys.modules)))
+'''
+
+
+def test_optional_dependencies_are_not_imported():
+    # A fresh interpreter, since the other tests may have imported them already.
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    modules = json.loads(result.stdout.splitlines()[-1])
+
+    imported = [name for name in modules if name.split('.')[0] in lazy]
+    assert imported == []
@@ -0,0 +1,67 @@
+import asyncio
+
+from famnit_gym.arena.mill import Agent, RandomAgent, SessionManager, start_server, connect
+from famnit_gym.envs.mill.mill_record import PLAYER_1_WON, PLAYER_2_WON, DRAW
+
+
+class SlowAgent(Agent):
+    async def request_move(self, session, player):
+        await asyncio.sleep(10)
+
+
+class IllegalAgent(Agent):
+    async def request_move(self, session, player):
+        return [25, 25, 25]
+
+
+def test_concurrent_games():
+    async def play():
+        manager = SessionManager(seed=0)
+        for i in range(100):
+            manager.start(RandomAgent(seed=i), RandomAgent(seed=i + 100))
+        await manager.wait()
+        return manager
+
+    manager = asyncio.run(play())
+    assert len(manager.results) == 100
+    assert not manager.sessions
+    assert set(manager.results.values()) <= {PLAYER_1_WON, PLAYER_2_WON, DRAW}
+
+
+def test_timeouts_and_illegal_moves_are_replaced():
+    async def play():
+        manager = SessionManager(move_timeout=0.001, seed=0)
+        slow = manager.start(SlowAgent(), IllegalAgent())
+        await manager.wait()
+        return slow
+
+    session = asyncio.run(play())
+    assert session.finished()
+    assert session.timeouts[1] == (session.ply + 1) // 2
+    assert session.illegal[2] == session.ply // 2
+
+
+def test_server_with_local_clients():
+    async def play():
+        manager = SessionManager(seed=0)
+        server = await start_server(manager, port=0)
+        port = server.sockets[0].getsockname()[1]
+
+        results = await asyncio.gather(
+            connect('127.0.0.1', port, games=4),
+            connect('127.0.0.1', port, games=4),
+            connect('127.0.0.1', port, games=2, opponent='random')
+        )
+
+        server.close()
+        await server.wait_closed()
+        await manager.close()
+        return results
+
+    (first, second, bot) = asyncio.run(play())
+    assert len(first) == len(second) == 4
+    assert set(first) == set(second)
+    assert len(bot) == 2
+
+    # The paired clients play both colours.
+    assert {player for (player, result) in first.values()} == {1, 2}
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from famnit_gym.envs.mill import GameWriter
+from famnit_gym.search.mill import MillDataset
+from famnit_gym.search.mill.dataset import export_game_file, export_self_play, game_records, play_game, _policies
+
+
+def _all_records(dataset):
+    return np.concatenate(dataset._shards)
+
+
+def test_take_and_sample_across_shards(tmp_path):
+    count = export_self_play(tmp_path, 6, max_plies=60, processes=1, seed=0, games_per_task=2, shard_size=50)
+    dataset = MillDataset(tmp_path)
+    assert len(dataset) == count
+    assert len(dataset._shards) == (count + 49) // 50
+
+    records = _all_records(dataset)
+    indices = np.array([0, 49, 50, 51, 99, 100, count - 1, 50, 0])
+    assert np.array_equal(dataset.take(indices), records[indices])
+    assert dataset[50] == records[50]
+    assert dataset[-1] == records[-1]
+    with pytest.raises(IndexError):
+        dataset[count]
+
+    batch = dataset.sample(32, rng=np.random.default_rng(1))
+    expected = records[np.random.default_rng(1).integers(count, size=32)]
+    assert np.array_equal(batch, expected)
+
+
+def test_exporting_again_adds_shards(tmp_path):
+    first = export_self_play(tmp_path, 2, max_plies=40, processes=1, seed=0, shard_size=30)
+    shards = len(MillDataset(tmp_path)._shards)
+    second = export_self_play(tmp_path, 2, max_plies=40, processes=1, seed=1, shard_size=30)
+
+    dataset = MillDataset(tmp_path)
+    assert len(dataset) == first + second
+    assert len(dataset._shards) > shards
+
+
+def test_game_file_export_matches_the_games(tmp_path):
+    rng = np.random.default_rng(0)
+    games = [play_game(_policies['random'], 80, rng) for _ in range(3)]
+    game_file = tmp_path / 'mill.games'
+    with GameWriter(game_file) as writer:
+        for (moves, result) in games:
+            writer.write(moves, result)
+
+    count = export_game_file(game_file, tmp_path / 'data', processes=1, games_per_task=2, shard_size=64)
+    records = _all_records(MillDataset(tmp_path / 'data'))
+    expected = np.concatenate([game_records(moves, result) for (moves, result) in games])
+    assert count == len(expected)
+    assert np.array_equal(records, expected)
+
+    # The plies count from the start of every game, and the outcome is from the point of view of the player to move.
+    for (moves, result) in games:
+        game = game_records(moves, result)
+        assert game['ply'].tolist() == list(range(len(moves) + 1))
+        assert game['player'].tolist() == [1 + ply % 2 for ply in range(len(moves) + 1)]
+        assert np.all(game['outcome'][1:] == -game['outcome'][:-1])
+
+
+def test_datasets_keep_their_rules(tmp_path):
+    count = export_self_play(tmp_path / 'twelve', 2, max_plies=40, processes=1, seed=0, rules='twelve')
+    dataset = MillDataset(tmp_path / 'twelve')
+    assert dataset.rules == 'twelve'
+    assert len(dataset) == count
+    assert dataset[0]['holding'].tolist() == [12, 12]
+
+    # A dataset does not mix rules, and the records only hold the 24-position board.
+    with pytest.raises(ValueError):
+        export_self_play(tmp_path / 'twelve', 1, max_plies=10, processes=1, seed=1)
+    with pytest.raises(ValueError):
+        export_self_play(tmp_path / 'six', 1, max_plies=10, processes=1, rules='six')
+
+    game_file = tmp_path / 'six.games'
+    with GameWriter(game_file, rules='six') as writer:
+        writer.write([], 0)
+    with pytest.raises(ValueError):
+        export_game_file(game_file, tmp_path / 'six', processes=1)
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from famnit_gym.envs import mill
+from famnit_gym.envs.mill.mill_features import feature_planes, model_features, plane_names
+from famnit_gym.envs.mill.mill_model import MillModel, FLYING
+
+
+def _random_model(seed, plies):
+    rng = np.random.default_rng(seed)
+    model = MillModel()
+    player = 1
+    for _ in range(plies):
+        moves = model.legal_moves(player)
+        if model.game_over() or len(moves) == 0:
+            break
+        model.make_move(player, list(moves[rng.integers(len(moves))]))
+        player = 3 - player
+    return model, player
+
+
+# The planes computed position by position from the rules.
+def _reference_planes(model, player):
+    rules = model.get_rules()
+    board = model._board
+    planes = {name: np.zeros(24) for name in plane_names}
+
+    def in_mill(position):
+        return any(board[a] == board[b] == board[position] for (a, b) in rules.position_mills[position])
+
+    def open_mill(position, owner):
+        return board[position] == 0 and any(board[a] == board[b] == owner for (a, b) in rules.position_mills[position])
+
+    for (side, owner) in (('own', player), ('opponent', 3 - player)):
+        pieces = [p for p in rules.positions if board[p] == owner]
+        free = [p for p in pieces if not in_mill(p)]
+        capturable = free if len(free) > 0 else pieces
+        flying = model.get_phase_code(owner) == FLYING
+
+        for p in rules.positions:
+            i = p - 1
+            planes[f'{side}_pieces'][i] = board[p] == owner
+            planes[f'{side}_in_mill'][i] = board[p] == owner and in_mill(p)
+            planes[f'{side}_open_mill'][i] = open_mill(p, owner)
+            planes[f'{side}_capturable'][i] = p in capturable
+            planes[f'{side}_holding'][i] = model.get_pieces_holding(owner) / rules.pieces
+            planes[f'{side}_flying'][i] = flying
+            if board[p] == owner:
+                empty = [q for q in rules.neighbours[p] if board[q] == 0]
+                planes[f'{side}_mobility'][i] = (1 if board.count(0) > 1 else 0) if flying else len(empty) / 4
+        planes['empty'] = np.array([board[p] == 0 for p in rules.positions])
+
+    return np.array([planes[name] for name in plane_names], dtype=np.float32)
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_planes_match_the_reference(seed):
+    for plies in (0, 7, 18, 40, 120):
+        (model, player) = _random_model(seed, plies)
+        for side in (1, 2):
+            assert np.array_equal(model_features(model, side), _reference_planes(model, side))
+
+
+def test_batched_planes_match_the_single_ones():
+    models = [_random_model(seed, 10 + 5 * seed) for seed in range(8)]
+    boards = np.array([model._board[1:] for (model, _) in models])
+    players = np.array([player for (_, player) in models])
+    holding = [[model.get_pieces_holding(1), model.get_pieces_holding(2)] for (model, _) in models]
+    flying = [[model.get_phase_code(1) == FLYING, model.get_phase_code(2) == FLYING] for (model, _) in models]
+
+    batched = feature_planes(boards, players, holding, flying)
+    assert batched.shape == (8, len(plane_names), 24)
+    for (i, (model, player)) in enumerate(models):
+        assert np.array_equal(batched[i], model_features(model, player))
+
+
+def test_environment_observes_the_planes():
+    env = mill.env(observation_mode='features')
+    env.reset(seed=0)
+    for _ in range(30):
+        agent = env.agent_selection
+        (observation, _, terminated, truncated, _) = env.last()
+        if terminated or truncated:
+            break
+        assert env.observation_space(agent).contains(observation)
+        model = mill.transition_model(env)
+        assert np.array_equal(observation, model_features(model, env.unwrapped.agent_index[agent]))
+        env.step(None)
+    env.close()
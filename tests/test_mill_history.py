@@ -0,0 +1,88 @@
+import numpy as np
+
+from famnit_gym.envs import mill
+from famnit_gym.envs.mill.mill_history import PositionHistory, position_hash
+from famnit_gym.envs.mill.mill_model import MillModel, MOVING
+
+
+def _moving_position(rules=None):
+    # Both players have moved all their pieces onto the board, no mills are possible in one move.
+    model = MillModel(rules)
+    model._board[1] = model._board[5] = model._board[9] = 1
+    model._board[22] = model._board[20] = model._board[18] = 2
+    model._phase = [4, MOVING, MOVING]
+    model._holding = [0, 0, 0]
+    model._playing = [0, 3, 3]
+    model.enable_history()
+    return model
+
+
+def test_incremental_hash_and_undo():
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        model = MillModel()
+        model.enable_history()
+        (player, states) = (1, [])
+
+        while not model.game_over() and len(states) < model.get_history().capacity - 1:
+            states.append((model._board[:], model._phase[:], model._holding[:], model._playing[:]))
+            moves = model.legal_moves(player)
+            model.make_move(player, moves[int(rng.integers(len(moves)))])
+            player = 3 - player
+            assert model.position_hash() == position_hash(model._board, model._holding, player)
+
+        while states:
+            model.undo_move()
+            assert (model._board, model._phase, model._holding, model._playing) == states.pop()
+
+
+def test_threefold_repetition():
+    model = _moving_position()
+    shuffle = [(1, [1, 2, 0]), (2, [22, 23, 0]), (1, [2, 1, 0]), (2, [23, 22, 0])]
+
+    for _ in range(2):
+        for (player, move) in shuffle:
+            assert not model.game_over()
+            model.make_move(player, move)
+
+    assert model.draw_reason() == 'repetition'
+    assert model.legal_moves(1) == []
+
+    model.undo_move()
+    assert not model.game_over()
+
+
+def test_no_capture_limit():
+    model = _moving_position(mill.get_rules().replace(repetitions=None, no_capture_limit=8))
+    shuffle = [(1, [1, 2, 0]), (2, [22, 23, 0]), (1, [2, 1, 0]), (2, [23, 22, 0])]
+
+    for (player, move) in shuffle * 2:
+        assert not model.game_over()
+        model.make_move(player, move)
+
+    assert model.draw_reason() == 'no_capture'
+
+
+def test_ring_buffer_drops_the_oldest_position():
+    history = PositionHistory(3)
+    for key in [1, 2, 1, 3]:
+        history.push(key)
+
+    assert len(history) == 3
+    assert history.repetitions(1) == 1
+    assert history.quiet_plies() == 3
+
+
+def test_environment_terminates_on_draw():
+    env = mill.env(rules=mill.get_rules().replace(no_capture_limit=4))
+    env.reset(seed=0)
+
+    for agent in env.agent_iter():
+        (observation, reward, termination, truncation, info) = env.last()
+        if termination or truncation:
+            break
+        env.step(None)
+
+    assert termination
+    assert info['draw'] == 'no_capture'
+    env.close()
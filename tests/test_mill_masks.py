@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from famnit_gym.envs.mill import MillBatch
+from famnit_gym.envs.mill.mill_masks import legal_move_masks, mask_moves, model_masks
+from famnit_gym.search.mill.perft import reference_position, reference_positions
+
+
+def _moves(model, player):
+    return sorted(tuple(move) for move in model.legal_moves(player))
+
+
+def _mask_moves(mask):
+    return sorted(tuple(move) for move in mask_moves(mask).tolist())
+
+
+@pytest.mark.parametrize('name', list(reference_positions))
+def test_masks_match_legal_moves(name):
+    (model, player) = reference_position(name)
+    masks = model_masks([model], [player])
+    assert masks.shape == (1, 25, 25, 25)
+    assert _mask_moves(masks[0]) == _moves(model, player)
+
+
+def test_masks_match_legal_moves_in_random_games():
+    batch = MillBatch(64, seed=0)
+    rng = np.random.default_rng(0)
+
+    for _ in range(150):
+        masks = batch.legal_move_masks()
+        for (i, model) in enumerate(batch.models()):
+            assert _mask_moves(masks[i]) == _moves(model, int(batch.players[i]))
+
+        actions = [moves[int(rng.integers(len(moves)))] for moves in batch.legal_moves]
+        batch.step(actions)
+
+
+def test_phase_strings_and_codes_agree():
+    (model, player) = reference_position('moving')
+    board = model.get_state()
+    phases = [model.get_phase(1), model.get_phase(2)]
+    codes = [{'placing': 0, 'moving': 1, 'flying': 2, 'lost': 3}[phase] for phase in phases]
+    assert np.array_equal(legal_move_masks([board], [player], [phases]), legal_move_masks([board], [player], [codes]))
+
+
+def test_no_moves_when_the_game_is_over():
+    (model, player) = reference_position('moving')
+    masks = legal_move_masks([model.get_state()], [player], [['lost', 'moving']])
+    assert not masks.any()
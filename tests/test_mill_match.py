@@ -0,0 +1,51 @@
+import io
+import sys
+
+from famnit_gym.arena.mill import GameSession, RandomAgent, TimeControl, run_match, run_pipe_agent
+from famnit_gym.arena.mill.pipe import encode_position, decode_position, decode_move
+
+agent = f'"{sys.executable}" -m famnit_gym.arena.mill agent --seed 0'
+slow_agent = f'"{sys.executable}" -m famnit_gym.arena.mill agent --seed 0 --delay 0.05'
+
+
+def test_position_round_trip():
+    session = GameSession(7, RandomAgent(), RandomAgent())
+    position = decode_position(encode_position(session, 1, 1.5, 0.25))
+
+    assert position['game'] == 7 and position['ply'] == 0 and position['player'] == 1
+    assert position['board'] == [0] * 24
+    assert position['phases'] == ['placing', 'placing']
+    assert position['holding'] == [9, 9]
+    assert position['time'] == 1.5 and position['increment'] == 0.25
+    assert position['legal_moves'] == session.legal_moves
+
+
+def test_pipe_agent():
+    session = GameSession(1, RandomAgent(), RandomAgent())
+    stdin = io.StringIO('new 1 1\n' + encode_position(session, 1, 1.0, 0.1) + 'quit\n')
+    stdout = io.StringIO()
+
+    run_pipe_agent(lambda position: position['legal_moves'][3], stdin=stdin, stdout=stdout)
+
+    lines = stdout.getvalue().splitlines()
+    assert lines[0] == 'ready'
+    assert decode_move(lines[1]) == (1, 0, session.legal_moves[3])
+
+
+def test_match():
+    (statistics, results) = run_match(agent, agent, games=2, time_control=TimeControl(10.0, 0.1), seed=0)
+
+    assert len(results) == 2
+    assert [first for (result, first) in results] == [0, 1]
+    for agent_statistics in statistics:
+        assert agent_statistics['wins'] + agent_statistics['draws'] + agent_statistics['losses'] == 2
+        assert agent_statistics['overruns'] == 0
+
+
+def test_overruns_are_replaced():
+    (statistics, results) = run_match(agent, slow_agent, games=1, time_control=TimeControl(0.1, 0.01), seed=0)
+
+    assert len(results) == 1
+    assert statistics[0]['overruns'] == 0
+    assert statistics[1]['overruns'] > 0
+    assert statistics[1]['max_move_time'] < 0.2
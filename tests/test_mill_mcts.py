@@ -0,0 +1,74 @@
+import gc
+
+import pytest
+
+from famnit_gym.envs.mill.mill_model import MillModel
+from famnit_gym.search.mill import MCTS
+
+
+def _is_legal(model, player, move):
+    return move in [list(legal) for legal in model.legal_moves(player)]
+
+
+@pytest.mark.parametrize('parallel', [None, 'root', 'leaf'])
+def test_search_returns_a_legal_move(parallel):
+    model = MillModel()
+    with MCTS(iterations=30, rollout_policy='capture', max_plies=40, parallel=parallel, processes=2, seed=0) as mcts:
+        player = 1
+        for _ in range(4):
+            move = mcts.search(model, player)
+            assert _is_legal(model, player, move)
+            model.make_move(player, move)
+            mcts.advance(move)
+            player = 3 - player
+
+
+def test_workers_are_terminated():
+    # By leaving the with block.
+    with MCTS(iterations=10, max_plies=40, parallel='leaf', processes=2, seed=0) as mcts:
+        mcts.search(MillModel(), 1)
+        workers = list(mcts._pool._pool)
+    assert mcts._pool is None
+    assert not any(worker.is_alive() for worker in workers)
+
+    # By garbage collecting a search that was not closed, even while the pool itself is still referenced.
+    mcts = MCTS(iterations=10, max_plies=40, parallel='leaf', processes=2, seed=0)
+    mcts.search(MillModel(), 1)
+    pool = mcts._pool
+    workers = list(pool._pool)
+    del mcts
+    gc.collect()
+    assert not any(worker.is_alive() for worker in workers)
+
+
+def test_advance_reuses_the_subtree():
+    model = MillModel()
+    mcts = MCTS(iterations=200, max_plies=40, seed=0)
+    move = mcts.search(model, 1)
+    visits = mcts.root_statistics()[tuple(move)][0]
+
+    model.make_move(1, move)
+    mcts.advance(move)
+    statistics = mcts.root_statistics()
+    assert sum(visits for (visits, _) in statistics.values()) == visits - 1
+
+    # The next search continues from the kept subtree, and the nodes above it are dropped.
+    reply = mcts.search(model, 2)
+    assert _is_legal(model, 2, reply)
+    assert sum(visits for (visits, _) in mcts.root_statistics().values()) == visits - 1 + 200
+
+
+def test_move_outside_the_tree_discards_it():
+    mcts = MCTS(iterations=5, max_plies=40, seed=0)
+    mcts.search(MillModel(), 1)
+    assert mcts.tree_size() > 0
+    mcts.advance([0, 0, 0])
+    assert mcts.tree_size() == 0
+
+
+def test_search_is_reproducible():
+    moves = []
+    for _ in range(2):
+        mcts = MCTS(iterations=50, max_plies=40, seed=3)
+        moves.append(mcts.search(MillModel(), 1))
+    assert moves[0] == moves[1]
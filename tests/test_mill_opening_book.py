@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from famnit_gym.envs.mill import mill_symmetry
+from famnit_gym.envs.mill.mill_model import MillModel, MOVING
+from famnit_gym.search.mill import OpeningBook, build_opening_book, write_opening_book
+from famnit_gym.search.mill.opening_book import position_key, record_dtype
+
+
+def test_keys_of_twelve_mens_morris_do_not_collide():
+    keys = set()
+    for h1 in range(13):
+        for h2 in range(13):
+            model = MillModel('twelve')
+            model._holding = [0, h1, h2]
+            keys.add(position_key(model)[0])
+    assert len(keys) == 13 * 13
+
+
+def test_lookup_rejects_other_rules(tmp_path):
+    filename = tmp_path / 'book.bin'
+    model = MillModel('twelve')
+    records = np.zeros(1, dtype=record_dtype)
+    records[0] = (position_key(model)[0], (0, 1, 0), 0.5, 10)
+    write_opening_book(filename, records, 'twelve')
+
+    book = OpeningBook(filename)
+    assert book.rules == 'twelve'
+    assert book.lookup(model) == ([0, 1, 0], 0.5)
+
+    with pytest.raises(ValueError):
+        book.lookup(MillModel())
+
+
+def test_build_and_look_up(tmp_path):
+    filename = tmp_path / 'book.bin'
+    count = build_opening_book(filename, games=4, iterations=20, processes=1, seed=0, max_plies=40)
+    book = OpeningBook(filename)
+    assert len(book) == count > 0
+    assert book.rules == 'nine'
+
+    # The initial position is in every game.
+    model = MillModel()
+    (move, score) = book.lookup(model)
+    assert move in [list(legal) for legal in model.legal_moves(1)]
+    assert 0 <= score <= 1
+
+    # A symmetric position gets a move that leads to a symmetric position. When the position is symmetric
+    # to itself, several moves are equivalent.
+    model.make_move(1, move)
+    reply = book.move(model)
+    assert reply is not None
+    after = model.clone()
+    after.make_move(2, reply)
+
+    for transform in range(16):
+        symmetric = MillModel()
+        symmetric.make_move(1, mill_symmetry.transform_move(move, transform))
+        symmetric.make_move(2, book.move(symmetric))
+        assert symmetric.canonical()[1] == after.canonical()[1]
+
+    # The positions after the placing phase are not in the book.
+    model._phase = [0, MOVING, MOVING]
+    assert book.lookup(model) is None
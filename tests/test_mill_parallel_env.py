@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from pettingzoo.test import parallel_api_test
+
+from famnit_gym.envs.mill import MillBatch, get_rules, no_op, parallel_env
+
+pytestmark = pytest.mark.filterwarnings('ignore:.*illegal move')
+
+
+def _mover(infos):
+    return next(agent for (agent, info) in infos.items() if info['to_move'])
+
+
+def test_parallel_api():
+    parallel_api_test(parallel_env(), num_cycles=200)
+
+
+@pytest.mark.parametrize('waiting', ['no_op', 'omitted', 'garbage'])
+def test_waiting_player_is_ignored(waiting):
+    env = parallel_env()
+    (_, infos) = env.reset(seed=0)
+    mover = _mover(infos)
+    other = next(agent for agent in env.agents if agent != mover)
+    assert len(infos[other]['legal_moves']) == 0
+
+    move = infos[mover]['legal_moves'][0]
+    actions = {mover: move}
+    if waiting == 'no_op':
+        actions[other] = no_op
+    elif waiting == 'garbage':
+        actions[other] = np.array([5, 6, 7])
+
+    (observations, _, _, _, infos) = env.step(actions)
+    assert observations[mover][move[1] - 1] == env.agent_index[mover]
+    assert np.count_nonzero(observations[mover]) == 1
+    assert _mover(infos) == other
+    env.close()
+
+
+def test_rewards_and_truncation_of_the_parallel_env():
+    env = parallel_env(rules=get_rules().replace(move_limit=3))
+    (_, infos) = env.reset(seed=0)
+    steps = 0
+    while env.agents:
+        mover = _mover(infos)
+        (_, rewards, terminations, truncations, infos) = env.step({mover: infos[mover]['legal_moves'][0]})
+        assert sorted(rewards) == sorted(env.possible_agents)
+        steps += 1
+    assert steps == 6
+    assert all(truncations.values())
+    env.close()
+
+
+def _capture_batch():
+    # Player 1 closes the mill 1-2-3 by placing on 3 and captures on 10.
+    batch = MillBatch(1, seed=0)
+    for move in [[0, 1, 0], [0, 10, 0], [0, 2, 0], [0, 11, 0]]:
+        batch.step([move])
+    return batch
+
+
+def test_batch_rewards_by_player():
+    batch = _capture_batch()
+    assert batch.players[0] == 1
+    (_, rewards, _, _, info) = batch.step([[0, 3, 10]])
+    assert rewards[0].tolist() == [1, -1]
+    assert not info['illegal'][0]
+    assert batch.players[0] == 2
+
+
+def test_batch_replaces_illegal_actions():
+    batch = MillBatch(3, seed=0)
+    actions = [[0, 1, 0], [0, 0, 0], [5, 6, 7]]
+    (observations, _, _, _, info) = batch.step(actions)
+    assert info['illegal'].tolist() == [False, True, True]
+    assert np.count_nonzero(observations, axis=1).tolist() == [1, 1, 1]
+    assert observations[0][0] == 1
+
+
+def test_batch_truncates_and_resets():
+    batch = MillBatch(2, max_moves=2, seed=0)
+    for ply in range(4):
+        moves = [legal[0] for legal in batch.legal_moves]
+        (observations, _, terminations, truncations, info) = batch.step(moves)
+
+    # The games were truncated after two moves of both players, reset, and their final boards kept.
+    assert truncations.tolist() == [True, True]
+    assert not terminations.any()
+    assert sorted(info['final_observations']) == [0, 1]
+    assert np.count_nonzero(info['final_observations'][0]) == 4
+    assert batch.players.tolist() == [1, 1]
+    assert batch.num_moves.tolist() == [0, 0]
+    assert not observations.any()
+
+
+def test_batch_default_move_limit_follows_the_rules():
+    batch = MillBatch(1, rules=get_rules().replace(move_limit=1))
+    batch.step([batch.legal_moves[0][0]])
+    (_, _, _, truncations, _) = batch.step([batch.legal_moves[0][0]])
+    assert truncations[0]
+
+
+def test_batch_board_views_need_the_standard_board():
+    batch = MillBatch(2, rules='six')
+    assert batch.observations().shape == (2, 16)
+    with pytest.raises(ValueError):
+        batch.features()
+    with pytest.raises(ValueError):
+        batch.legal_move_masks()
+
+    batch = MillBatch(2)
+    assert batch.features().shape == (2, 15, 24)
+    assert batch.legal_move_masks().shape == (2, 25, 25, 25)
@@ -0,0 +1,36 @@
+import pytest
+
+from famnit_gym.search.mill.perft import backends, divide, perft, reference_position
+
+# Leaf node counts of the reference positions at depths 1, 2, ...
+expected_counts = {
+    'initial': [24, 552, 12144, 255024],
+    'placing': [22, 363, 7028, 106990],
+    'moving': [11, 195, 2227, 67553],
+    'flying': [54, 867, 38028],
+}
+
+
+@pytest.mark.parametrize('backend', list(backends))
+@pytest.mark.parametrize('name', list(expected_counts))
+def test_perft(backend, name):
+    for (depth, expected) in enumerate(expected_counts[name], start=1):
+        (model, player) = reference_position(name, backends[backend])
+        assert perft(model, player, depth) == expected
+
+
+@pytest.mark.parametrize('backend', list(backends))
+def test_divide_sums_to_perft(backend):
+    (model, player) = reference_position('moving', backends[backend])
+    counts = divide(model, player, 3)
+    assert len(counts) == expected_counts['moving'][0]
+    assert sum(counts.values()) == expected_counts['moving'][2]
+
+
+@pytest.mark.parametrize('backend', list(backends))
+def test_perft_does_not_change_the_model(backend):
+    (model, player) = reference_position('flying', backends[backend])
+    state = list(model.get_state())
+    perft(model, player, 2)
+    assert model.get_state() == state
+    assert len(model.legal_moves(player)) == expected_counts['flying'][0]
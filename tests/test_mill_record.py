@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from famnit_gym.envs import mill
+from famnit_gym.envs.mill import GameWriter, game_file_rules, get_rules, read_games, replay_game, replay_games
+from famnit_gym.envs.mill.mill_model import MillModel
+from famnit_gym.envs.mill.mill_record import game_result, DRAW, UNFINISHED
+from famnit_gym.wrappers.mill import Recorder
+
+
+def test_recorder_ignores_steps_after_truncation(tmp_path):
+    filename = tmp_path / 'mill.games'
+    env = Recorder(mill.env(rules=get_rules().replace(move_limit=2)), filename, record_unfinished=True)
+    env.reset(seed=0)
+    for _ in range(4):
+        env.step(None)
+    assert env.games == 1
+
+    # Stepping on without a reset does not start a record in the middle of a game.
+    for _ in range(2):
+        env.step(None)
+    env.close()
+
+    games = list(read_games(filename))
+    assert len(games) == 1
+    (moves, result) = games[0]
+    assert len(moves) == 4
+    assert result == DRAW
+    assert len(list(replay_game(moves))) == 5
+
+
+def _random_game(seed, max_plies=300):
+    rng = np.random.default_rng(seed)
+    model = MillModel()
+    model.enable_history()
+    (moves, player) = ([], 1)
+    while not model.game_over() and len(moves) < max_plies:
+        legal = model.legal_moves(player)
+        move = list(legal[rng.integers(len(legal))])
+        model.make_move(player, move)
+        moves.append(move)
+        player = 3 - player
+    return moves, model
+
+
+def test_write_and_read_games(tmp_path):
+    filename = tmp_path / 'mill.games'
+    games = [_random_game(seed) for seed in range(6)]
+
+    # The games are appended in two sessions, with a buffer small enough to flush in between.
+    for part in (games[:3], games[3:]):
+        with GameWriter(filename, buffer_size=100) as writer:
+            for (moves, model) in part:
+                writer.write(moves, game_result(model, truncated=not model.game_over()))
+
+    read = list(read_games(filename))
+    assert len(read) == len(games)
+    for ((moves, model), (read_moves, result)) in zip(games, read):
+        assert read_moves.tolist() == moves
+        assert result == game_result(model, truncated=not model.game_over())
+
+        # Replaying the moves reaches the same position.
+        for (replayed, player, move) in replay_game(read_moves):
+            pass
+        assert move is None
+        assert replayed._board == model._board
+        assert replayed._holding == model._holding
+
+
+@pytest.mark.filterwarnings('ignore:.*illegal move')
+def test_recorder_stores_the_played_moves(tmp_path):
+    filename = tmp_path / 'mill.games'
+    env = Recorder(mill.env(), filename)
+    env.reset(seed=3)
+    played = []
+    for agent in env.agent_iter():
+        (_, _, terminated, truncated, info) = env.last()
+        if terminated or truncated:
+            break
+        # An illegal action is replaced by a random legal move, which is recorded.
+        action = [0, 0, 0] if len(played) == 5 else info['legal_moves'][0]
+        env.step(action)
+        played.append(env.unwrapped._last_move)
+    env.close()
+
+    ((moves, result),) = list(read_games(filename))
+    assert moves.tolist() == played
+    assert played[5] != [0, 0, 0]
+    assert result != UNFINISHED
+
+
+def test_game_files_keep_their_rules(tmp_path):
+    filename = tmp_path / 'six.games'
+    env = Recorder(mill.env(rules='six'), filename)
+    env.reset(seed=0)
+    for agent in env.agent_iter():
+        (_, _, terminated, truncated, _) = env.last()
+        if terminated or truncated:
+            break
+        env.step(None)
+    final = env.unwrapped._model._board[:]
+    env.close()
+
+    assert game_file_rules(filename) == 'six'
+    positions = list(replay_games(filename))
+    assert positions[-1][0].get_rules().name == 'six'
+    assert positions[-1][0]._board == final
+
+    # Other rules are rejected, when replaying and when appending.
+    with pytest.raises(ValueError):
+        list(replay_games(filename, rules='nine'))
+    with pytest.raises(ValueError):
+        GameWriter(filename, rules='nine')
+
+    # Custom rules must be given to replay their games.
+    custom = get_rules('six').replace(name='six-custom')
+    with GameWriter(tmp_path / 'custom.games', rules=custom) as writer:
+        writer.write([], DRAW)
+    with pytest.raises(ValueError):
+        list(replay_games(tmp_path / 'custom.games'))
+    assert len(list(replay_games(tmp_path / 'custom.games', rules=custom))) == 1
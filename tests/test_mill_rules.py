@@ -0,0 +1,79 @@
+import pytest
+
+from famnit_gym.envs import mill
+from famnit_gym.envs.mill.mill_model import MillModel, MOVING, FLYING, LOST
+from famnit_gym.envs.mill.mill_rules import get_rules, rule_sets
+from famnit_gym.search.mill.perft import perft
+
+
+@pytest.mark.parametrize('name', list(rule_sets))
+def test_connections_are_symmetric(name):
+    rules = rule_sets[name]
+    for position in rules.positions:
+        for neighbour in rules.neighbours[position]:
+            assert position in rules.neighbours[neighbour]
+
+
+def test_six_mens_morris_perft():
+    model = MillModel('six')
+    assert perft(model, 1, 1) == 16
+    assert perft(model, 1, 2) == 16 * 15
+
+
+def test_default_rules_are_unchanged():
+    model = MillModel()
+    assert model.get_rules() is get_rules('nine')
+    assert perft(model, 1, 2) == 552
+
+
+def test_twelve_mens_morris_places_twelve_pieces():
+    model = MillModel('twelve')
+    assert model.get_pieces_holding(1) == 12
+
+
+def _capture_position(rules):
+    # Player 1 closes the mill 1-2-3 by moving from 15 and captures one of the three pieces of player 2.
+    model = MillModel(rules)
+    model._board[1] = model._board[2] = model._board[15] = 1
+    model._board[20] = model._board[22] = model._board[23] = 2
+    model._phase = [4, MOVING, MOVING]
+    model._holding = [0, 0, 0]
+    model._playing = [0, 3, 3]
+    model.make_move(1, [15, 3, 22])
+    return model
+
+
+def test_flying_after_capture():
+    assert _capture_position('nine').get_phase_code(2) == FLYING
+
+
+def test_no_flying_loses_at_two_pieces():
+    rules = get_rules('nine').replace(flying=None)
+    model = _capture_position(rules)
+    assert model.get_phase_code(2) == LOST
+    assert model.game_over()
+
+
+def test_unknown_rules():
+    with pytest.raises(ValueError):
+        get_rules('thirty')
+
+
+def test_environment_spaces():
+    env = mill.env(rules='six')
+    env.reset(seed=0)
+    agent = env.agent_selection
+    assert env.observation_space(agent).shape == (16,)
+    assert list(env.action_space(agent).nvec) == [17, 17, 17]
+    env.step(None)
+    env.close()
+
+
+def test_twelve_mens_morris_features_are_in_the_observation_space():
+    env = mill.env(rules='twelve', observation_mode='features')
+    env.reset(seed=0)
+    agent = env.agent_selection
+    (observation, _, _, _, _) = env.last()
+    assert observation.max() <= 1.0
+    assert env.observation_space(agent).contains(observation)
+    env.close()
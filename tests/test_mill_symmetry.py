@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from famnit_gym.envs.mill import mill_symmetry
+from famnit_gym.envs.mill.mill_model import MillModel, MOVING
+
+transforms = range(len(mill_symmetry.symmetries))
+
+
+def _random_model(seed, plies):
+    rng = np.random.default_rng(seed)
+    model = MillModel()
+    player = 1
+    for _ in range(plies):
+        moves = model.legal_moves(player)
+        if model.game_over() or len(moves) == 0:
+            break
+        model.make_move(player, list(moves[rng.integers(len(moves))]))
+        player = 3 - player
+    return model, player
+
+
+def test_sixteen_distinct_permutations():
+    symmetries = mill_symmetry.symmetries
+    assert len(symmetries) == 16
+    assert len({tuple(permutation) for permutation in symmetries.tolist()}) == 16
+    for permutation in symmetries:
+        assert permutation[0] == 0
+        assert sorted(permutation[1:]) == list(range(1, 25))
+
+
+@pytest.mark.parametrize('transform', transforms)
+def test_symmetries_keep_mills_and_connections(transform):
+    permutation = mill_symmetry.symmetries[transform]
+    mills = {frozenset(mill) for mill in MillModel.mills}
+    assert {frozenset(permutation[mill].tolist()) for mill in MillModel.mills} == mills
+
+    connections = MillModel().get_rules().connections
+    assert {frozenset(permutation[connection].tolist()) for connection in connections} == {
+        frozenset(connection) for connection in connections
+    }
+
+
+@pytest.mark.parametrize('transform', transforms)
+def test_inverse_transforms(transform):
+    inverse = mill_symmetry.inverse_transform[transform]
+    board = np.arange(24) % 3
+    assert np.array_equal(
+        mill_symmetry.transform_board(mill_symmetry.transform_board(board, transform), inverse), board
+    )
+    move = [3, 14, 22]
+    assert mill_symmetry.transform_move(mill_symmetry.transform_move(move, transform), inverse) == move
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_legal_moves_follow_the_symmetries(seed):
+    (model, player) = _random_model(seed, 24)
+    moves = {tuple(move) for move in model.legal_moves(player)}
+
+    for transform in transforms:
+        transformed = model.clone()
+        transformed._board[1:] = mill_symmetry.transform_board(model._board[1:], transform).tolist()
+        expected = {tuple(mill_symmetry.transform_move(move, transform)) for move in moves}
+        assert {tuple(move) for move in transformed.legal_moves(player)} == expected
+
+
+def test_canonical_is_the_same_for_symmetric_boards():
+    (model, _) = _random_model(1, 15)
+    (canonical, hash, transform) = model.canonical()
+    assert np.array_equal(mill_symmetry.transform_board(model._board[1:], transform), canonical)
+    assert mill_symmetry.position_hash(canonical) == hash
+
+    for t in transforms:
+        board = mill_symmetry.transform_board(model._board[1:], t)
+        assert mill_symmetry.canonical(board)[1] == hash
+
+
+def test_canonical_needs_the_standard_board():
+    with pytest.raises(ValueError):
+        MillModel('six').canonical()
+    assert MillModel('twelve').canonical()[1] == 0
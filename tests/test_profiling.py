@@ -0,0 +1,94 @@
+import pytest
+
+from famnit_gym.envs.mill import env as mill_env, parallel_env
+from famnit_gym.envs.sokoban import SokobanEnv
+
+steps = 6
+
+
+def _play_mill(env):
+    env.reset(seed=0)
+    for _ in range(steps):
+        legal_moves = env.infos[env.agent_selection]['legal_moves']
+        env.step(legal_moves[0])
+
+
+def _play_parallel(env):
+    (_, infos) = env.reset(seed=0)
+    for _ in range(steps):
+        mover = next(agent for (agent, info) in infos.items() if info['to_move'])
+        (_, _, _, _, infos) = env.step({mover: infos[mover]['legal_moves'][0]})
+
+
+def _play_sokoban(env):
+    env.reset(seed=0)
+    for i in range(steps):
+        env.step(i % 4)
+
+
+mill_calls = {
+    'reset': 1,
+    'validation': steps,
+    'model_update': steps,
+    'model_update/mobility_check': steps,
+    'bookkeeping': steps,
+    'move_generation': steps,
+    'render': steps + 1
+}
+
+sokoban_calls = {
+    'reset': 1,
+    'render': 1,
+    'model_update': steps,
+    'bookkeeping': steps + 1
+}
+
+cases = [
+    pytest.param(lambda: mill_env(), _play_mill, mill_calls, id='mill'),
+    pytest.param(lambda: parallel_env(), _play_parallel, mill_calls, id='parallel'),
+    pytest.param(lambda: SokobanEnv(options={'map_template': 0}), _play_sokoban, sokoban_calls, id='sokoban')
+]
+
+
+@pytest.mark.parametrize('make, play, calls', cases)
+def test_stages_and_calls(make, play, calls):
+    env = make()
+    env.enable_profiling()
+    play(env)
+
+    profile = env.profile()
+    assert {stage: profile[stage]['calls'] for stage in profile} == calls
+    assert all(profile[stage]['time'] >= 0.0 for stage in profile)
+
+    # The mobility check is a part of the model update.
+    if 'model_update/mobility_check' in profile:
+        assert profile['model_update/mobility_check']['time'] <= profile['model_update']['time']
+
+
+@pytest.mark.parametrize('make, play, calls', cases)
+def test_callback_receives_the_profile(make, play, calls):
+    env = make()
+    exports = []
+    env.enable_profiling(callback=exports.append)
+    play(env)
+
+    # The profile is exported after every step.
+    assert len(exports) == steps
+    assert exports[-1] == env.profile()
+    assert [export['model_update']['calls'] for export in exports] == list(range(1, steps + 1))
+
+
+@pytest.mark.parametrize('make, play, calls', cases)
+def test_profile_is_empty_when_disabled(make, play, calls):
+    env = make()
+    play(env)
+    assert env.profile() == {}
+
+    env.enable_profiling()
+    play(env)
+    assert env.profile() != {}
+
+    env.disable_profiling()
+    assert env.profile() == {}
+    play(env)
+    assert env.profile() == {}
@@ -0,0 +1,72 @@
+import numpy as np
+
+from famnit_gym.envs import mill
+from famnit_gym.envs.seeding import split_seed
+from famnit_gym.envs.sokoban import SokobanEnv
+
+
+def _fallback_moves(seed, plies=40):
+    # Every step passes None, so the environment chooses a random legal move.
+    env = mill.env()
+    env.reset(seed=seed)
+    moves = []
+    for _ in range(plies):
+        (_, _, terminated, truncated, _) = env.last()
+        if terminated or truncated:
+            break
+        env.step(None)
+        moves.append(env.unwrapped._last_move)
+    env.close()
+    return moves
+
+
+def test_mill_fallback_moves_follow_the_seed():
+    assert _fallback_moves(1) == _fallback_moves(1)
+    assert _fallback_moves(1) != _fallback_moves(2)
+
+
+def test_mill_environments_do_not_share_randomness():
+    # Another environment drawing random numbers does not change the moves of this one.
+    env = mill.env()
+    other = mill.env()
+    env.reset(seed=1)
+    other.reset(seed=1)
+    moves = []
+    for _ in range(40):
+        env.step(None)
+        other.unwrapped.np_random.random(10)
+        moves.append(env.unwrapped._last_move)
+    assert moves == _fallback_moves(1)
+
+
+def _random_level(seed):
+    env = SokobanEnv()
+    (observation, _) = env.reset(seed=seed)
+    return observation
+
+
+def test_sokoban_random_level_follows_the_seed():
+    assert np.array_equal(_random_level(3), _random_level(3))
+    levels = [_random_level(seed) for seed in range(5)]
+    assert any(not np.array_equal(levels[0], level) for level in levels[1:])
+
+
+def test_sokoban_levels_option_follows_the_seed():
+    def levels(seed):
+        env = SokobanEnv(options={'levels': list(range(100))})
+        env.reset(seed=seed)
+        return [env.reset()[0].tobytes() for _ in range(5)]
+
+    assert levels(0) == levels(0)
+    assert levels(0) != levels(1)
+
+
+def test_split_seed():
+    seeds = split_seed(42, 8)
+    assert seeds == split_seed(42, 8)
+    assert len(set(seeds)) == 8
+    assert all(isinstance(seed, int) for seed in seeds)
+    assert seeds != split_seed(43, 8)
+
+    # The first seeds do not depend on how many are split.
+    assert split_seed(42, 3) == seeds[:3]
@@ -0,0 +1,35 @@
+import numpy as np
+
+from famnit_gym.envs.sokoban import SokobanEnv, SokobanGenerator, generate_levels
+from famnit_gym.search.sokoban import solve
+
+
+def _play(map, solution):
+    env = SokobanEnv(options={'map_template': map})
+    env.reset(seed=0)
+    terminated = False
+    for action in solution:
+        assert not terminated
+        (_, _, terminated, _, _) = env.step(action)
+    return terminated
+
+
+def test_generated_levels_are_solved_by_their_solutions():
+    generator = SokobanGenerator(width=8, height=8, num_crates=3, seed=42)
+    for _ in range(10):
+        (map, info) = generator.generate()
+        assert (map == 2).sum() + (map == 4).sum() == 3
+        assert len(info['solution']) == info['moves']
+        assert _play(map, info['solution'])
+
+        # The recorded solution is not better than the one with the fewest pushes.
+        assert solve(map)['pushes'] <= info['pushes']
+
+
+def test_generate_levels_does_not_depend_on_the_processes():
+    levels = generate_levels(5, seed=7, processes=1, chunk_size=2, width=7, height=7, num_crates=2)
+    parallel = generate_levels(5, seed=7, processes=2, chunk_size=2, width=7, height=7, num_crates=2)
+    assert len(levels) == 5
+    for ((map, info), (other, other_info)) in zip(levels, parallel):
+        assert np.array_equal(map, other)
+        assert info['solution'] == other_info['solution']
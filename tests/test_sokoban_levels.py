@@ -0,0 +1,65 @@
+import numpy as np
+
+import famnit_gym.envs
+from famnit_gym.envs.sokoban import SokobanMap, level_index
+from famnit_gym.envs.sokoban.sokoban_map import _read_levels
+from famnit_gym.search.sokoban import solve
+
+directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+# A corridor: the crate is pushed right twice.
+corridor = np.array([
+    [1, 1, 1, 1, 1, 1],
+    [1, 5, 2, 0, 3, 1],
+    [1, 1, 1, 1, 1, 1]
+], dtype=np.uint8)
+
+
+def test_solve_corridor():
+    info = solve(corridor)
+    assert info['solved']
+    assert info['pushes'] == 2
+    assert info['solution'] == [1, 1]
+    assert info['crates'] == 1
+
+
+def test_dead_squares_are_never_pushed_to():
+    # The crate can only be pushed into the corner, which is a dead square.
+    level = np.array([
+        [1, 1, 1, 1, 1],
+        [1, 3, 1, 0, 1],
+        [1, 0, 5, 2, 1],
+        [1, 1, 1, 0, 1],
+        [1, 1, 1, 1, 1]
+    ], dtype=np.uint8)
+    info = solve(level)
+    assert not info['solved']
+    assert info['dead_squares'] > 0
+
+
+def test_solutions_solve_the_levels():
+    directory = famnit_gym.envs.DIR_ENVS + '/sokoban'
+    for id in [0, 1, 2]:
+        info = solve(_read_levels(directory)[id])
+        assert info['solved']
+
+        map = SokobanMap(id, dir=directory)
+        for action in info['solution']:
+            map.move_player(*directions[action])
+        assert map.game_finished()
+
+
+def test_level_index():
+    index = level_index()
+    assert len(index) == 1000
+
+    bands = index.bands(4)
+    assert sum(len(band) for band in bands) == 1000
+    assert index[int(bands[0][0])]['pushes'] <= index[int(bands[-1][-1])]['pushes'] or not index[int(bands[-1][-1])]['solved']
+
+    ids = index.select(pushes=(10, 12))
+    assert all(10 <= index[int(id)]['pushes'] <= 12 for id in ids)
+
+    rng = np.random.default_rng(0)
+    assert index.sample(band=0, num_bands=4, rng=rng) in set(bands[0].tolist())
+    assert len(index.sample(size=5, rng=rng)) == 5
@@ -0,0 +1,94 @@
+import numpy as np
+
+from famnit_gym.envs.sokoban import SokobanEnv, transition_model
+
+# A corridor: the crate is pushed right twice.
+corridor = np.array([
+    [1, 1, 1, 1, 1, 1],
+    [1, 5, 2, 0, 3, 1],
+    [1, 1, 1, 1, 1, 1]
+], dtype=np.uint8)
+
+
+def test_transition_model_does_not_change_the_environment():
+    env = SokobanEnv(options={'map_template': corridor})
+    env.reset(seed=0)
+    map = env.unwrapped._map
+    before = map.get_array()
+    player = map.player_position()
+
+    model = transition_model(env)
+    model.move_player(1, 0)
+    model.move_player(1, 0)
+    assert model.game_finished()
+
+    assert np.array_equal(map.get_array(), before)
+    assert map.player_position() == player
+    assert not map.game_finished()
+    assert model.crate_positions() != map.crate_positions()
+
+    # Restoring the model's own snapshot does not touch the environment either.
+    snapshot = model.snapshot()
+    env.step(1)
+    model.restore(snapshot)
+    assert model.game_finished()
+    assert not map.game_finished()
+
+
+def _reference_reachable(map):
+    # A plain breadth-first search over the floor and the goals.
+    array = map.get_array()
+    (x, y) = map.player_position()
+    reachable = {(x, y)}
+    queue = [(x, y)]
+    for (x, y) in queue:
+        for (dx, dy) in [(0, -1), (1, 0), (0, 1), (-1, 0)]:
+            if array[y + dy][x + dx] in (0, 3) and (x + dx, y + dy) not in reachable:
+                reachable.add((x + dx, y + dy))
+                queue.append((x + dx, y + dy))
+    return reachable
+
+
+def test_reachability_matches_a_reference_search():
+    directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+    for level in [0, 1, 17, 250, 999]:
+        env = SokobanEnv(options={'map_template': level})
+        env.reset(seed=0)
+        map = env.unwrapped._map
+        array = map.get_array()
+
+        reachable = _reference_reachable(map)
+        mask = map.reachable()
+        assert {(int(x), int(y)) for (y, x) in zip(*np.nonzero(mask))} == reachable
+        assert map.normalized_position() == min(reachable, key=lambda position: (position[1], position[0]))
+
+        pushes = []
+        for (x, y) in map.crate_positions():
+            for (action, (dx, dy)) in enumerate(directions):
+                if (x - dx, y - dy) in reachable and array[y + dy][x + dx] in (0, 3):
+                    pushes.append((x, y, action))
+        assert map.legal_pushes() == pushes
+
+
+def test_walking_path_and_cache():
+    env = SokobanEnv(options={'map_template': 0})
+    env.reset(seed=0)
+    map = env.unwrapped._map
+    cached = map.reachable()
+    normalized = map.normalized_position()
+
+    # Walking to any reachable tile does not change the region or the cache.
+    (x, y) = max(_reference_reachable(map))
+    for action in map.walking_path(x, y):
+        env.step(action)
+    assert map.player_position() == (x, y)
+    assert map.reachable() is cached
+    assert map.normalized_position() == normalized
+
+    # A push invalidates the cache.
+    (x, y, action) = map.legal_pushes()[0]
+    (dx, dy) = SokobanEnv.action_direction[action]
+    for move in map.walking_path(x - dx, y - dy) + [action]:
+        env.step(move)
+    assert map.reachable() is not cached
+    assert map.walking_path(0, 0) is None
@@ -0,0 +1,108 @@
+import pytest
+import numpy as np
+
+from famnit_gym.envs.sokoban import SokobanPushEnv
+
+# Two crates in an open room. Pushing crate 0 down twice moves it after crate 1 in row-major order.
+room = np.array([
+    [1, 1, 1, 1, 1, 1, 1],
+    [1, 5, 0, 0, 0, 0, 1],
+    [1, 0, 2, 0, 0, 0, 1],
+    [1, 0, 0, 0, 2, 0, 1],
+    [1, 0, 0, 0, 0, 3, 1],
+    [1, 0, 0, 0, 0, 3, 1],
+    [1, 1, 1, 1, 1, 1, 1]
+], dtype=np.uint8)
+
+
+def _expected_mask(env):
+    mask = np.zeros(env.action_space.n, dtype=np.int8)
+    crates = env.unwrapped._crate_list()
+    for (x, y, direction) in env.unwrapped._map.legal_pushes():
+        mask[4 * crates.index((x, y)) + direction] = 1
+    return mask
+
+
+def test_action_mask_matches_the_legal_pushes():
+    env = SokobanPushEnv(options={'map_template': room})
+    (_, info) = env.reset(seed=0)
+    assert env.action_space.n == 8
+
+    rng = np.random.default_rng(0)
+    for _ in range(10):
+        assert np.array_equal(info['action_mask'], _expected_mask(env))
+        assert info['action_mask'].sum() == len(env.unwrapped._map.legal_pushes())
+        action = int(rng.choice(np.nonzero(info['action_mask'])[0]))
+        (_, _, terminated, _, info) = env.step(action)
+        if terminated:
+            break
+
+
+def test_crates_keep_their_numbers():
+    env = SokobanPushEnv(options={'map_template': room})
+    env.reset(seed=0)
+    map = env.unwrapped._map
+    assert map.crate_positions() == [(2, 2), (4, 3)]
+
+    # Push crate 0 down twice.
+    env.step(4 * 0 + 2)
+    (_, _, _, _, info) = env.step(4 * 0 + 2)
+    assert map.crate_positions() == [(4, 3), (2, 4)]
+    assert env.unwrapped._crate_list() == [(2, 4), (4, 3)]
+
+    # Action 4 * 1 + 1 still pushes crate 1 to the right.
+    assert info['action_mask'][4 * 1 + 1] == 1
+    env.step(4 * 1 + 1)
+    assert env.unwrapped._crate_list() == [(2, 4), (5, 3)]
+
+    # The numbers are restored with the snapshot and reset at reset.
+    snapshot = env.unwrapped.snapshot()
+    env.step(4 * 1 + 3)
+    env.unwrapped.restore(snapshot)
+    assert env.unwrapped._crate_list() == [(2, 4), (5, 3)]
+    env.reset()
+    assert env.unwrapped._crate_list() == [(2, 2), (4, 3)]
+
+
+# The same room with a single crate.
+single = room.copy()
+single[3, 4] = 0
+single[5, 5] = 0
+
+
+def test_action_space_is_fixed_across_levels():
+    env = SokobanPushEnv(options={'levels': [room, single], 'max_crates': 3})
+    assert env.action_space.n == 12
+
+    crates = set()
+    for seed in range(10):
+        (_, info) = env.reset(seed=seed)
+        crates.add(env.unwrapped._num_crates)
+        assert env.action_space.n == 12
+        assert info['action_mask'].shape == (12,)
+        assert np.array_equal(info['action_mask'], _expected_mask(env))
+
+        # The actions of the missing crates are masked out and have no effect.
+        assert not info['action_mask'][4 * env.unwrapped._num_crates:].any()
+        map = env.unwrapped._map.get_array().copy()
+        env.step(4 * 2 + 2)
+        assert np.array_equal(env.unwrapped._map.get_array(), map)
+    assert crates == {1, 2}
+
+
+def test_action_space_defaults_to_the_first_level():
+    env = SokobanPushEnv(options={'levels': [room, single]})
+    assert env.action_space.n == 8
+    for seed in range(10):
+        env.reset(seed=seed)
+        assert env.action_space.n == 8
+
+
+def test_too_many_crates():
+    with pytest.raises(ValueError):
+        SokobanPushEnv(options={'map_template': room, 'max_crates': 1})
+
+    env = SokobanPushEnv(options={'levels': [single, room]})
+    with pytest.raises(ValueError):
+        for seed in range(10):
+            env.reset(seed=seed)
@@ -0,0 +1,125 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from famnit_gym.envs.sokoban import SokobanEnv, LevelSampler, UniformSampler, FailureSampler, DifficultySampler, level_index
+from famnit_gym.envs.sokoban import make_vector_env
+from famnit_gym.wrappers.sokoban import Insights
+
+
+def test_reset_swaps_the_level():
+    env = SokobanEnv(options={'map_template': 0})
+    env.reset(seed=0)
+    space = env.observation_space
+
+    for level in [5, 17, 5]:
+        (observation, info) = env.reset(options={'map_template': level})
+        (expected, _) = SokobanEnv(options={'map_template': level}).reset(seed=0)
+        assert np.array_equal(observation, expected)
+
+    # The spaces are kept when the size does not change.
+    assert env.observation_space is space
+
+
+def test_uniform_sampler_chooses_from_its_levels():
+    env = SokobanEnv(options={'level_sampler': UniformSampler([3, 4])})
+    env.reset(seed=0)
+    for _ in range(10):
+        env.reset()
+        assert env._level in (3, 4)
+
+
+def test_failure_sampler_prefers_failed_levels():
+    sampler = FailureSampler([0, 1], epsilon=0.01)
+    for _ in range(20):
+        sampler.update(0, solved=True)
+        sampler.update(1, solved=False)
+
+    rng = np.random.default_rng(0)
+    levels = [sampler.sample(rng) for _ in range(1000)]
+    assert levels.count(1) > 900
+
+
+def test_episodes_are_reported_at_reset():
+    sampler = FailureSampler([7])
+    env = SokobanEnv(options={'level_sampler': sampler})
+    env.reset(seed=0)
+    env.reset()  # No steps, so no episode.
+    env.step(0)
+    env.reset()
+
+    statistics = sampler.statistics()
+    assert statistics['episodes'][0] == 1
+    assert statistics['failure_rate'][0] == 1.0
+
+
+def test_difficulty_sampler_advances_through_the_bands():
+    index = level_index()
+    sampler = DifficultySampler(window=4, num_bands=4, threshold=0.75, replay=0)
+    bands = index.bands(4)
+    rng = np.random.default_rng(0)
+
+    assert sampler.sample(rng) in set(bands[0].tolist())
+    for _ in range(4):
+        sampler.update(sampler.sample(rng), solved=True)
+    assert sampler.band == 1
+    assert sampler.sample(rng) in set(bands[1].tolist())
+
+    # Failing does not advance.
+    for _ in range(8):
+        sampler.update(sampler.sample(rng), solved=False)
+    assert sampler.band == 1
+
+
+@pytest.mark.parametrize('context', ['fork', 'spawn'])
+def test_shared_statistics(context):
+    sampler = FailureSampler([1, 2])
+    sampler.update(2, solved=True)
+    envs = make_vector_env(2, level_sampler=sampler, context=context)
+    try:
+        envs.reset(seed=0)
+        envs.step(np.zeros(2, dtype=np.int64))
+
+        # Both workers report their episode at the next reset, into the memory of this process.
+        envs.reset()
+        assert sampler.statistics()['episodes'].sum() == 3
+    finally:
+        envs.close()
+
+
+def test_pickled_sampler_attaches_to_the_same_memory():
+    sampler = DifficultySampler(window=1, num_bands=2, threshold=0.5, replay=0).share()
+    copy = pickle.loads(pickle.dumps(sampler))
+    copy.update(copy.sample(np.random.default_rng(0)), solved=True)
+    assert sampler.statistics()['episodes'].sum() == 1
+    assert sampler.band == 1
+
+    # A sampler that is not shared is pickled with its statistics.
+    unshared = pickle.loads(pickle.dumps(UniformSampler([1, 2])))
+    assert unshared.statistics()['episodes'].tolist() == [0, 0]
+
+
+def test_level_sampler_is_abstract():
+    with pytest.raises(TypeError):
+        LevelSampler()
+
+
+def test_insights_forwards_the_reset_options():
+    env = Insights(SokobanEnv(options={'map_template': 0}))
+    env.reset(seed=0)
+
+    (observation, info) = env.reset(options={'map_template': 5})
+    (expected, _) = SokobanEnv(options={'map_template': 5}).reset(seed=0)
+    assert np.array_equal(observation, expected)
+    assert 'pushes' in info
+
+
+def test_insights_keeps_the_level_sampler():
+    sampler = FailureSampler([3, 4])
+    env = Insights(SokobanEnv(options={'level_sampler': sampler}))
+    env.reset(seed=0)
+    env.step(0)
+    env.reset()
+    assert env.unwrapped._level in (3, 4)
+    assert sampler.statistics()['episodes'].sum() == 1
@@ -0,0 +1,63 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from famnit_gym.envs.sokoban import SokobanEnv, SokobanPushEnv, make_vector_env
+
+
+def test_pickle_round_trip():
+    env = SokobanEnv(options={'levels': [0, 1, 2, 3]})
+    env.reset(seed=0)
+    for action in [0, 1, 2, 3, 1]:
+        env.step(action)
+
+    copy = pickle.loads(pickle.dumps(env))
+    assert np.array_equal(copy._get_obs(), env._get_obs())
+    assert copy._get_info() == env._get_info()
+    assert copy._map.player_position() == env._map.player_position()
+
+    # Both continue the same way, including the levels chosen at reset.
+    for action in [2, 2, 3, 0, 1]:
+        assert np.array_equal(copy.step(action)[0], env.step(action)[0])
+    for seed in [None, 5]:
+        assert np.array_equal(copy.reset(seed=seed)[0], env.reset(seed=seed)[0])
+
+
+def test_pickle_drops_the_pygame_resources(monkeypatch):
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    env = SokobanEnv(render_mode='human', options={'map_template': 0})
+    env.reset(seed=0)
+    try:
+        assert env._pygame_initialized
+        state = env.__getstate__()
+        assert '_surface' not in state and '_clock' not in state
+        assert not state['_pygame_initialized']
+        assert state['_map'].__getstate__()['_images'] is None
+
+        copy = pickle.loads(pickle.dumps(env))
+        assert np.array_equal(copy._get_obs(), env._get_obs())
+    finally:
+        env.close()
+
+
+@pytest.mark.parametrize('env_class, options', [
+    (SokobanEnv, None),
+    (SokobanPushEnv, {'max_crates': 4})
+])
+def test_async_vector_env(env_class, options):
+    envs = make_vector_env(2, levels=list(range(8)), options=options, env_class=env_class)
+    try:
+        (observations, infos) = envs.reset(seed=0)
+        assert observations.shape == (2, 10, 10)
+
+        for _ in range(4):
+            if env_class is SokobanPushEnv:
+                actions = np.array([np.nonzero(mask)[0][0] for mask in infos['action_mask']])
+            else:
+                actions = np.zeros(2, dtype=np.int64)
+            (observations, rewards, terminations, truncations, infos) = envs.step(actions)
+            assert observations.shape == (2, 10, 10)
+            assert rewards.shape == (2,)
+    finally:
+        envs.close()